@@ -0,0 +1,55 @@
+"""
+Store precomputed totals on orders created before totals were persisted.
+
+Usage: python -m app.commands.backfill_order_totals
+"""
+
+import asyncio
+
+from pymongo import UpdateOne
+
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.models.order import Order
+
+BATCH_SIZE = 1000
+
+
+async def backfill_order_totals(batch_size: int = BATCH_SIZE) -> int:
+    """Compute and store order and line totals for orders missing them."""
+    collection = Order.get_motor_collection()
+    cursor = collection.find({"total_price_cents": {"$exists": False}}, batch_size=batch_size)
+
+    updated = 0
+    updates = []
+    async for document in cursor:
+        order = Order.model_validate(document)
+        updates.append(UpdateOne(
+            {"_id": document["_id"]},
+            {"$set": {
+                "items": [item.model_dump() for item in order.items],
+                "total_price": order.total_price,
+                "total_price_cents": order.total_price_cents,
+            }}
+        ))
+        if len(updates) >= batch_size:
+            result = await collection.bulk_write(updates, ordered=False)
+            updated += result.modified_count
+            updates = []
+
+    if updates:
+        result = await collection.bulk_write(updates, ordered=False)
+        updated += result.modified_count
+    return updated
+
+
+async def main():
+    await connect_to_mongo()
+    try:
+        updated = await backfill_order_totals()
+        print(f"Backfilled totals on {updated} orders")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
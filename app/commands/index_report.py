@@ -0,0 +1,41 @@
+"""
+Report drift between the indexes declared on the models and the live ones.
+
+Usage: python -m app.commands.index_report
+Exits with status 1 when any index is missing, changed or undeclared.
+"""
+
+import asyncio
+import sys
+
+from app.core.database import DOCUMENT_MODELS, connect_to_mongo, close_mongo_connection, db
+from app.core.indexes import IndexState, index_drift
+
+
+def format_size(size_bytes: int | None) -> str:
+    if size_bytes is None:
+        return "-"
+    return f"{size_bytes / 1024:.1f} KiB"
+
+
+async def main() -> int:
+    await connect_to_mongo()
+    if db.index_task:
+        # Report what is live, not what startup is about to create
+        db.index_task.cancel()
+    try:
+        report = await index_drift(DOCUMENT_MODELS)
+    finally:
+        await close_mongo_connection()
+
+    for entry in report:
+        keys = ", ".join(f"{field}:{direction}" for field, direction in entry.keys)
+        print(f"{entry.state.value:<11} {entry.collection:<14} {entry.name:<40} {format_size(entry.size_bytes):>12}  ({keys})")
+
+    drifted = [entry for entry in report if entry.state != IndexState.OK]
+    print(f"{len(drifted)} of {len(report)} indexes drifted")
+    return 1 if drifted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,23 @@
+"""
+Recompute the order_rollups collection from the orders collection.
+
+Usage: python -m app.commands.rebuild_order_rollups
+"""
+
+import asyncio
+
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.order.repositories.rollup import OrderRollupRepository
+
+
+async def main():
+    await connect_to_mongo()
+    try:
+        await OrderRollupRepository().rebuild()
+        print("Rebuilt order rollups")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
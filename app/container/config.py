@@ -10,11 +10,51 @@ class Config(containers.DeclarativeContainer):
     config.override({
         "mongodb_url": settings.mongodb_url,
         "database_name": settings.database_name,
+        "mongo_max_pool_size": settings.mongo_max_pool_size,
+        "mongo_min_pool_size": settings.mongo_min_pool_size,
+        "mongo_max_idle_time_ms": settings.mongo_max_idle_time_ms,
+        "mongo_wait_queue_timeout_ms": settings.mongo_wait_queue_timeout_ms,
+        "mongo_server_selection_timeout_ms": settings.mongo_server_selection_timeout_ms,
+        "mongo_compressors": settings.mongo_compressors,
+        "slow_query_threshold_ms": settings.slow_query_threshold_ms,
+        "slow_query_log_size": settings.slow_query_log_size,
+        "slow_query_explain_sample_rate": settings.slow_query_explain_sample_rate,
+        "slow_query_docs_examined_ratio": settings.slow_query_docs_examined_ratio,
         "api_title": settings.api_title,
         "api_version": settings.api_version,
         "api_description": settings.api_description,
         "host": settings.host,
         "port": settings.port,
+        "workers": settings.workers,
+        "backlog": settings.backlog,
+        "keep_alive_seconds": settings.keep_alive_seconds,
+        "limit_concurrency": settings.limit_concurrency,
+        "limit_max_requests": settings.limit_max_requests,
+        "graceful_shutdown_seconds": settings.graceful_shutdown_seconds,
+        "access_log": settings.access_log,
         "debug": settings.debug,
         "secret_key": settings.secret_key,
+        "metrics_enabled": settings.metrics_enabled,
+        "di_default_scope": settings.di_default_scope,
+        "di_provider_scopes": settings.di_provider_scopes,
+        "order_export_batch_size": settings.order_export_batch_size,
+        "create_indexes_on_startup": settings.create_indexes_on_startup,
+        "readiness_ping_interval_seconds": settings.readiness_ping_interval_seconds,
+        "readiness_ping_timeout_seconds": settings.readiness_ping_timeout_seconds,
+        "readiness_retry_seconds": settings.readiness_retry_seconds,
+        "order_events_source": settings.order_events_source,
+        "order_events_queue_size": settings.order_events_queue_size,
+        "order_events_heartbeat_seconds": settings.order_events_heartbeat_seconds,
+        "idempotency_key_ttl_seconds": settings.idempotency_key_ttl_seconds,
+        "idempotency_cache_size": settings.idempotency_cache_size,
+        "idempotency_wait_timeout_seconds": settings.idempotency_wait_timeout_seconds,
+        "idempotency_lease_seconds": settings.idempotency_lease_seconds,
+        "product_catalog_enabled": settings.product_catalog_enabled,
+        "product_catalog_refresh_seconds": settings.product_catalog_refresh_seconds,
+        "product_catalog_change_stream": settings.product_catalog_change_stream,
+        "product_catalog_reconcile_seconds": settings.product_catalog_reconcile_seconds,
+        "raw_read_routes": settings.raw_read_routes,
+        "response_cache_routes": settings.response_cache_routes,
+        "response_cache_max_bytes": settings.response_cache_max_bytes,
+        "response_cache_ttl_seconds": settings.response_cache_ttl_seconds,
     })
@@ -5,6 +5,10 @@ Consolidated containers for all domains using dependency-injector.
 from dependency_injector import containers, providers
 
 from app.container.config import Config
+from app.core.config import settings
+from app.core.broker import EventBroker
+from app.core.idempotency import IdempotencyStore
+from app.core.response_cache import ResponseCache
 
 from app.customer.repositories.repository import CustomerRepository
 from app.customer.services.service import CustomerService
@@ -12,6 +16,7 @@ from app.customer.serializers.serializer import (
     CustomerSerializer, CustomerCreateSerializer, CustomerUpdateSerializer
 )
 
+from app.product.repositories.catalog import ProductCatalog
 from app.product.repositories.repository import ProductRepository
 from app.product.services.service import ProductService
 from app.product.serializers.serializer import (
@@ -19,21 +24,39 @@ from app.product.serializers.serializer import (
 )
 
 from app.order.repositories.repository import OrderRepository
+from app.order.repositories.idempotency import IdempotencyKeyRepository
+from app.order.repositories.rollup import OrderRollupRepository
 from app.order.services.service import OrderService
 from app.order.serializers.serializer import (
     OrderSerializer, OrderCreateSerializer, OrderUpdateSerializer, OrderStatusUpdateSerializer
 )
 
 
+SCOPES = {
+    "factory": providers.Factory,
+    "singleton": providers.Singleton,
+    "thread_safe_singleton": providers.ThreadSafeSingleton,
+}
+
+
+def scoped(name: str, provides, **kwargs) -> providers.Provider:
+    """Provider of a stateless component in the scope configured for name."""
+    scope = settings.di_provider_scopes.get(name, settings.di_default_scope)
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown scope {scope!r} for provider {name}; expected one of {', '.join(SCOPES)}")
+    return SCOPES[scope](provides, **kwargs)
+
+
 class CustomerContainer(containers.DeclarativeContainer):
     
-    customer_repository = providers.Factory(CustomerRepository)
+    customer_repository = scoped("customer_repository", CustomerRepository)
     
-    customer_serializer = providers.Factory(CustomerSerializer)
-    customer_create_serializer = providers.Factory(CustomerCreateSerializer)
-    customer_update_serializer = providers.Factory(CustomerUpdateSerializer)
+    customer_serializer = scoped("customer_serializer", CustomerSerializer)
+    customer_create_serializer = scoped("customer_create_serializer", CustomerCreateSerializer)
+    customer_update_serializer = scoped("customer_update_serializer", CustomerUpdateSerializer)
     
-    customer_service = providers.Factory(
+    customer_service = scoped(
+        "customer_service",
         CustomerService,
         repository=customer_repository,
         serializer=customer_serializer,
@@ -44,31 +67,52 @@ class CustomerContainer(containers.DeclarativeContainer):
 
 class ProductContainer(containers.DeclarativeContainer):
     
-    product_repository = providers.Factory(ProductRepository)
+    product_catalog = providers.Singleton(ProductCatalog)
+    product_response_cache = providers.Singleton(ResponseCache)
+    product_repository = scoped(
+        "product_repository",
+        ProductRepository,
+        catalog=product_catalog,
+        response_cache=product_response_cache,
+    )
     
-    product_serializer = providers.Factory(ProductSerializer)
-    product_create_serializer = providers.Factory(ProductCreateSerializer)
-    product_update_serializer = providers.Factory(ProductUpdateSerializer)
+    product_serializer = scoped("product_serializer", ProductSerializer)
+    product_create_serializer = scoped("product_create_serializer", ProductCreateSerializer)
+    product_update_serializer = scoped("product_update_serializer", ProductUpdateSerializer)
     
-    product_service = providers.Factory(
+    product_service = scoped(
+        "product_service",
         ProductService,
         repository=product_repository,
         serializer=product_serializer,
         create_serializer=product_create_serializer,
         update_serializer=product_update_serializer,
+        response_cache=product_response_cache,
     )
 
 
 class OrderContainer(containers.DeclarativeContainer):
     
-    order_repository = providers.Factory(OrderRepository)
+    order_rollup_repository = scoped("order_rollup_repository", OrderRollupRepository)
+    order_event_broker = providers.Singleton(EventBroker)
+    idempotency_key_repository = scoped("idempotency_key_repository", IdempotencyKeyRepository)
+    idempotency_store = providers.Singleton(
+        IdempotencyStore,
+        repository=idempotency_key_repository,
+    )
+    order_repository = scoped(
+        "order_repository",
+        OrderRepository,
+        rollup_repository=order_rollup_repository,
+    )
     
-    order_serializer = providers.Factory(OrderSerializer)
-    order_create_serializer = providers.Factory(OrderCreateSerializer)
-    order_update_serializer = providers.Factory(OrderUpdateSerializer)
-    order_status_update_serializer = providers.Factory(OrderStatusUpdateSerializer)
+    order_serializer = scoped("order_serializer", OrderSerializer)
+    order_create_serializer = scoped("order_create_serializer", OrderCreateSerializer)
+    order_update_serializer = scoped("order_update_serializer", OrderUpdateSerializer)
+    order_status_update_serializer = scoped("order_status_update_serializer", OrderStatusUpdateSerializer)
     
-    order_service = providers.Factory(
+    order_service = scoped(
+        "order_service",
         OrderService,
         repository=order_repository,
         customer_repository=providers.Dependency(),
@@ -76,6 +120,9 @@ class OrderContainer(containers.DeclarativeContainer):
         serializer=order_serializer,
         create_serializer=order_create_serializer,
         update_serializer=order_update_serializer,
+        rollup_repository=order_rollup_repository,
+        event_broker=order_event_broker,
+        idempotency_store=idempotency_store,
     )
 
 
@@ -91,6 +138,26 @@ class MainContainer(containers.DeclarativeContainer):
     order.order_service.add_kwargs(
         customer_repository=customer.customer_repository,
         product_repository=product.product_repository,
+        event_source=config.config.order_events_source,
+        export_batch_size=config.config.order_export_batch_size,
+    )
+    order.order_event_broker.add_kwargs(
+        queue_size=config.config.order_events_queue_size,
+    )
+    product.product_catalog.add_kwargs(
+        refresh_interval=config.config.product_catalog_refresh_seconds,
+        use_change_stream=config.config.product_catalog_change_stream,
+        reconcile_interval=config.config.product_catalog_reconcile_seconds,
+    )
+    product.product_response_cache.add_kwargs(
+        max_bytes=config.config.response_cache_max_bytes,
+        ttl_seconds=config.config.response_cache_ttl_seconds,
+    )
+    order.idempotency_store.add_kwargs(
+        cache_size=config.config.idempotency_cache_size,
+        ttl_seconds=config.config.idempotency_key_ttl_seconds,
+        wait_timeout=config.config.idempotency_wait_timeout_seconds,
+        lease_seconds=config.config.idempotency_lease_seconds,
     )
 
 
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class Subscription(Generic[T]):
+    """A subscriber's bounded queue of events.
+
+    When the subscriber falls behind, the oldest queued event is dropped so
+    publishing never waits on a slow consumer.
+    """
+
+    def __init__(self, broker: "EventBroker[T]", queue_size: int, predicate: Callable[[T], bool] | None = None):
+        self.broker = broker
+        self.predicate = predicate
+        self.queue: asyncio.Queue[T] = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, event: T) -> None:
+        """Queue an event without blocking, dropping the oldest one when full."""
+        if self.predicate and not self.predicate(event):
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> T | None:
+        """Wait for the next event, or return None once timeout expires."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription[T]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class EventBroker(Generic[T]):
+    """In-process fan-out of events to subscribers."""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscriptions: set[Subscription[T]] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, predicate: Callable[[T], bool] | None = None) -> Subscription[T]:
+        """Register a subscriber receiving events that match predicate."""
+        subscription = Subscription(self, self.queue_size, predicate)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription[T]) -> None:
+        self._subscriptions.discard(subscription)
+
+    def publish(self, event: T) -> None:
+        """Hand an event to every subscriber without waiting on any of them."""
+        for subscription in tuple(self._subscriptions):
+            subscription.offer(event)
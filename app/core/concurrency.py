@@ -0,0 +1,16 @@
+import asyncio
+from typing import Any, Coroutine
+
+
+async def gather(*coroutines: Coroutine[Any, Any, Any]) -> list[Any]:
+    """Run coroutines concurrently and return their results in order.
+
+    The first failure cancels the coroutines still running and is re-raised
+    as is, so callers handle it like the error of a sequential await.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coroutine) for coroutine in coroutines]
+    except BaseExceptionGroup as exc_group:
+        raise exc_group.exceptions[0] from None
+    return [task.result() for task in tasks]
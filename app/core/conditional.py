@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Header, Response
+from pydantic import BaseModel
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def entity_tag(resource_id: str, updated_at: datetime) -> str:
+    """Weak ETag of a resource revision, derived from its ID and updated_at."""
+    # Mongo keeps milliseconds, so finer precision would change between writes and reads
+    revision = (updated_at - EPOCH) // timedelta(milliseconds=1)
+    return f'W/"{resource_id}-{revision:x}"'
+
+
+def validator_headers(resource_id: str, updated_at: datetime) -> dict[str, str]:
+    """ETag and Last-Modified headers of a resource revision."""
+    return {
+        "ETag": entity_tag(resource_id, updated_at),
+        "Last-Modified": format_datetime(updated_at.replace(tzinfo=timezone.utc), usegmt=True),
+    }
+
+
+def not_modified_response(resource_id: str, updated_at: datetime) -> Response:
+    """Empty 304 response carrying the validators of the current revision."""
+    return Response(status_code=304, headers=validator_headers(resource_id, updated_at))
+
+
+class ConditionalRequest(BaseModel):
+    """Validators sent by a client revalidating a cached resource."""
+    if_none_match: str | None = None
+    if_modified_since: str | None = None
+
+    @property
+    def present(self) -> bool:
+        return bool(self.if_none_match or self.if_modified_since)
+
+    def not_modified(self, resource_id: str, updated_at: datetime) -> bool:
+        """Whether the client's copy is still current."""
+        # If-Modified-Since is ignored when If-None-Match is sent (RFC 9110, 13.1.3)
+        if self.if_none_match:
+            if self.if_none_match.strip() == "*":
+                return True
+            current = _opaque_tag(entity_tag(resource_id, updated_at))
+            return any(_opaque_tag(tag) == current for tag in self.if_none_match.split(","))
+
+        try:
+            since = parsedate_to_datetime(self.if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        # HTTP dates have one-second resolution
+        return updated_at.replace(microsecond=0) <= since
+
+
+def _opaque_tag(tag: str) -> str:
+    """Strip the weak indicator; If-None-Match uses weak comparison."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def get_conditional_request(
+    if_none_match: str | None = Header(None, description="ETag of the cached copy"),
+    if_modified_since: str | None = Header(None, description="Last-Modified of the cached copy"),
+) -> ConditionalRequest:
+    """Collect conditional request headers."""
+    return ConditionalRequest(if_none_match=if_none_match, if_modified_since=if_modified_since)
@@ -4,13 +4,68 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "order_management"
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_max_idle_time_ms: int | None = None
+    # Fail checkouts instead of queueing forever when the pool is exhausted
+    mongo_wait_queue_timeout_ms: int | None = None
+    mongo_server_selection_timeout_ms: int = 30000
+    # Comma-separated wire compressors in order of preference, e.g. "zstd,zlib"
+    mongo_compressors: str | None = None
+    # Commands slower than this land in the slow query log
+    slow_query_threshold_ms: float = 100.0
+    slow_query_log_size: int = 200
+    # Fraction of slow commands explained in the background
+    slow_query_explain_sample_rate: float = 0.1
+    # Flag plans examining this many documents per document returned
+    slow_query_docs_examined_ratio: float = 100.0
     api_title: str = "Order Management API"
     api_version: str = "1.0.0"
     api_description: str = "A microservice for managing orders, customers, and products"
     host: str = "0.0.0.0"
     port: int = 8000
+    # Production server (python -m app.server); unset workers means one per CPU within the CPU quota
+    workers: int | None = None
+    backlog: int = 2048
+    keep_alive_seconds: int = 5
+    # Answer 503 beyond this many concurrent connections per worker
+    limit_concurrency: int | None = None
+    # Recycle a worker after this many requests
+    limit_max_requests: int | None = None
+    graceful_shutdown_seconds: int = 30
+    access_log: bool = True
     debug: bool = False
     secret_key: str = "super-secret-key"
+    metrics_enabled: bool = True
+    # Scope of the stateless DI providers: "singleton", "thread_safe_singleton" or "factory"
+    di_default_scope: str = "singleton"
+    # Per-provider overrides keyed by provider name, e.g. {"order_service": "factory"}
+    di_provider_scopes: dict[str, str] = {}
+    order_export_batch_size: int = 1000
+    create_indexes_on_startup: bool = True
+    # /ready reuses a Mongo ping for this long so frequent probes stay cheap
+    readiness_ping_interval_seconds: float = 2.0
+    readiness_ping_timeout_seconds: float = 1.0
+    readiness_retry_seconds: float = 5.0
+    order_events_source: str = "local"  # "local" or "change_stream" (replica sets only)
+    order_events_queue_size: int = 100
+    order_events_heartbeat_seconds: float = 15.0
+    idempotency_key_ttl_seconds: int = 86400
+    idempotency_cache_size: int = 10000
+    idempotency_wait_timeout_seconds: float = 10.0
+    # A reserved key without an outcome after this long is taken over by retries
+    idempotency_lease_seconds: float = 60.0
+    product_catalog_enabled: bool = False
+    product_catalog_refresh_seconds: float = 5.0
+    product_catalog_change_stream: bool = False
+    product_catalog_reconcile_seconds: float = 600.0
+    # List routes answered from raw documents, e.g. ["orders.list", "products.list"]
+    raw_read_routes: set[str] = set()
+    # Product routes served from the in-process response cache: "products.list", "products.get"
+    response_cache_routes: set[str] = set()
+    response_cache_max_bytes: int = 16 * 1024 * 1024
+    # Bounds staleness from product writes made by other processes
+    response_cache_ttl_seconds: float = 30.0
     
     class Config:
         env_file = ".env"
@@ -1,16 +1,37 @@
+import asyncio
+import logging
+
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from app.core.config import settings
+from app.core.indexes import drifted_indexes, ensure_indexes
+from app.core.metrics import registry
+from app.core.mongo_metrics import CommandMetrics, MongoStats, PoolMetrics
+from app.core.slow_queries import SlowQueryRecorder
 from app.models.customer import Customer
+from app.models.idempotency_key import IdempotencyKey
 from app.models.product import Product
 from app.models.order import Order
+from app.models.order_rollup import OrderRollup
+from app.models.product_tombstone import ProductTombstone
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_MODELS = [Customer, Product, Order, OrderRollup, IdempotencyKey, ProductTombstone]
 
 
 class Database:
     
     client: AsyncIOMotorClient = None
     database = None
+    index_task: asyncio.Task | None = None
+    pool_metrics: PoolMetrics | None = None
+    command_metrics: CommandMetrics | None = None
+    slow_queries: SlowQueryRecorder | None = None
+    
+    def stats(self) -> MongoStats:
+        return MongoStats(pool=self.pool_metrics.stats(), commands=self.command_metrics.stats())
 
 
 db = Database()
@@ -20,16 +41,86 @@ async def get_database() -> Database:
     return db
 
 
+def client_options() -> dict:
+    """Pool, timeout and compression options of the Mongo client."""
+    options = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+    }
+    if settings.mongo_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongo_max_idle_time_ms
+    if settings.mongo_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongo_wait_queue_timeout_ms
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+    return options
+
+
 async def connect_to_mongo():
-    db.client = AsyncIOMotorClient(settings.mongodb_url)
+    db.pool_metrics = PoolMetrics(settings.mongo_max_pool_size, settings.mongo_min_pool_size)
+    db.command_metrics = CommandMetrics()
+    db.pool_metrics.register(registry)
+    db.command_metrics.register(registry)
+    db.slow_queries = SlowQueryRecorder(
+        settings.slow_query_threshold_ms,
+        settings.slow_query_log_size,
+        settings.slow_query_explain_sample_rate,
+        settings.slow_query_docs_examined_ratio
+    )
+    db.client = AsyncIOMotorClient(
+        settings.mongodb_url,
+        event_listeners=[db.pool_metrics, db.command_metrics, db.slow_queries],
+        **client_options()
+    )
+    db.slow_queries.bind(asyncio.get_running_loop(), db.client)
     db.database = db.client[settings.database_name]
     
     await init_beanie(
         database=db.database,
-        document_models=[Customer, Product, Order]
+        document_models=DOCUMENT_MODELS,
+        skip_indexes=True
     )
+    
+    if settings.create_indexes_on_startup:
+        # Build missing indexes and fix changed ones without holding up startup
+        db.index_task = asyncio.create_task(_create_missing_indexes())
+
+
+async def _create_missing_indexes():
+    try:
+        created = await ensure_indexes(DOCUMENT_MODELS)
+    except Exception:
+        logger.exception("Creating missing indexes failed")
+        return
+    if created:
+        logger.info("Created or updated indexes: %s", ", ".join(created))
+
+
+async def warm_pool() -> str:
+    """Open minPoolSize connections so the first requests don't pay for connection setup."""
+    # Concurrent commands each check out their own connection, growing the pool
+    await asyncio.gather(*(
+        db.client.admin.command("ping") for _ in range(max(settings.mongo_min_pool_size, 1))
+    ))
+    open_connections = db.pool_metrics.stats().open_connections
+    if open_connections < settings.mongo_min_pool_size:
+        raise RuntimeError(f"{open_connections} of {settings.mongo_min_pool_size} connections open")
+    return f"{open_connections} connections open"
+
+
+async def verify_indexes() -> str:
+    """Wait for the startup index build and check every declared index exists as declared."""
+    if db.index_task is not None:
+        await asyncio.shield(db.index_task)
+    drifted = await drifted_indexes(DOCUMENT_MODELS)
+    if drifted:
+        raise RuntimeError(f"Indexes missing or changed: {', '.join(drifted)}")
+    return "all declared indexes match"
 
 
 async def close_mongo_connection():
+    if db.index_task and not db.index_task.done():
+        db.index_task.cancel()
     if db.client:
         db.client.close()
@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+class IdempotencyError(Exception):
+    """Base error for idempotent request handling."""
+
+
+class IdempotencyKeyReusedError(IdempotencyError):
+    """Raised when a key is sent again with a different request body."""
+
+
+class IdempotencyKeyInProgressError(IdempotencyError):
+    """Raised when the attempt holding a key does not finish in time."""
+
+
+class StoredResponse(BaseModel):
+    """Response replayed for repeated requests with the same key."""
+    status_code: int
+    body: Any
+
+
+def request_fingerprint(payload: BaseModel) -> str:
+    """Hash a request body so reused keys with different bodies can be rejected."""
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """Run an operation at most once per key.
+
+    Completed responses are kept in an LRU cache in front of the key
+    repository. Duplicates arriving while the first attempt is running wait
+    for it: in-process through a shared future, across processes by polling
+    the stored record. A reservation is a lease: once lease_seconds pass
+    without an outcome, the holder is presumed dead and a duplicate takes
+    the key over.
+    """
+
+    def __init__(
+        self,
+        repository,
+        cache_size: int = 10000,
+        ttl_seconds: float = 86400,
+        wait_timeout: float = 10.0,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 0.05
+    ):
+        self.repository = repository
+        self.cache_size = cache_size
+        self.ttl_seconds = ttl_seconds
+        self.wait_timeout = wait_timeout
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._cache: OrderedDict[str, tuple[str, StoredResponse, float]] = OrderedDict()
+        self._in_flight: dict[str, tuple[str, asyncio.Future]] = {}
+
+    async def run(
+        self,
+        key: str,
+        request_hash: str,
+        operation: Callable[[], Awaitable[StoredResponse]]
+    ) -> StoredResponse:
+        """Return the stored response for key, running operation only for the first attempt."""
+        cached = self._cached(key, request_hash)
+        if cached:
+            return cached
+
+        if key in self._in_flight:
+            in_flight_hash, future = self._in_flight[key]
+            self._check_hash(in_flight_hash, request_hash)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The first attempt was cancelled and released the key; try again
+                return await self.run(key, request_hash, operation)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = (request_hash, future)
+        try:
+            result = await self._run_once(key, request_hash, operation)
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark the exception retrieved when no duplicate was waiting for it
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._in_flight[key]
+
+        future.set_result(result)
+        self._remember(key, request_hash, result)
+        return result
+
+    async def _run_once(
+        self,
+        key: str,
+        request_hash: str,
+        operation: Callable[[], Awaitable[StoredResponse]]
+    ) -> StoredResponse:
+        deadline = time.monotonic() + self.wait_timeout
+        # The reservation time doubles as the lease token: the holder only
+        # stores or releases the key while its token is still the current one
+        lease = self._lease_token()
+        existing = await self.repository.reserve(key, request_hash, lease)
+        while existing is not None:
+            self._check_hash(existing.request_hash, request_hash)
+            if existing.completed:
+                return StoredResponse(status_code=existing.status_code, body=existing.response)
+            lease_expired_before = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+            if existing.lease_started_at < lease_expired_before:
+                lease = self._lease_token()
+                if await self.repository.take_over(key, lease_expired_before, lease):
+                    logger.warning("Took over Idempotency-Key %s after its lease expired", key)
+                    break
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgressError("A request with this Idempotency-Key is still being processed")
+            # Another process holds the key
+            await asyncio.sleep(self.poll_interval)
+            existing = await self.repository.get(key)
+            if existing is None:
+                lease = self._lease_token()
+                existing = await self.repository.reserve(key, request_hash, lease)
+
+        try:
+            result = await operation()
+        except BaseException:
+            await asyncio.shield(self._release(key, lease))
+            raise
+        try:
+            stored = await self.repository.complete(key, lease, result.status_code, result.body)
+        except Exception:
+            # The operation took effect; answer with its outcome and free the key
+            # rather than leave duplicates waiting on it until the lease runs out
+            logger.exception("Storing the outcome of Idempotency-Key %s failed", key)
+            try:
+                await asyncio.shield(self._release(key, lease))
+            except Exception:
+                logger.exception("Releasing Idempotency-Key %s failed", key)
+        else:
+            if not stored:
+                logger.warning("Lease on Idempotency-Key %s was lost; its outcome was not stored", key)
+        return result
+
+    async def _release(self, key: str, lease: datetime) -> None:
+        if not await self.repository.release(key, lease):
+            logger.warning("Lease on Idempotency-Key %s was lost before it was released", key)
+
+    @staticmethod
+    def _lease_token() -> datetime:
+        # Mongo keeps datetimes to the millisecond and the token is matched exactly
+        now = datetime.utcnow()
+        return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+    def _cached(self, key: str, request_hash: str) -> StoredResponse | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        cached_hash, result, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._cache[key]
+            return None
+        self._check_hash(cached_hash, request_hash)
+        self._cache.move_to_end(key)
+        return result
+
+    def _remember(self, key: str, request_hash: str, result: StoredResponse) -> None:
+        self._cache[key] = (request_hash, result, time.monotonic())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _check_hash(stored_hash: str, request_hash: str) -> None:
+        if stored_hash != request_hash:
+            raise IdempotencyKeyReusedError("Idempotency-Key was already used with a different request")
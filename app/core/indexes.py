@@ -0,0 +1,142 @@
+import logging
+from enum import Enum
+
+from beanie import Document
+from pydantic import BaseModel
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Options that change how an index behaves, compared when checking for drift
+INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+
+class IndexState(str, Enum):
+    """State of an index compared to its model declaration."""
+    OK = "ok"
+    MISSING = "missing"
+    CHANGED = "changed"
+    UNDECLARED = "undeclared"
+
+
+class IndexDrift(BaseModel):
+    """Declared and live state of a single index."""
+    collection: str
+    name: str
+    keys: list[tuple[str, int]]
+    state: IndexState
+    size_bytes: int | None = None
+
+
+def declared_indexes(model: type[Document]) -> list[IndexModel]:
+    """Return the indexes declared in the model Settings."""
+    return list(getattr(model.Settings, "indexes", []))
+
+
+async def ensure_indexes(models: list[type[Document]]) -> list[str]:
+    """Create missing declared indexes and fix changed ones; return their names.
+
+    A changed TTL is applied in place with collMod. Any other change drops
+    and rebuilds the index, so queries relying on it scan until it is back.
+    """
+    fixed = []
+    for model in models:
+        collection = model.get_motor_collection()
+        live = await collection.index_information()
+        missing = []
+        for index in declared_indexes(model):
+            declared = index.document
+            name = declared["name"]
+            if name not in live:
+                missing.append(index)
+            elif _same_definition(declared, live[name]):
+                continue
+            elif _only_ttl_changed(declared, live[name]):
+                await collection.database.command({
+                    "collMod": collection.name,
+                    "index": {"name": name, "expireAfterSeconds": declared["expireAfterSeconds"]},
+                })
+                fixed.append(name)
+            else:
+                logger.warning("Rebuilding index %s.%s to match its declaration", collection.name, name)
+                await collection.drop_index(name)
+                missing.append(index)
+        if missing:
+            fixed += await collection.create_indexes(missing)
+    return fixed
+
+
+async def drifted_indexes(models: list[type[Document]]) -> list[str]:
+    """Return the declared indexes that are missing or differ from the live ones, as collection.name."""
+    drifted = []
+    for model in models:
+        collection = model.get_motor_collection()
+        live = await collection.index_information()
+        drifted += [
+            f"{collection.name}.{index.document['name']}"
+            for index in declared_indexes(model)
+            if index.document["name"] not in live or not _same_definition(index.document, live[index.document["name"]])
+        ]
+    return drifted
+
+
+async def index_drift(models: list[type[Document]]) -> list[IndexDrift]:
+    """Compare declared indexes with the live ones, including their sizes."""
+    report = []
+    for model in models:
+        collection = model.get_motor_collection()
+        live = await collection.index_information()
+        sizes = await _index_sizes(collection)
+        declared = {index.document["name"]: index.document for index in declared_indexes(model)}
+
+        for name, document in declared.items():
+            if name not in live:
+                state = IndexState.MISSING
+            elif _same_definition(document, live[name]):
+                state = IndexState.OK
+            else:
+                state = IndexState.CHANGED
+            report.append(IndexDrift(
+                collection=collection.name,
+                name=name,
+                keys=list(document["key"].items()),
+                state=state,
+                size_bytes=sizes.get(name)
+            ))
+
+        for name, info in live.items():
+            if name == "_id_" or name in declared:
+                continue
+            report.append(IndexDrift(
+                collection=collection.name,
+                name=name,
+                keys=[(field, int(direction)) for field, direction in info["key"]],
+                state=IndexState.UNDECLARED,
+                size_bytes=sizes.get(name)
+            ))
+    return report
+
+
+def _same_definition(declared: dict, live: dict) -> bool:
+    """Check whether a live index matches its declaration."""
+    if list(declared["key"].items()) != [tuple(key) for key in live["key"]]:
+        return False
+    return all(declared.get(option) == live.get(option) for option in INDEX_OPTIONS)
+
+
+def _only_ttl_changed(declared: dict, live: dict) -> bool:
+    """Check whether a live index differs from its declaration only in its TTL."""
+    if "expireAfterSeconds" not in declared or "expireAfterSeconds" not in live:
+        return False
+    return _same_definition(declared, {**live, "expireAfterSeconds": declared["expireAfterSeconds"]})
+
+
+async def _index_sizes(collection) -> dict[str, int]:
+    """Return index sizes in bytes keyed by index name, empty when unavailable."""
+    try:
+        stats = await collection.aggregate([{"$collStats": {"storageStats": {}}}]).to_list(length=None)
+    except (PyMongoError, NotImplementedError):
+        logger.warning("Could not read index sizes for %s", collection.name)
+        return {}
+    return stats[0]["storageStats"].get("indexSizes", {}) if stats else {}
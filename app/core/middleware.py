@@ -0,0 +1,63 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import SIZE_BUCKETS, Gauge, Histogram, MetricsRegistry
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Record latency, response size and in-flight requests per route template.
+
+    Plain ASGI rather than BaseHTTPMiddleware, which would add a task and a
+    stream copy to every request.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry):
+        self.app = app
+        self.latency = registry.register(Histogram(
+            "http_request_duration_seconds",
+            "Time spent handling HTTP requests, by route template",
+            ("method", "route", "status")
+        ))
+        self.response_size = registry.register(Histogram(
+            "http_response_size_bytes",
+            "Size of HTTP response bodies, by route template",
+            ("method", "route"),
+            buckets=SIZE_BUCKETS
+        ))
+        self.in_flight = registry.register(Gauge(
+            "http_requests_in_flight",
+            "HTTP requests being handled"
+        ))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        self.in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight.dec()
+            # The router stores the matched route in the scope; raw paths would explode cardinality
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            self.latency.observe(elapsed, (method, template, str(status_code)))
+            self.response_size.observe(body_size, (method, template))
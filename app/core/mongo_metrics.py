@@ -0,0 +1,211 @@
+import threading
+from collections import Counter, deque
+
+from pydantic import BaseModel
+from pymongo import monitoring
+
+from app.core.metrics import CallbackMetric, Histogram, MetricsRegistry
+
+
+class PoolStats(BaseModel):
+    """Connection pool counters and checkout wait times."""
+    max_pool_size: int | None
+    min_pool_size: int
+    open_connections: int
+    checked_out: int
+    waiting: int
+    checkouts: int
+    checkout_failures: dict[str, int]
+    pool_clears: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_p50: float | None
+    wait_seconds_p99: float | None
+
+
+class CommandStats(BaseModel):
+    """Counters of commands sent to the server."""
+    in_flight: int
+    succeeded: int
+    failed: int
+    seconds_total: float
+    by_command: dict[str, int]
+
+
+class MongoStats(BaseModel):
+    """Pool and command metrics of the Mongo client."""
+    pool: PoolStats
+    commands: CommandStats
+
+
+def _percentile(samples: list[float], fraction: float) -> float | None:
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Track pool saturation: checked-out connections, waiters and checkout waits.
+
+    Callbacks run on the driver's threads, so counters are updated under a lock.
+    """
+
+    def __init__(self, max_pool_size: int | None = None, min_pool_size: int = 0, sample_size: int = 1024):
+        self.max_pool_size = max_pool_size
+        self.min_pool_size = min_pool_size
+        self._lock = threading.Lock()
+        self._open = 0
+        self._checked_out = 0
+        self._waiting = 0
+        self._checkouts = 0
+        self._failures: Counter[str] = Counter()
+        self._clears = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits: deque[float] = deque(maxlen=sample_size)
+
+    def register(self, registry: MetricsRegistry) -> None:
+        """Expose pool gauges and checkout counters, read when scraped."""
+        for name, documentation, kind, field in (
+            ("mongodb_pool_open_connections", "Connections open in the pool", "gauge", "open_connections"),
+            ("mongodb_pool_checked_out_connections", "Connections checked out of the pool", "gauge", "checked_out"),
+            ("mongodb_pool_wait_queue_size", "Operations waiting for a connection", "gauge", "waiting"),
+            ("mongodb_pool_checkouts_total", "Connections checked out", "counter", "checkouts"),
+            ("mongodb_pool_wait_seconds_total", "Time spent waiting for a connection", "counter", "wait_seconds_total"),
+        ):
+            registry.register(CallbackMetric(
+                name, documentation, lambda field=field: {(): getattr(self.stats(), field)}, kind=kind
+            ))
+        registry.register(CallbackMetric(
+            "mongodb_pool_checkout_failures_total",
+            "Connection checkouts that failed, by reason",
+            lambda: {(reason,): count for reason, count in self.stats().checkout_failures.items()},
+            ("reason",),
+            kind="counter"
+        ))
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            recent_waits = list(self._recent_waits)
+            return PoolStats(
+                max_pool_size=self.max_pool_size,
+                min_pool_size=self.min_pool_size,
+                open_connections=self._open,
+                checked_out=self._checked_out,
+                waiting=self._waiting,
+                checkouts=self._checkouts,
+                checkout_failures=dict(self._failures),
+                pool_clears=self._clears,
+                wait_seconds_total=self._wait_total,
+                wait_seconds_max=self._wait_max,
+                wait_seconds_p50=_percentile(recent_waits, 0.5),
+                wait_seconds_p99=_percentile(recent_waits, 0.99)
+            )
+
+    def connection_check_out_started(self, event) -> None:
+        with self._lock:
+            self._waiting += 1
+
+    def connection_checked_out(self, event) -> None:
+        with self._lock:
+            self._waiting -= 1
+            self._checked_out += 1
+            self._checkouts += 1
+            self._record_wait(event.duration)
+
+    def connection_check_out_failed(self, event) -> None:
+        with self._lock:
+            self._waiting -= 1
+            self._failures[event.reason] += 1
+            self._record_wait(event.duration)
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            self._checked_out -= 1
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self._open += 1
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self._open -= 1
+
+    def pool_cleared(self, event) -> None:
+        with self._lock:
+            self._clears += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def _record_wait(self, duration: float | None) -> None:
+        if duration is None:
+            return
+        self._wait_total += duration
+        self._wait_max = max(self._wait_max, duration)
+        self._recent_waits.append(duration)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Record command latency by collection and command name.
+
+    Durations go into a per-thread sharded histogram and pending commands
+    into a dict, both safe to update from the driver's threads without a lock.
+    """
+
+    def __init__(self):
+        self.latency = Histogram(
+            "mongodb_command_duration_seconds",
+            "Time the server took to answer commands, by collection and command",
+            ("collection", "command", "outcome")
+        )
+        self._pending: dict[tuple, tuple[str, str]] = {}
+
+    def register(self, registry: MetricsRegistry) -> None:
+        registry.register(self.latency)
+
+    def stats(self) -> CommandStats:
+        succeeded = failed = 0
+        seconds_total = 0.0
+        by_command: Counter[str] = Counter()
+        for (_, command, outcome), series in self.latency.collect().items():
+            count = sum(series[:-1])
+            by_command[command] += count
+            seconds_total += series[-1]
+            if outcome == "succeeded":
+                succeeded += count
+            else:
+                failed += count
+        return CommandStats(
+            in_flight=len(self._pending),
+            succeeded=succeeded,
+            failed=failed,
+            seconds_total=seconds_total,
+            by_command=dict(by_command)
+        )
+
+    def started(self, event) -> None:
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else event.command.get("collection", "")
+        self._pending[(event.request_id, event.connection_id)] = (collection, event.command_name)
+
+    def succeeded(self, event) -> None:
+        self._finish(event, "succeeded")
+
+    def failed(self, event) -> None:
+        self._finish(event, "failed")
+
+    def _finish(self, event, outcome: str) -> None:
+        command = self._pending.pop((event.request_id, event.connection_id), None)
+        if command is not None:
+            self.latency.observe(event.duration_micros / 1_000_000, command + (outcome,))
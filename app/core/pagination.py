@@ -0,0 +1,104 @@
+import base64
+from datetime import datetime
+from numbers import Real
+from typing import Any, Generic, TypeVar
+
+from bson import ObjectId, json_util
+from bson.errors import BSONError
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from pymongo import ASCENDING
+
+T = TypeVar('T')
+
+SortSpec = list[tuple[str, int]]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Types a cursor may carry for each sort field; other fields sort by a number
+CURSOR_VALUE_TYPES: dict[str, tuple[type, ...]] = {
+    "_id": (ObjectId,),
+    "created_at": (datetime,),
+}
+NUMERIC_CURSOR_VALUE_TYPES = (Real,)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class Page(BaseModel, Generic[T]):
+    """A page of results with the cursor of the following page."""
+    items: list[T]
+    next_cursor: str | None = None
+
+
+class EncodedPage(BaseModel):
+    """A page of results already encoded as a JSON array."""
+    content: bytes
+    next_cursor: str | None = None
+
+
+def encode_cursor(sort: SortSpec, values: list[Any]) -> str:
+    """Encode the sort key values of the last returned document."""
+    payload = json_util.dumps({"k": [field for field, _ in sort], "v": values})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortSpec) -> list[Any]:
+    """Decode a cursor produced by encode_cursor for the same sort order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded))
+        keys, values = payload["k"], payload["v"]
+    except (ValueError, TypeError, KeyError, BSONError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+    if keys != [field for field, _ in sort] or len(values) != len(sort):
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    # Values end up in query filters, so operators such as {"$ne": null} must not get through
+    for (field, _), value in zip(sort, values):
+        expected = CURSOR_VALUE_TYPES.get(field, NUMERIC_CURSOR_VALUE_TYPES)
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise InvalidCursorError(f"Invalid cursor value for {field}")
+    return values
+
+
+def decode_cursor_param(cursor: str | None, sort: SortSpec) -> list[Any] | None:
+    """Decode the cursor query parameter, rejecting malformed ones with a 400."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, sort)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+
+def seek_filter(sort: SortSpec, values: list[Any]) -> dict:
+    """Build a filter matching documents that come strictly after values in sort order."""
+    clauses = []
+    for position, (field, direction) in enumerate(sort):
+        clause = {previous: values[index] for index, (previous, _) in enumerate(sort[:position])}
+        clause[field] = {"$gt" if direction == ASCENDING else "$lt": values[position]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def next_page_cursor(documents: list, limit: int, sort: SortSpec) -> str | None:
+    """Return the cursor of the next page, or None when this page is the last one."""
+    if not documents or len(documents) < limit:
+        return None
+    last = documents[-1]
+    if isinstance(last, dict):
+        values = [last[field] for field, _ in sort]
+    else:
+        values = [last.id if field == "_id" else getattr(last, field) for field, _ in sort]
+    return encode_cursor(sort, values)
+
+
+def page_headers(page: Page | EncodedPage) -> dict[str, str]:
+    """Response headers announcing the cursor of the next page."""
+    return {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+WarmUpStep = Callable[[], Awaitable[str | None]]
+
+
+class ReadinessStep(BaseModel):
+    """Progress of a warm-up step."""
+    name: str
+    done: bool = False
+    detail: str | None = None
+
+
+class PingResult(BaseModel):
+    """Outcome of the most recent Mongo ping."""
+    ok: bool
+    latency_ms: float | None = None
+    checked_at: datetime
+    error: str | None = None
+
+
+class ReadinessReport(BaseModel):
+    """Whether the instance should receive traffic, and why not."""
+    ready: bool
+    steps: list[ReadinessStep]
+    ping: PingResult | None = None
+
+
+class Readiness:
+    """Track warm-up and answer readiness probes.
+
+    Warm-up steps run in order in the background, each retried until it
+    succeeds. Once they are done, probes are answered from a Mongo ping that
+    is reused for ping_interval_seconds; concurrent probes share the ping in
+    flight, so frequent probes cost at most one ping per interval.
+    """
+
+    def __init__(
+        self,
+        ping_interval_seconds: float = 2.0,
+        ping_timeout_seconds: float = 1.0,
+        retry_seconds: float = 5.0
+    ):
+        self.ping_interval_seconds = ping_interval_seconds
+        self.ping_timeout_seconds = ping_timeout_seconds
+        self.retry_seconds = retry_seconds
+        self.steps: dict[str, ReadinessStep] = {}
+        self._ping: Callable[[], Awaitable] | None = None
+        self._last_ping: PingResult | None = None
+        self._last_ping_at = 0.0
+        self._ping_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def warmed_up(self) -> bool:
+        return bool(self.steps) and all(step.done for step in self.steps.values())
+
+    def start(self, ping: Callable[[], Awaitable], steps: list[tuple[str, WarmUpStep]]) -> None:
+        """Run the warm-up steps in the background and probe Mongo with ping."""
+        self._ping = ping
+        self._last_ping = None
+        self.steps = {name: ReadinessStep(name=name) for name, _ in steps}
+        self._task = asyncio.create_task(self._warm_up(steps))
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self.steps = {}
+
+    async def report(self) -> ReadinessReport:
+        steps = list(self.steps.values())
+        if not self.warmed_up:
+            return ReadinessReport(ready=False, steps=steps)
+        ping = await self.ping()
+        return ReadinessReport(ready=ping.ok, steps=steps, ping=ping)
+
+    async def ping(self) -> PingResult:
+        """Ping Mongo, reusing the last result while it is fresh."""
+        if self._fresh():
+            return self._last_ping
+        async with self._ping_lock:
+            # Another probe may have pinged while this one waited
+            if self._fresh():
+                return self._last_ping
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._ping(), self.ping_timeout_seconds)
+                result = PingResult(
+                    ok=True, latency_ms=(time.perf_counter() - started) * 1000, checked_at=datetime.utcnow()
+                )
+            except Exception as exc:
+                result = PingResult(ok=False, checked_at=datetime.utcnow(), error=str(exc) or type(exc).__name__)
+            self._last_ping = result
+            self._last_ping_at = time.monotonic()
+            return result
+
+    def _fresh(self) -> bool:
+        return self._last_ping is not None and time.monotonic() - self._last_ping_at < self.ping_interval_seconds
+
+    async def _warm_up(self, steps: list[tuple[str, WarmUpStep]]) -> None:
+        for name, step in steps:
+            while True:
+                try:
+                    self.steps[name].detail = await step()
+                    self.steps[name].done = True
+                    break
+                except Exception as exc:
+                    self.steps[name].detail = str(exc) or type(exc).__name__
+                    logger.warning("Warm-up step %s failed, retrying in %ss: %s", name, self.retry_seconds, exc)
+                    await asyncio.sleep(self.retry_seconds)
+        logger.info("Warm-up finished: %s", ", ".join(f"{name} ({self.steps[name].detail})" for name, _ in steps))
+
+
+readiness = Readiness(
+    settings.readiness_ping_interval_seconds,
+    settings.readiness_ping_timeout_seconds,
+    settings.readiness_retry_seconds
+)
+
+
+async def get_readiness() -> Readiness:
+    return readiness
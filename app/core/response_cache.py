@@ -0,0 +1,149 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from pydantic import BaseModel
+
+from app.core.metrics import CallbackMetric, MetricsRegistry
+
+
+class ResponseCacheStats(BaseModel):
+    """Counters of a response cache."""
+    entries: int
+    bytes_held: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+
+
+class _Entry:
+    __slots__ = ("value", "size", "ids", "span", "stored_at")
+
+    def __init__(self, value: Any, size: int, ids: frozenset, span: tuple | None, stored_at: float):
+        self.value = value
+        self.size = size
+        self.ids = ids
+        self.span = span
+        self.stored_at = stored_at
+
+    def covers(self, resource_id: Any) -> bool:
+        """Whether inserting or removing resource_id changes which resources this entry lists."""
+        if self.span is None:
+            return False
+        low, high = self.span
+        return (low is None or resource_id > low) and (high is None or resource_id <= high)
+
+
+class ResponseCache:
+    """LRU cache of encoded responses bounded by a byte budget.
+
+    Each entry records the IDs of the resources it contains and, for
+    listings, the span of sort keys it covers. Writers invalidate only the
+    entries a change can affect. Entries also expire after ttl_seconds to
+    bound staleness from writes made by other processes.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, ttl_seconds: float = 30.0):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.bytes_held = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter advanced by every invalidation; pass it back to put."""
+        return self._generation
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.stored_at > self.ttl_seconds:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        size: int,
+        generation: int,
+        ids: list | None = None,
+        span: tuple | None = None
+    ) -> None:
+        """Store value unless an invalidation happened since generation was read.
+
+        span is the (exclusive low, inclusive high) range of sort keys a
+        listing covers, None standing for an open end.
+        """
+        if generation != self._generation or size > self.max_bytes:
+            # The value was read before a write it may not reflect
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(value, size, frozenset(ids or ()), span, time.monotonic())
+        self.bytes_held += size
+        while self.bytes_held > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, resource_id: Any) -> None:
+        """Drop entries containing a resource whose content changed."""
+        self._invalidate(lambda entry: resource_id in entry.ids)
+
+    def invalidate_range(self, resource_id: Any) -> None:
+        """Drop entries a resource being inserted or removed can change."""
+        self._invalidate(lambda entry: resource_id in entry.ids or entry.covers(resource_id))
+
+    def clear(self) -> None:
+        self._generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self.bytes_held = 0
+
+    def register(self, registry: MetricsRegistry, name: str) -> None:
+        """Expose the cache's gauges and counters under the name prefix."""
+        for suffix, documentation, kind, read in (
+            ("entries", "Responses held", "gauge", lambda: len(self._entries)),
+            ("bytes", "Bytes of responses held", "gauge", lambda: self.bytes_held),
+            ("max_bytes", "Byte budget", "gauge", lambda: self.max_bytes),
+            ("hits_total", "Lookups answered from the cache", "counter", lambda: self.hits),
+            ("misses_total", "Lookups that missed", "counter", lambda: self.misses),
+            ("evictions_total", "Responses evicted to stay within the byte budget", "counter", lambda: self.evictions),
+            ("invalidations_total", "Responses dropped by writes", "counter", lambda: self.invalidations),
+        ):
+            registry.register(CallbackMetric(f"{name}_{suffix}", documentation, lambda read=read: {(): read()}, kind=kind))
+
+    def stats(self) -> ResponseCacheStats:
+        lookups = self.hits + self.misses
+        return ResponseCacheStats(
+            entries=len(self._entries),
+            bytes_held=self.bytes_held,
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            misses=self.misses,
+            hit_ratio=self.hits / lookups if lookups else 0.0,
+            evictions=self.evictions,
+            invalidations=self.invalidations
+        )
+
+    def _invalidate(self, affected) -> None:
+        self._generation += 1
+        stale = [key for key, entry in self._entries.items() if affected(entry)]
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+
+    def _remove(self, key: Hashable) -> None:
+        self.bytes_held -= self._entries.pop(key).size
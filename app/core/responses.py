@@ -0,0 +1,57 @@
+from datetime import datetime
+from functools import lru_cache
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.pagination import EncodedPage, page_headers
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class EncodedResource(BaseModel):
+    """A single resource already encoded as JSON, with its revision."""
+    id: str
+    content: bytes
+    updated_at: datetime
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    """Get the compiled adapter that dumps a list of model."""
+    return TypeAdapter(list[model])
+
+
+def model_response(content: BaseModel, status_code: int = 200, headers: dict | None = None) -> Response:
+    """Encode a trusted response model, skipping FastAPI's response_model validation."""
+    return Response(
+        content=content.__pydantic_serializer__.to_json(content),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE
+    )
+
+
+def model_list_response(
+    content: list[BaseModel],
+    model: type[BaseModel],
+    status_code: int = 200,
+    headers: dict | None = None
+) -> Response:
+    """Encode a list of trusted response models, skipping FastAPI's response_model validation."""
+    return Response(
+        content=list_adapter(model).dump_json(content),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE
+    )
+
+
+def encoded_response(content: bytes, status_code: int = 200, headers: dict | None = None) -> Response:
+    """Send JSON that is already encoded."""
+    return Response(content=content, status_code=status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
+
+
+def encoded_page_response(page: EncodedPage) -> Response:
+    """Send a page that is already encoded."""
+    return encoded_response(page.content, headers=page_headers(page))
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, TypeVar, Generic
 
+from pydantic_core import to_json
+
 T = TypeVar('T')
 S = TypeVar('S')
 
@@ -17,3 +19,53 @@ class BaseSerializer(ABC, Generic[T, S]):
         """Serialize a list of data."""
         return [await self.serialize(item) for item in data_list]
     
+
+
+class TrustedSerializer(BaseSerializer[T, S]):
+    """Serializer for data read from our own documents.
+    
+    Responses are built synchronously with model_construct, skipping the
+    validation the documents already passed when they were written.
+    """
+    
+    @abstractmethod
+    def build(self, data: T) -> S:
+        """Build the response without validation."""
+        raise NotImplementedError
+    
+    def build_list(self, data_list: List[T]) -> List[S]:
+        """Build responses for a batch without validation."""
+        build = self.build
+        return [build(item) for item in data_list]
+    
+    async def serialize(self, data: T) -> S:
+        """Serialize data."""
+        return self.build(data)
+    
+    async def serialize_list(self, data_list: List[T]) -> List[S]:
+        """Serialize a list of data."""
+        return self.build_list(data_list)
+
+
+class DocumentSerializer(TrustedSerializer[T, S]):
+    """Trusted serializer that can also encode raw documents.
+    
+    Raw documents read with document_projection are encoded straight to
+    JSON through response_fields, without building models.
+    """
+    
+    document_projection: Dict[str, Any] | None = None
+    
+    @abstractmethod
+    def response_fields(self, document: dict) -> Dict[str, Any]:
+        """Map a raw document to response fields, in the response model's field order."""
+        raise NotImplementedError
+    
+    def encode_document(self, document: dict) -> bytes:
+        """Encode a raw document straight to the JSON of its response."""
+        return to_json(self.response_fields(document))
+    
+    def encode_documents(self, documents: List[dict]) -> bytes:
+        """Encode raw documents straight to the JSON of a list of responses."""
+        response_fields = self.response_fields
+        return to_json([response_fields(document) for document in documents])
@@ -0,0 +1,243 @@
+import asyncio
+import functools
+import inspect
+import logging
+import random
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+
+from pydantic import BaseModel
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Repository method issuing the current commands; Motor copies the context
+# into the thread that runs each command, so listeners can read it
+current_operation: ContextVar[str | None] = ContextVar("current_operation", default=None)
+
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+
+# Session and cluster bookkeeping the driver adds, which explain rejects
+DRIVER_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"}
+
+
+def trace_operations(cls):
+    """Name the commands issued by a repository's public coroutine methods after the method."""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _traced(method, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def _traced(method, operation: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = current_operation.set(operation)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+    return wrapper
+
+
+def query_shape(value):
+    """Replace literal values with "?" so queries differing only in values compare equal."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and value and all(isinstance(item, dict) for item in value):
+        return [query_shape(item) for item in value]
+    return "?"
+
+
+def command_shape(command_name: str, command: dict) -> dict:
+    """The parts of a command that decide how the server runs it, with values normalized."""
+    if command_name == "find":
+        shape = {"filter": query_shape(command.get("filter", {}))}
+        if "sort" in command:
+            shape["sort"] = dict(command["sort"])
+        return shape
+    if command_name == "aggregate":
+        return {"pipeline": query_shape(command.get("pipeline", []))}
+    if command_name in ("count", "distinct", "findAndModify"):
+        return {"query": query_shape(command.get("query", {}))}
+    if command_name == "update":
+        return {"q": [query_shape(update.get("q", {})) for update in command.get("updates", [])[:1]]}
+    if command_name == "delete":
+        return {"q": [query_shape(delete.get("q", {})) for delete in command.get("deletes", [])[:1]]}
+    return {}
+
+
+class QueryPlan(BaseModel):
+    """Summary of an explain() result."""
+    stages: list[str]
+    docs_examined: int | None = None
+    keys_examined: int | None = None
+    n_returned: int | None = None
+    flags: list[str] = []
+
+
+class SlowQuery(BaseModel):
+    """A command that took longer than the slow query threshold."""
+    occurred_at: datetime
+    operation: str | None
+    database: str
+    collection: str
+    command: str
+    duration_ms: float
+    shape: dict
+    explain_status: str = "skipped"
+    plan: QueryPlan | None = None
+
+
+def _find_key(document, key: str):
+    """First value stored under key anywhere in a nested explain document."""
+    if isinstance(document, dict):
+        if key in document:
+            return document[key]
+        children = document.values()
+    elif isinstance(document, list):
+        children = document
+    else:
+        return None
+    for child in children:
+        found = _find_key(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _stages(plan) -> list[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for key in ("inputStage", "queryPlan"):
+            stages += _stages(plan.get(key))
+        for child in plan.get("inputStages", []):
+            stages += _stages(child)
+    return stages
+
+
+def summarize_explain(explain: dict, ratio_threshold: float) -> QueryPlan:
+    """Pull the winning plan's stages and execution counters out of an explain result."""
+    stats = _find_key(explain, "executionStats") or {}
+    plan = QueryPlan(
+        stages=_stages(_find_key(explain, "winningPlan")),
+        docs_examined=stats.get("totalDocsExamined"),
+        keys_examined=stats.get("totalKeysExamined"),
+        n_returned=stats.get("nReturned"),
+    )
+    if "COLLSCAN" in plan.stages:
+        plan.flags.append("COLLSCAN")
+    if plan.docs_examined is not None and plan.n_returned is not None:
+        if plan.docs_examined / max(plan.n_returned, 1) >= ratio_threshold:
+            plan.flags.append("HIGH_DOCS_EXAMINED_RATIO")
+    return plan
+
+
+class SlowQueryRecorder(monitoring.CommandListener):
+    """Keep the most recent slow commands in a bounded ring.
+
+    A sample of the explainable ones is explained on the event loop after
+    the fact, one at a time, so recording never waits on the server.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 100.0,
+        size: int = 200,
+        explain_sample_rate: float = 0.1,
+        ratio_threshold: float = 100.0
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.ratio_threshold = ratio_threshold
+        self.records: deque[SlowQuery] = deque(maxlen=size)
+        self._pending: dict[tuple, tuple[str | None, dict]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client = None
+        self._explaining = False
+
+    def bind(self, loop: asyncio.AbstractEventLoop, client) -> None:
+        """Give the recorder the loop and client it explains slow commands with."""
+        self._loop = loop
+        self._client = client
+
+    def recent(self, limit: int | None = None) -> list[SlowQuery]:
+        """Slow commands, newest first."""
+        records = list(reversed(self.records))
+        return records[:limit] if limit is not None else records
+
+    def started(self, event) -> None:
+        if event.command_name == "explain":
+            return
+        self._pending[(event.request_id, event.connection_id)] = (current_operation.get(), event.command)
+
+    def succeeded(self, event) -> None:
+        self._finish(event)
+
+    def failed(self, event) -> None:
+        self._finish(event)
+
+    def _finish(self, event) -> None:
+        pending = self._pending.pop((event.request_id, event.connection_id), None)
+        duration_ms = event.duration_micros / 1000
+        if pending is None or duration_ms < self.threshold_ms:
+            return
+
+        operation, command = pending
+        target = command.get(event.command_name)
+        record = SlowQuery(
+            occurred_at=datetime.utcnow(),
+            operation=operation,
+            database=event.database_name,
+            collection=target if isinstance(target, str) else command.get("collection", ""),
+            command=event.command_name,
+            duration_ms=duration_ms,
+            shape=command_shape(event.command_name, command),
+        )
+        self.records.append(record)
+        logger.warning(
+            "Slow %s on %s.%s from %s took %.1fms: %s",
+            record.command, record.database, record.collection, record.operation, duration_ms, record.shape
+        )
+
+        if (
+            event.command_name in EXPLAINABLE_COMMANDS
+            and self._loop is not None
+            and random.random() < self.explain_sample_rate
+        ):
+            record.explain_status = "pending"
+            self._loop.call_soon_threadsafe(self._schedule_explain, record, command)
+
+    def _schedule_explain(self, record: SlowQuery, command: dict) -> None:
+        if self._explaining:
+            record.explain_status = "skipped"
+            return
+        self._explaining = True
+        asyncio.ensure_future(self._explain(record, command))
+
+    async def _explain(self, record: SlowQuery, command: dict) -> None:
+        explained = {
+            key: value for key, value in command.items()
+            if key not in DRIVER_FIELDS and not key.startswith("$")
+        }
+        try:
+            result = await self._client[record.database].command(
+                {"explain": explained, "verbosity": "executionStats"}
+            )
+            record.plan = summarize_explain(result, self.ratio_threshold)
+            record.explain_status = "done"
+            if record.plan.flags:
+                logger.warning(
+                    "Slow %s from %s: %s (%s)",
+                    record.command, record.operation, ", ".join(record.plan.flags), " <- ".join(record.plan.stages)
+                )
+        except PyMongoError as exc:
+            record.explain_status = "failed"
+            logger.info("Explaining slow %s failed: %s", record.command, exc)
+        finally:
+            self._explaining = False
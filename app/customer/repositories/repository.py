@@ -1,14 +1,21 @@
 
 from datetime import datetime
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, UpdateResponse
+from beanie.odm.operators.update.general import Set
+from pymongo import ASCENDING
 
+from app.core.pagination import SortSpec, seek_filter
+from app.core.slow_queries import trace_operations
 from app.models.customer import Customer
 from app.customer.schemas.customer import CustomerCreate, CustomerUpdate
 
 
+@trace_operations
 class CustomerRepository:
     """Customer Repository."""
     
+    sort: SortSpec = [("_id", ASCENDING)]
+    
     async def create(self, customer_data: CustomerCreate) -> Customer:
         """Create a new customer."""
         customer = Customer(**customer_data.dict())
@@ -21,35 +28,73 @@ class CustomerRepository:
         except Exception:
             return None
     
+    async def get_updated_at(self, customer_id: str) -> datetime | None:
+        """Get only the last modification time of a customer."""
+        try:
+            object_id = PydanticObjectId(customer_id)
+        except Exception:
+            return None
+        
+        document = await Customer.get_motor_collection().find_one({"_id": object_id}, {"updated_at": 1})
+        return document.get("updated_at") if document else None
+    
+    async def get_by_ids(self, customer_ids: list[str]) -> list[Customer]:
+        """Get multiple customers by IDs."""
+        object_ids = [PydanticObjectId(cid) for cid in customer_ids if PydanticObjectId.is_valid(cid)]
+        if not object_ids:
+            return []
+        return await Customer.find({"_id": {"$in": object_ids}}).to_list()
+    
     async def get_by_email(self, email: str) -> Customer | None:
         """Get customer by email."""
         return await Customer.find_one({"email": email})
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Customer]:
+    async def get_all(self, skip: int = 0, limit: int = 100, after: list | None = None) -> list[Customer]:
         """Get all customers with pagination."""
-        return await Customer.find_all().skip(skip).limit(limit).to_list()
+        query = Customer.find_all()
+        if after is not None:
+            query = query.find(seek_filter(self.sort, after))
+        else:
+            query = query.skip(skip)
+        return await query.sort(self.sort).limit(limit).to_list()
+    
+    async def get_documents(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list | None = None,
+        projection: dict | None = None
+    ) -> list[dict]:
+        """Get a page of raw customer documents without hydrating Beanie models."""
+        query = seek_filter(self.sort, after) if after is not None else {}
+        cursor = Customer.get_motor_collection().find(query, projection).sort(self.sort).limit(limit)
+        if after is None:
+            cursor = cursor.skip(skip)
+        return await cursor.to_list(length=limit)
     
     async def update(self, customer_id: str, customer_data: CustomerUpdate) -> Customer | None:
-        """Update customer."""
-        customer = await self.get_by_id(customer_id)
-        if not customer:
+        """Update only the changed fields of a customer."""
+        try:
+            object_id = PydanticObjectId(customer_id)
+        except Exception:
             return None
         
         update_data = customer_data.dict(exclude_unset=True)
         if not update_data:
-            return customer
+            return await Customer.get(object_id)
         
-        for field, value in update_data.items():
-            setattr(customer, field, value)
-        
-        customer.updated_at = datetime.utcnow()
-        return await customer.save()
+        update_data["updated_at"] = datetime.utcnow()
+        return await Customer.find_one(Customer.id == object_id).update(
+            Set(update_data),
+            response_type=UpdateResponse.NEW_DOCUMENT
+        )
     
     async def delete(self, customer_id: str) -> bool:
         """Delete customer."""
-        customer = await self.get_by_id(customer_id)
-        if not customer:
+        try:
+            object_id = PydanticObjectId(customer_id)
+        except Exception:
             return False
         
-        await customer.delete()
-        return True
+        result = await Customer.find_one(Customer.id == object_id).delete()
+        return bool(result and result.deleted_count)
@@ -1,6 +1,12 @@
 from fastapi import APIRouter, Depends, status, Query
 
 from app.container.dependencies import get_customer_service
+from app.core.conditional import (
+    ConditionalRequest, get_conditional_request, not_modified_response, validator_headers
+)
+from app.core.config import settings
+from app.core.pagination import page_headers
+from app.core.responses import encoded_page_response, model_list_response, model_response
 from app.customer.services.service import CustomerService
 from app.customer.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
 
@@ -20,20 +26,31 @@ async def create_customer(
 @router.get("/{customer_id}", response_model=CustomerResponse)
 async def get_customer(
     customer_id: str,
+    conditional: ConditionalRequest = Depends(get_conditional_request),
     service: CustomerService = Depends(get_customer_service)
 ):
-    """Get customer by ID."""
-    return await service.get_customer_by_id(customer_id)
+    """Get customer by ID, answering revalidation requests with 304 Not Modified."""
+    if conditional.present:
+        updated_at = await service.get_customer_updated_at(customer_id)
+        if updated_at and conditional.not_modified(customer_id, updated_at):
+            return not_modified_response(customer_id, updated_at)
+    
+    customer = await service.get_customer_by_id(customer_id)
+    return model_response(customer, headers=validator_headers(customer.id, customer.updated_at))
 
 
 @router.get("/", response_model=list[CustomerResponse])
 async def list_customers(
     skip: int = Query(0, ge=0, description="Number of customers to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of customers to return"),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; takes precedence over skip"),
     service: CustomerService = Depends(get_customer_service)
 ):
     """List all customers with pagination."""
-    return await service.get_all_customers(skip, limit)
+    if "customers.list" in settings.raw_read_routes:
+        return encoded_page_response(await service.get_all_customers_encoded(skip, limit, cursor))
+    page = await service.get_all_customers(skip, limit, cursor)
+    return model_list_response(page.items, CustomerResponse, headers=page_headers(page))
 
 
 @router.put("/{customer_id}", response_model=CustomerResponse)
@@ -1,15 +1,17 @@
 
-from app.core.serializers.base import BaseSerializer
+from app.core.serializers.base import BaseSerializer, DocumentSerializer
 from app.models.customer import Customer
 from app.customer.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
 
 
-class CustomerSerializer(BaseSerializer[Customer, CustomerResponse]):
+class CustomerSerializer(DocumentSerializer[Customer, CustomerResponse]):
     """Serializer for Customer."""
     
-    async def serialize(self, customer: Customer) -> CustomerResponse:
-        """Serialize Customer to CustomerResponse."""
-        return CustomerResponse(
+    document_projection = {"name": 1, "email": 1, "created_at": 1, "updated_at": 1}
+    
+    def build(self, customer: Customer) -> CustomerResponse:
+        """Build CustomerResponse from Customer."""
+        return CustomerResponse.model_construct(
             id=str(customer.id),
             name=customer.name,
             email=customer.email,
@@ -17,6 +19,16 @@ class CustomerSerializer(BaseSerializer[Customer, CustomerResponse]):
             updated_at=customer.updated_at
         )
     
+    def response_fields(self, document: dict) -> dict:
+        """Map a raw Mongo customer document to CustomerResponse fields."""
+        return {
+            "name": document["name"],
+            "email": document["email"],
+            "id": str(document["_id"]),
+            "created_at": document["created_at"],
+            "updated_at": document.get("updated_at")
+        }
+    
 
 class CustomerCreateSerializer(BaseSerializer[CustomerCreate, CustomerResponse]):
     """Serializer for CustomerCreate."""
@@ -1,6 +1,9 @@
+from datetime import datetime
 
 from fastapi import HTTPException, status
+from pymongo.errors import DuplicateKeyError
 
+from app.core.pagination import EncodedPage, Page, decode_cursor_param, next_page_cursor
 from app.models.customer import Customer
 from app.customer.repositories.repository import CustomerRepository
 from app.customer.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
@@ -47,48 +50,58 @@ class CustomerService:
             )
         return await self.serializer.serialize(customer)
     
+    async def get_customer_updated_at(self, customer_id: str) -> datetime | None:
+        """Get the last modification time of a customer, None if it does not exist."""
+        return await self.repository.get_updated_at(customer_id)
+    
     async def get_customer_by_email(self, email: str) -> Customer | None:
         """Get customer by email."""
         return await self.repository.get_by_email(email)
     
-    async def get_all_customers(self, skip: int = 0, limit: int = 100) -> list[CustomerResponse]:
+    async def get_all_customers(self, skip: int = 0, limit: int = 100, cursor: str | None = None) -> Page[CustomerResponse]:
         """Get all customers with pagination."""
-        customers = await self.repository.get_all(skip, limit)
-        return await self.serializer.serialize_list(customers)
+        after = decode_cursor_param(cursor, self.repository.sort)
+        customers = await self.repository.get_all(skip, limit, after)
+        return Page[CustomerResponse](
+            items=self.serializer.build_list(customers),
+            next_cursor=next_page_cursor(customers, limit, self.repository.sort)
+        )
+    
+    async def get_all_customers_encoded(self, skip: int = 0, limit: int = 100, cursor: str | None = None) -> EncodedPage:
+        """Get all customers encoded straight from raw documents."""
+        after = decode_cursor_param(cursor, self.repository.sort)
+        documents = await self.repository.get_documents(skip, limit, after, self.serializer.document_projection)
+        return EncodedPage(
+            content=self.serializer.encode_documents(documents),
+            next_cursor=next_page_cursor(documents, limit, self.repository.sort)
+        )
     
     async def update_customer(self, customer_id: str, customer_data: CustomerUpdate) -> CustomerResponse:
         """Update customer with business validation."""
-        existing_customer = await self.repository.get_by_id(customer_id)
-        if not existing_customer:
+        # The unique email index rejects an email taken by another customer
+        try:
+            updated_customer = await self.repository.update(customer_id, customer_data)
+        except DuplicateKeyError:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Customer not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Customer with this email already exists"
             )
         
-        if customer_data.email and customer_data.email != existing_customer.email:
-            email_exists = await self.repository.get_by_email(customer_data.email)
-            if email_exists:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Customer with this email already exists"
-                )
-        
-        updated_customer = await self.repository.update(customer_id, customer_data)
         if not updated_customer:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update customer"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Customer not found"
             )
         
         return await self.serializer.serialize(updated_customer)
     
     async def delete_customer(self, customer_id: str) -> bool:
         """Delete customer."""
-        customer = await self.repository.get_by_id(customer_id)
-        if not customer:
+        deleted = await self.repository.delete(customer_id)
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Customer not found"
             )
         
-        return await self.repository.delete(customer_id)
+        return deleted
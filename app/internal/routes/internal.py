@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.database import Database, get_database
+from app.core.mongo_metrics import MongoStats
+from app.core.slow_queries import SlowQuery
+
+
+router = APIRouter(prefix="/internal", tags=["internal"], include_in_schema=False)
+
+
+@router.get("/mongo", response_model=MongoStats)
+async def get_mongo_stats(database: Database = Depends(get_database)):
+    """Get connection pool saturation and command counters of the Mongo client."""
+    if database.pool_metrics is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Mongo client is not connected"
+        )
+    return database.stats()
+
+
+@router.get("/slow-queries", response_model=list[SlowQuery])
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="Number of records to return"),
+    database: Database = Depends(get_database)
+):
+    """Get the most recent slow commands with their query shapes and sampled plans."""
+    if database.slow_queries is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Mongo client is not connected"
+        )
+    return database.slow_queries.recent(limit)
@@ -1,13 +1,19 @@
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.database import connect_to_mongo, close_mongo_connection, db, verify_indexes, warm_pool
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.middleware import MetricsMiddleware
+from app.core.readiness import Readiness, ReadinessReport, get_readiness, readiness
 from app.container.containers import container
 from app.customer.routes import customers
+from app.internal.routes import internal
 from app.product.routes import products
 from app.order.routes import orders
+from app.order.schemas.order import OrderEventSource
 
 
 @asynccontextmanager
@@ -25,10 +31,51 @@ async def lifespan(app: FastAPI):
         ]
     )
     app.state.container = container
+    
+    # Answer product lookups on the order creation path from memory
+    product_catalog = container.product.product_catalog()
+    if settings.product_catalog_enabled:
+        await product_catalog.start()
+        product_catalog.register(registry)
+    if settings.response_cache_routes:
+        container.product.product_response_cache().register(registry, "product_response_cache")
+    
+    async def prime_caches() -> str:
+        primed = []
+        if settings.product_catalog_enabled:
+            if not product_catalog.ready:
+                raise RuntimeError("Product catalog is not loaded")
+            primed.append(f"product catalog ({product_catalog.size} products)")
+        if "products.list" in settings.response_cache_routes:
+            await container.product.product_service().get_products_page_cached(
+                raw="products.list" in settings.raw_read_routes
+            )
+            primed.append("first product page")
+        return ", ".join(primed) or "no caches configured"
+    
+    # Report ready on /ready only once the first requests won't pay for warm-up
+    readiness.start(
+        lambda: db.client.admin.command("ping"),
+        [
+            ("pool_warmed", warm_pool),
+            ("indexes_verified", verify_indexes),
+            ("rollups_checked", container.order.order_rollup_repository().check_built),
+            ("caches_primed", prime_caches),
+        ]
+    )
+    
+    # Relay order events from the change stream so every instance sees every write
+    order_event_relay = None
+    if settings.order_events_source == OrderEventSource.CHANGE_STREAM:
+        order_event_relay = asyncio.create_task(container.order.order_service().relay_change_stream())
 
     yield
 
     # Shutdown
+    if order_event_relay:
+        order_event_relay.cancel()
+    await readiness.stop()
+    await product_catalog.stop()
     await close_mongo_connection()
     container.unwire()
 
@@ -50,10 +97,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
 # Include routers
 app.include_router(customers.router)
 app.include_router(products.router)
 app.include_router(orders.router)
+app.include_router(internal.router)
 
 
 @app.get("/")
@@ -66,12 +117,27 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
 
+@app.get("/ready", response_model=ReadinessReport)
+async def readiness_check(response: Response, probe: Readiness = Depends(get_readiness)):
+    """Readiness probe: warm-up finished and Mongo answering pings."""
+    report = await probe.report()
+    if not report.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
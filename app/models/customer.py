@@ -1,4 +1,5 @@
 from beanie import Document
+from pymongo import ASCENDING, IndexModel
 from pydantic import EmailStr, Field
 from datetime import datetime
 
@@ -13,3 +14,6 @@ class Customer(Document):
     
     class Settings:
         name = "customers"
+        indexes = [
+            IndexModel([("email", ASCENDING)], unique=True),
+        ]
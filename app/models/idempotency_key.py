@@ -0,0 +1,34 @@
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+from datetime import datetime
+
+from app.core.config import settings
+
+
+class IdempotencyKey(Document):
+    """Outcome of a request made with an Idempotency-Key header."""
+    
+    key: str
+    request_hash: str
+    status_code: int | None = None
+    response: dict | None = None
+    # Start of the holder's lease; another attempt may take over once it expires
+    reserved_at: datetime | None = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Settings:
+        name = "idempotency_keys"
+        indexes = [
+            IndexModel([("key", ASCENDING)], unique=True),
+            IndexModel([("created_at", ASCENDING)], expireAfterSeconds=settings.idempotency_key_ttl_seconds),
+        ]
+    
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
+    
+    @property
+    def lease_started_at(self) -> datetime:
+        """Start of the current lease; records reserved before leases existed count from creation."""
+        return self.reserved_at or self.created_at
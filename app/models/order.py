@@ -1,6 +1,8 @@
-from beanie import Document
-from pydantic import BaseModel, Field, field_validator
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field, field_validator, model_validator
+from pymongo import ASCENDING, IndexModel
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
 
 
@@ -11,6 +13,18 @@ class OrderStatus(str, Enum):
     CANCELLED = "CANCELLED"
 
 
+ORDER_STATUS_TRANSITIONS: dict[OrderStatus, list[OrderStatus]] = {
+    OrderStatus.PENDING: [OrderStatus.PAID, OrderStatus.CANCELLED],
+    OrderStatus.PAID: [OrderStatus.CANCELLED],
+    OrderStatus.CANCELLED: []
+}
+
+
+def to_cents(amount: float) -> int:
+    """Convert a monetary amount to integer minor units."""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
 class OrderItem(BaseModel):
     """Order item embedded document."""
     
@@ -18,11 +32,20 @@ class OrderItem(BaseModel):
     product_name: str
     quantity: int = Field(..., gt=0)
     unit_price: float = Field(..., gt=0)
+    total_price: float = 0.0
+    unit_price_cents: int = 0
+    total_price_cents: int = 0
     
-    @property
-    def total_price(self) -> float:
-        """Calculate total price for this item."""
-        return self.quantity * self.unit_price
+    @model_validator(mode="after")
+    def compute_totals(self):
+        """Precompute line totals unless they were loaded from storage."""
+        if "total_price" not in self.model_fields_set:
+            self.total_price = self.quantity * self.unit_price
+        if "unit_price_cents" not in self.model_fields_set:
+            self.unit_price_cents = to_cents(self.unit_price)
+        if "total_price_cents" not in self.model_fields_set:
+            self.total_price_cents = self.quantity * self.unit_price_cents
+        return self
 
 
 class Order(Document):
@@ -33,11 +56,20 @@ class Order(Document):
     customer_email: str
     items: list[OrderItem] = Field(..., min_length=1)
     status: OrderStatus = Field(default=OrderStatus.PENDING)
+    total_price: float = 0.0
+    total_price_cents: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Settings:
         name = "orders"
+        indexes = [
+            IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("customer_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("status", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("total_price_cents", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("items.product_id", ASCENDING)]),
+        ]
     
     @field_validator('items')
     @classmethod
@@ -47,17 +79,57 @@ class Order(Document):
             raise ValueError('Order must have at least one item')
         return v
     
-    @property
-    def total_price(self) -> float:
-        """Calculate total price for the order."""
-        return sum(item.total_price for item in self.items)
+    @model_validator(mode="after")
+    def compute_totals(self):
+        """Precompute order totals unless they were loaded from storage."""
+        if "total_price" not in self.model_fields_set:
+            self.total_price = sum(item.total_price for item in self.items)
+        if "total_price_cents" not in self.model_fields_set:
+            self.total_price_cents = sum(item.total_price_cents for item in self.items)
+        return self
     
     def can_transition_to(self, new_status: OrderStatus) -> bool:
         """Check if order can transition to new status."""
-        valid_transitions = {
-            OrderStatus.PENDING: [OrderStatus.PAID, OrderStatus.CANCELLED],
-            OrderStatus.PAID: [OrderStatus.CANCELLED],
-            OrderStatus.CANCELLED: []
+        return new_status in ORDER_STATUS_TRANSITIONS.get(self.status, [])
+    
+    @staticmethod
+    def allowed_from(new_status: OrderStatus) -> list[OrderStatus]:
+        """Get the statuses from which an order can transition to new status."""
+        return [
+            current for current, targets in ORDER_STATUS_TRANSITIONS.items()
+            if new_status in targets
+        ]
+
+
+class OrderSummary(BaseModel):
+    """Order projection without embedded items."""
+    
+    id: PydanticObjectId = Field(alias="_id")
+    customer_id: str
+    customer_name: str
+    status: OrderStatus
+    item_count: int
+    total_price: float
+    # Only stored totals are exact; orders the backfill hasn't reached have none
+    total_price_cents: int | None = None
+    created_at: datetime
+    
+    class Settings:
+        projection = {
+            "_id": 1,
+            "customer_id": 1,
+            "customer_name": 1,
+            "status": 1,
+            "item_count": {"$size": {"$ifNull": ["$items", []]}},
+            # Orders written before totals were stored get the total computed from their items
+            "total_price": {"$ifNull": [
+                "$total_price",
+                {"$sum": {"$map": {
+                    "input": {"$ifNull": ["$items", []]},
+                    "as": "item",
+                    "in": {"$multiply": ["$$item.quantity", "$$item.unit_price"]}
+                }}}
+            ]},
+            "total_price_cents": 1,
+            "created_at": 1,
         }
-        
-        return new_status in valid_transitions.get(self.status, [])
@@ -0,0 +1,21 @@
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+from datetime import datetime
+
+from app.models.order import OrderStatus
+
+
+class OrderRollup(Document):
+    """Daily order count and revenue per order status."""
+    
+    day: datetime
+    status: OrderStatus
+    order_count: int = Field(default=0)
+    revenue_cents: int = Field(default=0)
+    
+    class Settings:
+        name = "order_rollups"
+        indexes = [
+            IndexModel([("day", ASCENDING), ("status", ASCENDING)], unique=True),
+        ]
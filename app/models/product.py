@@ -1,5 +1,6 @@
 
 from beanie import Document
+from pymongo import ASCENDING, IndexModel
 from pydantic import Field, field_validator
 from datetime import datetime
 
@@ -14,6 +15,10 @@ class Product(Document):
     
     class Settings:
         name = "products"
+        indexes = [
+            IndexModel([("name", ASCENDING)]),
+            IndexModel([("updated_at", ASCENDING)]),
+        ]
     
     @field_validator('price')
     @classmethod
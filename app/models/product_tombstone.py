@@ -0,0 +1,20 @@
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+from datetime import datetime
+
+# Long enough for every catalog snapshot to poll past a deletion
+PRODUCT_TOMBSTONE_TTL_SECONDS = 86400
+
+
+class ProductTombstone(Document):
+    """Record of a deleted product, read by catalog snapshots in other processes."""
+    
+    product_id: PydanticObjectId
+    deleted_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Settings:
+        name = "product_tombstones"
+        indexes = [
+            IndexModel([("deleted_at", ASCENDING)], expireAfterSeconds=PRODUCT_TOMBSTONE_TTL_SECONDS),
+        ]
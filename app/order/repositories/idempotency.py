@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.slow_queries import trace_operations
+from app.models.idempotency_key import IdempotencyKey
+
+
+@trace_operations
+class IdempotencyKeyRepository:
+    """Repository for stored outcomes of idempotent requests."""
+    
+    async def reserve(self, key: str, request_hash: str, reserved_at: datetime) -> IdempotencyKey | None:
+        """Claim a key for a new attempt; return the existing record if it is already taken."""
+        while True:
+            try:
+                await IdempotencyKey(key=key, request_hash=request_hash, reserved_at=reserved_at).insert()
+                return None
+            except DuplicateKeyError:
+                existing = await self.get(key)
+                # The key may have been released or expired since the insert failed
+                if existing:
+                    return existing
+    
+    async def get(self, key: str) -> IdempotencyKey | None:
+        """Get the record of a key."""
+        return await IdempotencyKey.find_one(IdempotencyKey.key == key)
+    
+    async def complete(self, key: str, reserved_at: datetime, status_code: int, response: dict) -> bool:
+        """Store the outcome of the attempt holding a key's lease; False if the lease was lost."""
+        result = await IdempotencyKey.get_motor_collection().update_one(
+            {"key": key, "reserved_at": reserved_at, "status_code": None},
+            {"$set": {"status_code": status_code, "response": response, "created_at": datetime.utcnow()}}
+        )
+        return result.modified_count == 1
+    
+    async def take_over(self, key: str, reserved_before: datetime, reserved_at: datetime) -> bool:
+        """Move the lease of an unfinished key reserved before the given time to a new holder; False if it was not."""
+        result = await IdempotencyKey.get_motor_collection().update_one(
+            {
+                "key": key,
+                "status_code": None,
+                "$or": [
+                    {"reserved_at": {"$lt": reserved_before}},
+                    {"reserved_at": None, "created_at": {"$lt": reserved_before}},
+                ],
+            },
+            {"$set": {"reserved_at": reserved_at}}
+        )
+        return result.modified_count == 1
+    
+    async def release(self, key: str, reserved_at: datetime) -> bool:
+        """Drop an unfinished key so the request can be retried; False if the lease was lost."""
+        result = await IdempotencyKey.get_motor_collection().delete_one(
+            {"key": key, "reserved_at": reserved_at, "status_code": None}
+        )
+        return result.deleted_count == 1
@@ -1,15 +1,42 @@
 from datetime import datetime
-from beanie import PydanticObjectId
+from typing import AsyncIterator
+from beanie import PydanticObjectId, UpdateResponse
+from beanie.odm.operators.find.comparison import In
+from beanie.odm.operators.update.general import Set
+from beanie.odm.queries.find import FindMany
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
 
-from app.models.order import Order, OrderStatus
-from app.order.schemas.order import OrderCreate
+from app.core.pagination import SortSpec, seek_filter
+from app.core.slow_queries import trace_operations
+from app.models.order import Order, OrderStatus, OrderSummary, to_cents
+from app.order.repositories.rollup import OrderRollupRepository
+from app.order.schemas.order import OrderCreate, OrderFilter, OrderSort, OrderView
 
 
+@trace_operations
 class OrderRepository:
     """Order Repository."""
     
+    sorts: dict[OrderSort, SortSpec] = {
+        OrderSort.CREATED_AT: [("created_at", ASCENDING), ("_id", ASCENDING)],
+        OrderSort.CREATED_AT_DESC: [("created_at", DESCENDING), ("_id", DESCENDING)],
+        OrderSort.TOTAL_PRICE: [("total_price_cents", ASCENDING), ("_id", ASCENDING)],
+        OrderSort.TOTAL_PRICE_DESC: [("total_price_cents", DESCENDING), ("_id", DESCENDING)],
+    }
+    
+    def __init__(self, rollup_repository: OrderRollupRepository | None = None):
+        self.rollup_repository = rollup_repository or OrderRollupRepository()
+    
     async def create(self, order_data: OrderCreate, customer_name: str, customer_email: str, items_with_details: list[dict]) -> Order:
         """Create a new order."""
+        order = self.build(order_data, customer_name, customer_email, items_with_details)
+        order = await order.insert()
+        await self.rollup_repository.record_created([order])
+        return order
+    
+    def build(self, order_data: OrderCreate, customer_name: str, customer_email: str, items_with_details: list[dict]) -> Order:
+        """Build an order document without persisting it."""
         order_items = []
         for item_data in items_with_details:
             order_items.append({
@@ -19,13 +46,31 @@ class OrderRepository:
                 "unit_price": item_data["unit_price"]
             })
         
-        order = Order(
+        return Order(
             customer_id=order_data.customer_id,
             customer_name=customer_name,
             customer_email=customer_email,
             items=order_items
         )
-        return await order.insert()
+    
+    async def create_many(self, orders: list[Order]) -> dict[int, str]:
+        """Insert orders in a single unordered batch and return write errors by position."""
+        for order in orders:
+            order.id = PydanticObjectId()
+        
+        write_errors = {}
+        try:
+            await Order.insert_many(orders, ordered=False)
+        except BulkWriteError as exc:
+            write_errors = {
+                error["index"]: error.get("errmsg", "Write failed")
+                for error in exc.details.get("writeErrors", [])
+            }
+        
+        await self.rollup_repository.record_created([
+            order for position, order in enumerate(orders) if position not in write_errors
+        ])
+        return write_errors
     
     async def get_by_id(self, order_id: str) -> Order | None:
         """Get order by ID."""
@@ -34,36 +79,206 @@ class OrderRepository:
         except Exception:
             return None
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Order]:
+    async def get_updated_at(self, order_id: str) -> datetime | None:
+        """Get only the last modification time of a order."""
+        try:
+            object_id = PydanticObjectId(order_id)
+        except Exception:
+            return None
+        
+        document = await Order.get_motor_collection().find_one({"_id": object_id}, {"updated_at": 1})
+        return document.get("updated_at") if document else None
+    
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list | None = None,
+        sort: OrderSort = OrderSort.CREATED_AT,
+        filters: OrderFilter | None = None,
+        view: OrderView = OrderView.FULL
+    ) -> list[Order] | list[OrderSummary]:
         """Get all orders with pagination."""
-        return await Order.find_all().skip(skip).limit(limit).to_list()
+        query = Order.find(self._filter_query(filters))
+        return await self._paginate(query, skip, limit, after, sort, view).to_list()
     
-    async def get_by_customer_id(self, customer_id: str, skip: int = 0, limit: int = 100) -> list[Order]:
+    async def get_by_customer_id(
+        self,
+        customer_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        after: list | None = None,
+        sort: OrderSort = OrderSort.CREATED_AT,
+        filters: OrderFilter | None = None,
+        view: OrderView = OrderView.FULL
+    ) -> list[Order] | list[OrderSummary]:
         """Get orders by customer ID."""
-        return await Order.find(Order.customer_id == customer_id).skip(skip).limit(limit).to_list()
+        query = Order.find(Order.customer_id == customer_id, self._filter_query(filters))
+        return await self._paginate(query, skip, limit, after, sort, view).to_list()
     
-    async def get_by_status(self, status: OrderStatus, skip: int = 0, limit: int = 100) -> list[Order]:
+    async def get_by_status(
+        self,
+        status: OrderStatus,
+        skip: int = 0,
+        limit: int = 100,
+        after: list | None = None,
+        sort: OrderSort = OrderSort.CREATED_AT,
+        filters: OrderFilter | None = None,
+        view: OrderView = OrderView.FULL
+    ) -> list[Order] | list[OrderSummary]:
         """Get orders by status."""
-        return await Order.find(Order.status == status).skip(skip).limit(limit).to_list()
+        query = Order.find(Order.status == status, self._filter_query(filters))
+        return await self._paginate(query, skip, limit, after, sort, view).to_list()
+    
+    async def get_documents(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list | None = None,
+        sort: OrderSort = OrderSort.CREATED_AT,
+        filters: OrderFilter | None = None,
+        projection: dict | None = None
+    ) -> list[dict]:
+        """Get a page of raw order documents without hydrating Beanie models."""
+        sort_spec = self.sorts[sort]
+        query = self._filter_query(filters)
+        if after is not None:
+            seek = seek_filter(sort_spec, after)
+            query = {"$and": [query, seek]} if query else seek
+        
+        cursor = Order.get_motor_collection().find(query, projection).sort(sort_spec).limit(limit)
+        if after is None:
+            cursor = cursor.skip(skip)
+        return await cursor.to_list(length=limit)
+    
+    async def iter_documents(
+        self,
+        filters: OrderFilter | None = None,
+        batch_size: int = 1000,
+        projection: dict | None = None
+    ) -> AsyncIterator[dict]:
+        """Stream raw order documents without hydrating Beanie models."""
+        cursor = Order.get_motor_collection().find(self._filter_query(filters), projection, batch_size=batch_size)
+        async for document in cursor:
+            yield document
+
+    async def watch_changes(self, resume_after: dict | None = None) -> AsyncIterator[dict]:
+        """Stream inserts and status updates from the orders change stream (replica sets only)."""
+        pipeline = [
+            {"$match": {"$or": [
+                {"operationType": "insert"},
+                {"operationType": "update", "updateDescription.updatedFields.status": {"$exists": True}},
+            ]}},
+            {"$project": {
+                "operationType": 1,
+                "documentKey": 1,
+                "clusterTime": 1,
+                "fullDocument.customer_id": 1,
+                "fullDocument.status": 1,
+            }},
+        ]
+        async with Order.get_motor_collection().watch(
+            pipeline, full_document="updateLookup", resume_after=resume_after
+        ) as stream:
+            async for change in stream:
+                yield change
+
+    def _filter_query(self, filters: OrderFilter | None) -> dict:
+        """Translate listing filters into a Mongo query."""
+        query = {}
+        if filters is None:
+            return query
+        
+        if filters.customer_id is not None:
+            query["customer_id"] = filters.customer_id
+        if filters.status is not None:
+            query["status"] = filters.status.value
+        
+        created_range = {}
+        if filters.created_from is not None:
+            created_range["$gte"] = filters.created_from
+        if filters.created_to is not None:
+            created_range["$lt"] = filters.created_to
+        if created_range:
+            query["created_at"] = created_range
+        
+        total_range = {}
+        if filters.min_total is not None:
+            total_range["$gte"] = to_cents(filters.min_total)
+        if filters.max_total is not None:
+            total_range["$lte"] = to_cents(filters.max_total)
+        if total_range:
+            query["total_price_cents"] = total_range
+        return query
+    
+    def _paginate(
+        self,
+        query: FindMany[Order],
+        skip: int,
+        limit: int,
+        after: list | None,
+        sort: OrderSort,
+        view: OrderView
+    ) -> FindMany[Order] | FindMany[OrderSummary]:
+        """Apply keyset pagination when a cursor position is given, skip/limit otherwise."""
+        sort_spec = self.sorts[sort]
+        if after is not None:
+            query = query.find(seek_filter(sort_spec, after))
+        else:
+            query = query.skip(skip)
+        query = query.sort(sort_spec).limit(limit)
+        
+        if view == OrderView.SUMMARY:
+            # Leave the embedded items on the server; only their count is returned
+            return query.project(OrderSummary)
+        return query
     
     async def update_status(self, order_id: str, new_status: OrderStatus) -> Order | None:
-        """Update order status."""
-        order = await self.get_by_id(order_id)
-        if not order:
+        """Atomically update order status if the transition is allowed."""
+        try:
+            object_id = PydanticObjectId(order_id)
+        except Exception:
             return None
         
-        if not order.can_transition_to(new_status):
-            raise ValueError(f"Cannot transition from {order.status} to {new_status}")
+        updated_at = datetime.utcnow()
+        order = await Order.find_one(
+            Order.id == object_id,
+            In(Order.status, Order.allowed_from(new_status))
+        ).update(
+            Set({Order.status: new_status, Order.updated_at: updated_at}),
+            response_type=UpdateResponse.OLD_DOCUMENT
+        )
+        if order:
+            # The pre-image carries the status the rollups must move the order out of
+            previous_status = order.status
+            order.status = new_status
+            order.updated_at = updated_at
+            await self.rollup_repository.record_status_change(order, previous_status)
+            return order
         
-        order.status = new_status
-        order.updated_at = datetime.utcnow()
-        return await order.save()
+        # Only the failure path pays for a read to tell "missing" from "not allowed"
+        current = await self.get_by_id(order_id)
+        if not current:
+            return None
+        raise ValueError(f"Cannot transition from {current.status} to {new_status}")
     
     async def delete(self, order_id: str) -> bool:
         """Delete order."""
-        order = await self.get_by_id(order_id)
-        if not order:
+        try:
+            object_id = PydanticObjectId(order_id)
+        except Exception:
             return False
         
-        await order.delete()
+        document = await Order.get_motor_collection().find_one_and_delete(
+            {"_id": object_id},
+            projection={"created_at": 1, "status": 1, "total_price_cents": 1}
+        )
+        if not document:
+            return False
+        
+        await self.rollup_repository.record_deleted(
+            document["created_at"],
+            OrderStatus(document["status"]),
+            document.get("total_price_cents", 0)
+        )
         return True
@@ -0,0 +1,164 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from app.core.slow_queries import trace_operations
+from app.models.order import Order, OrderStatus
+from app.models.order_rollup import OrderRollup
+from app.order.schemas.order import OrderStatsGranularity
+
+logger = logging.getLogger(__name__)
+
+
+# Written by rebuild, or at startup on a database without orders; until it exists
+# the rollups may be missing orders written before they were maintained
+BUILT_MARKER_ID = "rollups_built"
+
+
+class RollupsNotBuiltError(ValueError):
+    """Raised when rollups were not rebuilt after orders existed without them."""
+
+
+def rollup_day(moment: datetime) -> datetime:
+    """Truncate a timestamp to the start of its UTC day."""
+    return datetime(moment.year, moment.month, moment.day)
+
+
+def period_start(day: datetime, granularity: OrderStatsGranularity) -> datetime:
+    """Get the start of the week or month containing a rollup day."""
+    if granularity == OrderStatsGranularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == OrderStatsGranularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+@trace_operations
+class OrderRollupRepository:
+    """Repository for incrementally maintained daily order rollups."""
+    
+    async def record_created(self, orders: list[Order]) -> None:
+        """Add newly created orders to their day and status buckets."""
+        increments = defaultdict(lambda: [0, 0])
+        for order in orders:
+            bucket = increments[(rollup_day(order.created_at), order.status)]
+            bucket[0] += 1
+            bucket[1] += order.total_price_cents
+        
+        await self._apply([
+            (day, order_status, count, revenue)
+            for (day, order_status), (count, revenue) in increments.items()
+        ])
+    
+    async def record_status_change(self, order: Order, previous_status: OrderStatus) -> None:
+        """Move an order from its previous status bucket to its current one."""
+        day = rollup_day(order.created_at)
+        await self._apply([
+            (day, previous_status, -1, -order.total_price_cents),
+            (day, order.status, 1, order.total_price_cents),
+        ])
+    
+    async def record_deleted(self, created_at: datetime, order_status: OrderStatus, total_price_cents: int) -> None:
+        """Remove a deleted order from its bucket."""
+        await self._apply([
+            (rollup_day(created_at), order_status, -1, -total_price_cents),
+        ])
+    
+    async def _apply(self, increments: list[tuple[datetime, OrderStatus, int, int]]) -> None:
+        """Apply bucket increments with upserts in a single bulk write."""
+        if not increments:
+            return
+        
+        operations = [
+            UpdateOne(
+                {"day": day, "status": order_status.value},
+                {"$inc": {"order_count": count, "revenue_cents": revenue}},
+                upsert=True
+            )
+            for day, order_status, count, revenue in increments
+        ]
+        try:
+            await OrderRollup.get_motor_collection().bulk_write(operations, ordered=False)
+        except PyMongoError:
+            # Rollups are derived data; a failed increment is repaired by a rebuild
+            logger.exception("Failed to update order rollups")
+    
+    async def get_stats(
+        self,
+        start: datetime | None,
+        end: datetime | None,
+        granularity: OrderStatsGranularity
+    ) -> list[dict]:
+        """Fold daily rollups into buckets of the requested granularity."""
+        if not await self.is_built():
+            raise RollupsNotBuiltError("Order rollups must be rebuilt: make migrate")
+        
+        day_range = {}
+        if start is not None:
+            day_range["$gte"] = rollup_day(start)
+        if end is not None:
+            day_range["$lt"] = end
+        query = {"day": day_range} if day_range else {"_id": {"$ne": BUILT_MARKER_ID}}
+        
+        buckets = defaultdict(lambda: {"order_count": 0, "revenue_cents": 0})
+        async for rollup in OrderRollup.get_motor_collection().find(query):
+            # Orders that predate the rollups were never counted, so moving or
+            # deleting them drives their bucket below zero until a rebuild
+            if rollup["order_count"] < 0 or rollup["revenue_cents"] < 0:
+                raise RollupsNotBuiltError("Order rollups must be rebuilt: make migrate")
+            key = (period_start(rollup["day"], granularity), rollup["status"])
+            buckets[key]["order_count"] += rollup["order_count"]
+            buckets[key]["revenue_cents"] += rollup["revenue_cents"]
+        
+        return [
+            {"period_start": period, "status": order_status, **totals}
+            for (period, order_status), totals in sorted(buckets.items())
+            if totals["order_count"]
+        ]
+    
+    async def rebuild(self) -> None:
+        """Recompute all rollups from the orders collection."""
+        pipeline = [
+            {"$group": {
+                "_id": {
+                    "day": {"$dateTrunc": {"date": "$created_at", "unit": "day"}},
+                    "status": "$status",
+                },
+                "order_count": {"$sum": 1},
+                "revenue_cents": {"$sum": "$total_price_cents"},
+            }},
+            {"$project": {
+                "_id": 0,
+                "day": "$_id.day",
+                "status": "$_id.status",
+                "order_count": 1,
+                "revenue_cents": 1,
+            }},
+            {"$out": OrderRollup.get_collection_name()},
+        ]
+        await Order.get_motor_collection().aggregate(pipeline).to_list(None)
+        await self.mark_built()
+    
+    async def is_built(self) -> bool:
+        """Whether the rollups account for every order."""
+        marker = await OrderRollup.get_motor_collection().find_one({"_id": BUILT_MARKER_ID}, {"_id": 1})
+        return marker is not None
+    
+    async def mark_built(self) -> None:
+        await OrderRollup.get_motor_collection().update_one(
+            {"_id": BUILT_MARKER_ID}, {"$set": {"built_at": datetime.utcnow()}}, upsert=True
+        )
+    
+    async def check_built(self) -> str:
+        """Mark the rollups built on a database without orders, where none can be missing."""
+        if await self.is_built():
+            return "built"
+        if await Order.get_motor_collection().find_one({}, {"_id": 1}) is None:
+            await self.mark_built()
+            return "built, no orders yet"
+        # Stats answer 503 until the migration runs; the instance still serves everything else
+        logger.warning("Order rollups are not built; run make migrate")
+        return "not built, run make migrate"
@@ -1,62 +1,216 @@
-from fastapi import APIRouter, Depends, Query
+import asyncio
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, Header, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 
 from app.container.dependencies import get_order_service
+from app.core.conditional import (
+    ConditionalRequest, get_conditional_request, not_modified_response, validator_headers
+)
+from app.core.config import settings
+from app.core.idempotency import IDEMPOTENCY_KEY_HEADER
+from app.core.pagination import Page, page_headers
+from app.core.responses import encoded_page_response, model_list_response, model_response
 from app.order.services.service import OrderService
-from app.order.schemas.order import OrderCreate, OrderResponse, OrderStatusUpdate
+from app.order.schemas.order import (
+    OrderCreate, OrderResponse, OrderStatusUpdate, OrderBulkCreate, OrderBulkResponse,
+    OrderFilter, OrderSort, OrderView, OrderSummaryResponse, OrderStatsGranularity, OrderStatsResponse
+)
 from app.models.order import OrderStatus
 
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
+def get_order_filters(
+    min_total: float | None = Query(None, ge=0, description="Minimum order total"),
+    max_total: float | None = Query(None, ge=0, description="Maximum order total"),
+    created_from: datetime | None = Query(None, description="Only orders created at or after this time"),
+    created_to: datetime | None = Query(None, description="Only orders created before this time"),
+) -> OrderFilter:
+    """Collect order listing filters from query parameters."""
+    return OrderFilter(
+        min_total=min_total,
+        max_total=max_total,
+        created_from=created_from,
+        created_to=created_to
+    )
+
+
+def order_page_response(page: Page, view: OrderView) -> Response:
+    """Encode a page of orders in the requested view."""
+    model = OrderSummaryResponse if view == OrderView.SUMMARY else OrderResponse
+    return model_list_response(page.items, model, headers=page_headers(page))
+
+
 @router.post("/", response_model=OrderResponse, status_code=201)
 async def create_order(
     order_data: OrderCreate,
+    idempotency_key: str | None = Header(
+        None,
+        alias=IDEMPOTENCY_KEY_HEADER,
+        max_length=255,
+        description="Client-chosen key; retries with the same key return the original response"
+    ),
     order_service: OrderService = Depends(get_order_service)
 ):
     """Create a new order."""
-    return await order_service.create_order(order_data)
+    return model_response(await order_service.create_order(order_data, idempotency_key), status_code=201)
+
+
+@router.post(
+    "/bulk",
+    response_model=OrderBulkResponse,
+    status_code=201,
+    responses={207: {"model": OrderBulkResponse, "description": "Orders with different outcomes"}}
+)
+async def create_orders_bulk(
+    bulk_data: OrderBulkCreate,
+    order_service: OrderService = Depends(get_order_service)
+):
+    """Create orders in bulk, reporting the outcome of each order."""
+    result = await order_service.create_orders_bulk(bulk_data)
+    return model_response(result, status_code=result.overall_status_code)
+
+
+@router.get("/stats", response_model=OrderStatsResponse)
+async def get_order_stats(
+    from_date: date | None = Query(None, alias="from", description="First day to include"),
+    to_date: date | None = Query(None, alias="to", description="Last day to include"),
+    granularity: OrderStatsGranularity = Query(OrderStatsGranularity.DAY, description="Bucket size"),
+    order_service: OrderService = Depends(get_order_service)
+):
+    """Get order counts and revenue grouped by period and status."""
+    return await order_service.get_order_stats(from_date, to_date, granularity)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_orders(
+    status: OrderStatus | None = Query(None, description="Only orders with this status"),
+    customer_id: str | None = Query(None, description="Only orders of this customer"),
+    filters: OrderFilter = Depends(get_order_filters),
+    order_service: OrderService = Depends(get_order_service)
+):
+    """Stream orders as newline-delimited JSON."""
+    filters = filters.model_copy(update={"status": status, "customer_id": customer_id})
+    return StreamingResponse(
+        order_service.export_orders(filters),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_order_events(
+    status: OrderStatus | None = Query(None, description="Only events of orders with this status"),
+    customer_id: str | None = Query(None, description="Only events of orders of this customer"),
+    order_service: OrderService = Depends(get_order_service)
+):
+    """Stream order created and status changed events as Server-Sent Events."""
+    return StreamingResponse(
+        order_service.stream_events(status, customer_id, settings.order_events_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/events/ws")
+async def order_events_websocket(
+    websocket: WebSocket,
+    status: OrderStatus | None = Query(None),
+    customer_id: str | None = Query(None),
+    order_service: OrderService = Depends(get_order_service)
+):
+    """Push order created and status changed events over a WebSocket."""
+    await websocket.accept()
+    with order_service.subscribe_events(status, customer_id) as subscription:
+        async def push():
+            while True:
+                event = await subscription.get()
+                await websocket.send_text(event.model_dump_json())
+        
+        push_task = asyncio.create_task(push())
+        try:
+            # Reading is the only way to notice the client going away while no events arrive
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            push_task.cancel()
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: str,
+    conditional: ConditionalRequest = Depends(get_conditional_request),
     order_service: OrderService = Depends(get_order_service)
 ):
-    """Get order by ID."""
-    return await order_service.get_order_by_id(order_id)
+    """Get order by ID, answering revalidation requests with 304 Not Modified."""
+    if conditional.present:
+        updated_at = await order_service.get_order_updated_at(order_id)
+        if updated_at and conditional.not_modified(order_id, updated_at):
+            return not_modified_response(order_id, updated_at)
+    
+    order = await order_service.get_order_by_id(order_id)
+    return model_response(order, headers=validator_headers(order.id, order.updated_at))
 
 
-@router.get("/", response_model=list[OrderResponse])
+@router.get("/", response_model=list[OrderResponse] | list[OrderSummaryResponse])
 async def list_orders(
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of orders to return"),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; takes precedence over skip"),
+    sort: OrderSort = Query(OrderSort.CREATED_AT, description="Sort order"),
+    filters: OrderFilter = Depends(get_order_filters),
+    view: OrderView = Query(OrderView.FULL, description="'summary' omits items and returns an item count"),
     order_service: OrderService = Depends(get_order_service)
 ):
     """List all orders with pagination."""
-    return await order_service.get_all_orders(skip, limit)
+    if view == OrderView.FULL and "orders.list" in settings.raw_read_routes:
+        return encoded_page_response(await order_service.get_orders_encoded(skip, limit, cursor, sort, filters))
+    page = await order_service.get_all_orders(skip, limit, cursor, sort, filters, view)
+    return order_page_response(page, view)
 
 
-@router.get("/customer/{customer_id}", response_model=list[OrderResponse])
+@router.get("/customer/{customer_id}", response_model=list[OrderResponse] | list[OrderSummaryResponse])
 async def list_orders_by_customer(
     customer_id: str,
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of orders to return"),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; takes precedence over skip"),
+    sort: OrderSort = Query(OrderSort.CREATED_AT, description="Sort order"),
+    filters: OrderFilter = Depends(get_order_filters),
+    view: OrderView = Query(OrderView.FULL, description="'summary' omits items and returns an item count"),
     order_service: OrderService = Depends(get_order_service)
 ):
     """List orders by customer ID."""
-    return await order_service.get_orders_by_customer_id(customer_id, skip, limit)
+    if view == OrderView.FULL and "orders.by_customer" in settings.raw_read_routes:
+        return encoded_page_response(
+            await order_service.get_orders_encoded(skip, limit, cursor, sort, filters, customer_id=customer_id)
+        )
+    page = await order_service.get_orders_by_customer_id(customer_id, skip, limit, cursor, sort, filters, view)
+    return order_page_response(page, view)
 
 
-@router.get("/status/{status}", response_model=list[OrderResponse])
+@router.get("/status/{status}", response_model=list[OrderResponse] | list[OrderSummaryResponse])
 async def list_orders_by_status(
     status: OrderStatus,
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of orders to return"),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; takes precedence over skip"),
+    sort: OrderSort = Query(OrderSort.CREATED_AT, description="Sort order"),
+    filters: OrderFilter = Depends(get_order_filters),
+    view: OrderView = Query(OrderView.FULL, description="'summary' omits items and returns an item count"),
     order_service: OrderService = Depends(get_order_service)
 ):
     """List orders by status."""
-    return await order_service.get_orders_by_status(status, skip, limit)
+    if view == OrderView.FULL and "orders.by_status" in settings.raw_read_routes:
+        return encoded_page_response(
+            await order_service.get_orders_encoded(skip, limit, cursor, sort, filters, order_status=status)
+        )
+    page = await order_service.get_orders_by_status(status, skip, limit, cursor, sort, filters, view)
+    return order_page_response(page, view)
 
 
 @router.patch("/{order_id}/status", response_model=OrderResponse)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
+from enum import Enum
 
 from app.models.order import OrderStatus
 
@@ -43,6 +44,30 @@ class OrderUpdate(BaseModel):
     status: OrderStatus | None = None
 
 
+class OrderSort(str, Enum):
+    """Sort orders for order listings."""
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    TOTAL_PRICE = "total_price"
+    TOTAL_PRICE_DESC = "-total_price"
+
+
+class OrderView(str, Enum):
+    """Level of detail for order listings."""
+    FULL = "full"
+    SUMMARY = "summary"
+
+
+class OrderFilter(BaseModel):
+    """Filters for order listings."""
+    customer_id: str | None = None
+    status: OrderStatus | None = None
+    min_total: float | None = Field(None, ge=0)
+    max_total: float | None = Field(None, ge=0)
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
 class OrderResponse(BaseModel):
     """Schema for order response."""
     id: str
@@ -59,6 +84,93 @@ class OrderResponse(BaseModel):
         from_attributes = True
 
 
+class OrderSummaryResponse(BaseModel):
+    """Schema for order summary response."""
+    id: str
+    customer_id: str
+    customer_name: str
+    status: OrderStatus
+    item_count: int
+    total_price: float
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class OrderBulkCreate(BaseModel):
+    """Schema for creating orders in bulk."""
+    orders: list[OrderCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class OrderBulkItemResult(BaseModel):
+    """Schema for the outcome of a single order in a bulk request."""
+    index: int
+    status_code: int
+    order: OrderResponse | None = None
+    error: str | None = None
+
+
+class OrderBulkResponse(BaseModel):
+    """Schema for bulk order creation response."""
+    created: int
+    failed: int
+    results: list[OrderBulkItemResult]
+    
+    @property
+    def overall_status_code(self) -> int:
+        """The status every order shares, such as 201 when all were created, or 207 for mixed outcomes."""
+        status_codes = {result.status_code for result in self.results}
+        return status_codes.pop() if len(status_codes) == 1 else 207
+
+
+class OrderStatsGranularity(str, Enum):
+    """Bucket size for order statistics."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class OrderStatsBucket(BaseModel):
+    """Schema for order count and revenue of one period and status."""
+    period_start: datetime
+    status: OrderStatus
+    order_count: int
+    revenue_cents: int
+    revenue: float
+
+
+class OrderStatsResponse(BaseModel):
+    """Schema for order statistics response."""
+    granularity: OrderStatsGranularity
+    buckets: list[OrderStatsBucket]
+
+
+class OrderEventType(str, Enum):
+    """Kinds of order events."""
+    CREATED = "created"
+    STATUS_CHANGED = "status_changed"
+
+
+class OrderEventSource(str, Enum):
+    """Where order events are taken from."""
+    LOCAL = "local"
+    CHANGE_STREAM = "change_stream"
+
+
+class OrderEvent(BaseModel):
+    """Schema for an order event pushed to subscribers."""
+    type: OrderEventType
+    order_id: str
+    customer_id: str
+    status: OrderStatus
+    occurred_at: datetime
+    
+    def matches(self, status: OrderStatus | None = None, customer_id: str | None = None) -> bool:
+        """Check the event against optional status and customer filters."""
+        return (status is None or self.status == status) and (customer_id is None or self.customer_id == customer_id)
+
+
 class OrderStatusUpdate(BaseModel):
     """Schema for updating order status."""
     status: OrderStatus
@@ -1,17 +1,17 @@
-from app.core.serializers.base import BaseSerializer
-from app.models.order import Order, OrderItem
+from app.core.serializers.base import BaseSerializer, DocumentSerializer, TrustedSerializer
+from app.models.order import Order, OrderItem, OrderSummary
 from app.order.schemas.order import (
     OrderCreate, OrderUpdate, OrderResponse, 
-    OrderItemResponse, OrderStatusUpdate
+    OrderItemResponse, OrderStatusUpdate, OrderSummaryResponse
 )
 
 
-class OrderItemSerializer(BaseSerializer[OrderItem, OrderItemResponse]):
+class OrderItemSerializer(TrustedSerializer[OrderItem, OrderItemResponse]):
     """Serializer for OrderItem domain model."""
     
-    async def serialize(self, item: OrderItem) -> OrderItemResponse:
-        """Serialize OrderItem to OrderItemResponse."""
-        return OrderItemResponse(
+    def build(self, item: OrderItem) -> OrderItemResponse:
+        """Build OrderItemResponse from OrderItem."""
+        return OrderItemResponse.model_construct(
             product_id=item.product_id,
             product_name=item.product_name,
             quantity=item.quantity,
@@ -20,33 +20,88 @@ class OrderItemSerializer(BaseSerializer[OrderItem, OrderItemResponse]):
         )
 
 
-class OrderSerializer(BaseSerializer[Order, OrderResponse]):
+class OrderSerializer(DocumentSerializer[Order, OrderResponse]):
     """Serializer for Order domain model."""
     
+    # Sort keys stay in the projection so the next page cursor can be built
+    document_projection = {
+        "customer_id": 1,
+        "customer_name": 1,
+        "customer_email": 1,
+        "items.product_id": 1,
+        "items.product_name": 1,
+        "items.quantity": 1,
+        "items.unit_price": 1,
+        "items.total_price": 1,
+        "status": 1,
+        "total_price": 1,
+        "total_price_cents": 1,
+        "created_at": 1,
+        "updated_at": 1,
+    }
+    
     def __init__(self):
         self.item_serializer = OrderItemSerializer()
     
-    async def serialize(self, order: Order) -> OrderResponse:
-        """Serialize Order to OrderResponse."""
-        # Serialize order items
-        items = [await self.item_serializer.serialize(item) for item in order.items]
-        
-        return OrderResponse(
+    def build(self, order: Order) -> OrderResponse:
+        """Build OrderResponse from Order."""
+        return OrderResponse.model_construct(
             id=str(order.id),
             customer_id=order.customer_id,
             customer_name=order.customer_name,
             customer_email=order.customer_email,
-            items=items,
+            items=self.item_serializer.build_list(order.items),
             status=order.status,
             total_price=order.total_price,
             created_at=order.created_at,
             updated_at=order.updated_at
         )
 
+    def response_fields(self, document: dict) -> dict:
+        """Map a raw Mongo order document to OrderResponse fields."""
+        items = [
+            {
+                "product_id": item["product_id"],
+                "product_name": item["product_name"],
+                "quantity": item["quantity"],
+                "unit_price": float(item["unit_price"]),
+                "total_price": float(item.get("total_price", item["quantity"] * item["unit_price"]))
+            }
+            for item in document["items"]
+        ]
+        
+        return {
+            "id": str(document["_id"]),
+            "customer_id": document["customer_id"],
+            "customer_name": document["customer_name"],
+            "customer_email": document["customer_email"],
+            "items": items,
+            "status": document["status"],
+            "total_price": float(document.get("total_price", sum(item["total_price"] for item in items))),
+            "created_at": document["created_at"],
+            "updated_at": document.get("updated_at")
+        }
     
     async def serialize_for_list(self, orders: list[Order]) -> list[OrderResponse]:
         """Serialize list of orders."""
-        return [await self.serialize(order) for order in orders]
+        return self.build_list(orders)
+    
+    def build_summary(self, summary: OrderSummary) -> OrderSummaryResponse:
+        """Build OrderSummaryResponse from the OrderSummary projection."""
+        return OrderSummaryResponse.model_construct(
+            id=str(summary.id),
+            customer_id=summary.customer_id,
+            customer_name=summary.customer_name,
+            status=summary.status,
+            item_count=summary.item_count,
+            total_price=summary.total_price,
+            created_at=summary.created_at
+        )
+    
+    def build_summary_list(self, summaries: list[OrderSummary]) -> list[OrderSummaryResponse]:
+        """Build responses for a batch of order summaries."""
+        build_summary = self.build_summary
+        return [build_summary(summary) for summary in summaries]
 
 
 class OrderCreateSerializer(BaseSerializer[OrderCreate, OrderResponse]):
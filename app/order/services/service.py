@@ -1,16 +1,40 @@
 
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator
+
 from fastapi import HTTPException, status
+from pymongo.errors import OperationFailure, PyMongoError
 
-from app.models.order import OrderStatus
+from app.core.broker import EventBroker, Subscription
+from app.core.concurrency import gather
+from app.core.idempotency import (
+    IdempotencyStore, IdempotencyKeyInProgressError, IdempotencyKeyReusedError,
+    StoredResponse, request_fingerprint
+)
+from app.core.pagination import EncodedPage, Page, decode_cursor_param, next_page_cursor
+from app.models.customer import Customer
+from app.models.order import Order, OrderStatus, OrderSummary
 from app.order.repositories.repository import OrderRepository
+from app.order.repositories.rollup import OrderRollupRepository, RollupsNotBuiltError
 from app.customer.repositories.repository import CustomerRepository
-from app.order.schemas.order import OrderCreate
+from app.order.schemas.order import (
+    OrderCreate, OrderBulkCreate, OrderBulkItemResult, OrderBulkResponse,
+    OrderFilter, OrderSort, OrderView, OrderSummaryResponse, OrderStatsBucket, OrderStatsGranularity, OrderStatsResponse,
+    OrderEvent, OrderEventSource, OrderEventType
+)
 from app.product.repositories.repository import ProductRepository
 from app.order.serializers.serializer import (
     OrderSerializer, OrderCreateSerializer, OrderUpdateSerializer, OrderResponse,
     OrderStatusUpdate
 )
 
+logger = logging.getLogger(__name__)
+
+# Error code Mongo returns when change streams are used on a standalone server
+CHANGE_STREAM_UNSUPPORTED = 40573
+
 
 class OrderService:
     """Order Service."""
@@ -23,6 +47,11 @@ class OrderService:
         update_serializer: OrderUpdateSerializer,
         customer_repository: CustomerRepository,
         product_repository: ProductRepository,
+        rollup_repository: OrderRollupRepository,
+        event_broker: EventBroker[OrderEvent],
+        idempotency_store: IdempotencyStore,
+        event_source: OrderEventSource = OrderEventSource.LOCAL,
+        export_batch_size: int = 1000,
     ):
         self.repository = repository
         self.serializer = serializer
@@ -30,33 +59,162 @@ class OrderService:
         self.update_serializer = update_serializer
         self.customer_repository = customer_repository
         self.product_repository = product_repository
+        self.rollup_repository = rollup_repository
+        self.event_broker = event_broker
+        self.idempotency_store = idempotency_store
+        self.event_source = event_source
+        self.export_batch_size = export_batch_size
     
-    async def create_order(self, order_data: OrderCreate) -> OrderResponse:
-        """Create a new order with business validation."""
-        # Validate that customer exists
-        customer = await self.customer_repository.get_by_id(order_data.customer_id)
-        if not customer:
+    async def create_order(self, order_data: OrderCreate, idempotency_key: str | None = None) -> OrderResponse:
+        """Create a new order, replaying the stored outcome for a repeated idempotency key."""
+        if idempotency_key is None:
+            return await self._create_order(order_data)
+        
+        try:
+            stored = await self.idempotency_store.run(
+                idempotency_key,
+                request_fingerprint(order_data),
+                lambda: self._create_order_response(order_data)
+            )
+        except IdempotencyKeyReusedError as exc:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Customer not found"
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(exc)
+            )
+        except IdempotencyKeyInProgressError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(exc)
             )
         
-        # Validate that products exist and get their details
+        if stored.status_code >= 400:
+            raise HTTPException(status_code=stored.status_code, detail=stored.body["detail"])
+        return OrderResponse.model_validate(stored.body)
+    
+    async def _create_order_response(self, order_data: OrderCreate) -> StoredResponse:
+        """Create an order and capture the outcome to store for replays."""
+        try:
+            order = await self._create_order(order_data)
+        except HTTPException as exc:
+            if exc.status_code >= 500:
+                raise
+            return StoredResponse(status_code=exc.status_code, body={"detail": exc.detail})
+        return StoredResponse(status_code=status.HTTP_201_CREATED, body=order.model_dump(mode="json"))
+    
+    async def _create_order(self, order_data: OrderCreate) -> OrderResponse:
+        """Create a new order with business validation."""
+        # Validate that customer and products exist; a missing customer cancels the product read
         product_ids = [item.product_id for item in order_data.items]
-        products = await self.product_repository.get_by_ids(product_ids)
+        customer, products = await gather(
+            self._get_customer(order_data.customer_id),
+            self.product_repository.get_by_ids(product_ids)
+        )
+        
+        # Create product lookup dictionary for product details
+        product_lookup = {str(p.id): p for p in products}
         
-        if len(products) != len(product_ids):
-            found_ids = {str(p.id) for p in products}
-            missing_ids = [pid for pid in product_ids if pid not in found_ids]
+        missing_ids = self._missing_product_ids(order_data, product_lookup)
+        if missing_ids:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Products not found: {missing_ids}"
             )
         
-        # Create product lookup dictionary for product details
+        order = await self.repository.create(
+            order_data, 
+            customer.name, 
+            customer.email, 
+            self._items_with_details(order_data, product_lookup)
+        )
+        self._publish(OrderEventType.CREATED, order)
+        
+        return await self.serializer.serialize(order)
+    
+    async def create_orders_bulk(self, bulk_data: OrderBulkCreate) -> OrderBulkResponse:
+        """Create many orders with batched lookups and a single insert."""
+        customer_ids = list({order_data.customer_id for order_data in bulk_data.orders})
+        product_ids = list({
+            item.product_id for order_data in bulk_data.orders for item in order_data.items
+        })
+        
+        customers, products = await gather(
+            self.customer_repository.get_by_ids(customer_ids),
+            self.product_repository.get_by_ids(product_ids)
+        )
+        customer_lookup = {str(c.id): c for c in customers}
         product_lookup = {str(p.id): p for p in products}
         
-        # Prepare items with product details
+        results: list[OrderBulkItemResult | None] = [None] * len(bulk_data.orders)
+        pending: list[tuple[int, Order]] = []
+        for index, order_data in enumerate(bulk_data.orders):
+            customer = customer_lookup.get(order_data.customer_id)
+            if not customer:
+                results[index] = OrderBulkItemResult(
+                    index=index,
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    error="Customer not found"
+                )
+                continue
+            
+            missing_ids = self._missing_product_ids(order_data, product_lookup)
+            if missing_ids:
+                results[index] = OrderBulkItemResult(
+                    index=index,
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    error=f"Products not found: {missing_ids}"
+                )
+                continue
+            
+            order = self.repository.build(
+                order_data,
+                customer.name,
+                customer.email,
+                self._items_with_details(order_data, product_lookup)
+            )
+            pending.append((index, order))
+        
+        write_errors = await self.repository.create_many([order for _, order in pending]) if pending else {}
+        
+        for position, (index, order) in enumerate(pending):
+            if position in write_errors:
+                results[index] = OrderBulkItemResult(
+                    index=index,
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    error=write_errors[position]
+                )
+            else:
+                self._publish(OrderEventType.CREATED, order)
+                results[index] = OrderBulkItemResult(
+                    index=index,
+                    status_code=status.HTTP_201_CREATED,
+                    order=self.serializer.build(order)
+                )
+        
+        created = len(pending) - len(write_errors)
+        return OrderBulkResponse(
+            created=created,
+            failed=len(results) - created,
+            results=results
+        )
+    
+    async def _get_customer(self, customer_id: str) -> Customer:
+        """Get the customer of an order, raising 404 when it does not exist."""
+        customer = await self.customer_repository.get_by_id(customer_id)
+        if not customer:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Customer not found"
+            )
+        return customer
+    
+    @staticmethod
+    def _missing_product_ids(order_data: OrderCreate, product_lookup: dict) -> list[str]:
+        """Return product IDs of the order that were not found."""
+        return [item.product_id for item in order_data.items if item.product_id not in product_lookup]
+    
+    @staticmethod
+    def _items_with_details(order_data: OrderCreate, product_lookup: dict) -> list[dict]:
+        """Prepare order items with product details."""
         items_with_details = []
         for item in order_data.items:
             product = product_lookup[item.product_id]
@@ -66,15 +224,7 @@ class OrderService:
                 "quantity": item.quantity,
                 "unit_price": product.price
             })
-        
-        order = await self.repository.create(
-            order_data, 
-            customer.name, 
-            customer.email, 
-            items_with_details
-        )
-        
-        return await self.serializer.serialize(order)
+        return items_with_details
     
     async def get_order_by_id(self, order_id: str) -> OrderResponse:
         """Get order by ID."""
@@ -86,61 +236,241 @@ class OrderService:
             )
         return await self.serializer.serialize(order)
     
-    async def get_all_orders(self, skip: int = 0, limit: int = 100) -> list[OrderResponse]:
+    async def get_order_updated_at(self, order_id: str) -> datetime | None:
+        """Get the last modification time of a order, None if it does not exist."""
+        return await self.repository.get_updated_at(order_id)
+    
+    async def get_all_orders(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        sort: OrderSort = OrderSort.CREATED_AT,
+        filters: OrderFilter | None = None,
+        view: OrderView = OrderView.FULL
+    ) -> Page[OrderResponse] | Page[OrderSummaryResponse]:
         """Get all orders with pagination."""
-        orders = await self.repository.get_all(skip, limit)
-        return await self.serializer.serialize_for_list(orders)
+        after = decode_cursor_param(cursor, self.repository.sorts[sort])
+        orders = await self.repository.get_all(skip, limit, after, sort, filters, view)
+        return await self._page(orders, limit, sort, view)
     
-    async def get_orders_by_customer_id(self, customer_id: str, skip: int = 0, limit: int = 100) -> list[OrderResponse]:
+    async def get_orders_by_customer_id(
+        self,
+        customer_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        sort: OrderSort = OrderSort.CREATED_AT,
+        filters: OrderFilter | None = None,
+        view: OrderView = OrderView.FULL
+    ) -> Page[OrderResponse] | Page[OrderSummaryResponse]:
         """Get orders by customer ID."""
-        # Validate that customer exists
-        customer = await self.customer_repository.get_by_id(customer_id)
-        if not customer:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Customer not found"
-            )
+        after = decode_cursor_param(cursor, self.repository.sorts[sort])
         
-        orders = await self.repository.get_by_customer_id(customer_id, skip, limit)
-        return await self.serializer.serialize_for_list(orders)
+        # Validate that customer exists while the orders are read
+        _, orders = await gather(
+            self._get_customer(customer_id),
+            self.repository.get_by_customer_id(customer_id, skip, limit, after, sort, filters, view)
+        )
+        return await self._page(orders, limit, sort, view)
     
-    async def get_orders_by_status(self, status: OrderStatus, skip: int = 0, limit: int = 100) -> list[OrderResponse]:
+    async def get_orders_by_status(
+        self,
+        status: OrderStatus,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        sort: OrderSort = OrderSort.CREATED_AT,
+        filters: OrderFilter | None = None,
+        view: OrderView = OrderView.FULL
+    ) -> Page[OrderResponse] | Page[OrderSummaryResponse]:
         """Get orders by status."""
-        orders = await self.repository.get_by_status(status, skip, limit)
-        return await self.serializer.serialize_for_list(orders)
+        after = decode_cursor_param(cursor, self.repository.sorts[sort])
+        orders = await self.repository.get_by_status(status, skip, limit, after, sort, filters, view)
+        return await self._page(orders, limit, sort, view)
     
-    async def update_order_status(self, order_id: str, new_status: OrderStatusUpdate) -> OrderResponse:
-        """Update order status with business validation."""
-        order = await self.repository.get_by_id(order_id)
-        if not order:
+    async def get_orders_encoded(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        sort: OrderSort = OrderSort.CREATED_AT,
+        filters: OrderFilter | None = None,
+        customer_id: str | None = None,
+        order_status: OrderStatus | None = None
+    ) -> EncodedPage:
+        """Get orders encoded straight from raw documents, skipping model hydration."""
+        after = decode_cursor_param(cursor, self.repository.sorts[sort])
+        filters = (filters or OrderFilter()).model_copy(update={
+            "customer_id": customer_id,
+            "status": order_status
+        })
+        read = self.repository.get_documents(
+            skip, limit, after, sort, filters, self.serializer.document_projection
+        )
+        if customer_id is None:
+            documents = await read
+        else:
+            # Validate that customer exists while the orders are read
+            _, documents = await gather(self._get_customer(customer_id), read)
+        
+        return EncodedPage(
+            content=self.serializer.encode_documents(documents),
+            next_cursor=next_page_cursor(documents, limit, self.repository.sorts[sort])
+        )
+    
+    async def _page(
+        self,
+        orders: list[Order] | list[OrderSummary],
+        limit: int,
+        sort: OrderSort,
+        view: OrderView
+    ) -> Page[OrderResponse] | Page[OrderSummaryResponse]:
+        """Serialize a page of orders along with the cursor of the next page."""
+        next_cursor = next_page_cursor(orders, limit, self.repository.sorts[sort])
+        if view == OrderView.SUMMARY:
+            return Page[OrderSummaryResponse](
+                items=self.serializer.build_summary_list(orders),
+                next_cursor=next_cursor
+            )
+        return Page[OrderResponse](
+            items=self.serializer.build_list(orders),
+            next_cursor=next_cursor
+        )
+    
+    async def export_orders(self, filters: OrderFilter | None = None) -> AsyncIterator[bytes]:
+        """Stream orders as newline-delimited JSON."""
+        documents = self.repository.iter_documents(filters, self.export_batch_size, self.serializer.document_projection)
+        async for document in documents:
+            yield self.serializer.encode_document(document) + b"\n"
+    
+    def subscribe_events(
+        self,
+        order_status: OrderStatus | None = None,
+        customer_id: str | None = None
+    ) -> Subscription[OrderEvent]:
+        """Subscribe to order events, optionally filtered by status and customer."""
+        return self.event_broker.subscribe(lambda event: event.matches(order_status, customer_id))
+    
+    async def stream_events(
+        self,
+        order_status: OrderStatus | None = None,
+        customer_id: str | None = None,
+        heartbeat: float = 15.0
+    ) -> AsyncIterator[bytes]:
+        """Stream order events as Server-Sent Events, with keep-alive comments while idle."""
+        with self.subscribe_events(order_status, customer_id) as subscription:
+            while True:
+                event = await subscription.get(timeout=heartbeat)
+                if event is None:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield f"event: {event.type.value}\ndata: {event.model_dump_json()}\n\n".encode()
+    
+    async def relay_change_stream(self, retry_delay: float = 1.0) -> None:
+        """Publish order events read from the Mongo change stream until cancelled."""
+        resume_token = None
+        while True:
+            try:
+                async for change in self.repository.watch_changes(resume_token):
+                    resume_token = change["_id"]
+                    event = self._event_from_change(change)
+                    if event:
+                        self.event_broker.publish(event)
+            except OperationFailure as exc:
+                if exc.code == CHANGE_STREAM_UNSUPPORTED:
+                    logger.error("Order change stream needs a replica set; no events will be relayed")
+                    return
+                logger.warning("Order change stream failed, resuming: %s", exc)
+            except PyMongoError as exc:
+                logger.warning("Order change stream failed, resuming: %s", exc)
+            await asyncio.sleep(retry_delay)
+    
+    def _publish(self, event_type: OrderEventType, order: Order) -> None:
+        """Publish an order event unless events come from the change stream."""
+        if self.event_source != OrderEventSource.LOCAL:
+            return
+        self.event_broker.publish(OrderEvent(
+            type=event_type,
+            order_id=str(order.id),
+            customer_id=order.customer_id,
+            status=order.status,
+            occurred_at=order.updated_at if event_type == OrderEventType.STATUS_CHANGED else order.created_at
+        ))
+    
+    @staticmethod
+    def _event_from_change(change: dict) -> OrderEvent | None:
+        """Build an order event from a change stream document."""
+        document = change.get("fullDocument")
+        if not document:
+            # The order was deleted before the update could be looked up
+            return None
+        return OrderEvent(
+            type=OrderEventType.CREATED if change["operationType"] == "insert" else OrderEventType.STATUS_CHANGED,
+            order_id=str(change["documentKey"]["_id"]),
+            customer_id=document["customer_id"],
+            status=document["status"],
+            occurred_at=change["clusterTime"].as_datetime().replace(tzinfo=None)
+        )
+    
+    async def get_order_stats(
+        self,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        granularity: OrderStatsGranularity = OrderStatsGranularity.DAY
+    ) -> OrderStatsResponse:
+        """Get order counts and revenue per period and status from the rollups."""
+        if from_date and to_date and from_date > to_date:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Order not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'from' must not be after 'to'"
             )
         
-        # Check if transition is valid for order status
-        if not order.can_transition_to(new_status):
+        start = datetime.combine(from_date, time.min) if from_date else None
+        end = datetime.combine(to_date, time.min) + timedelta(days=1) if to_date else None
+        try:
+            buckets = await self.rollup_repository.get_stats(start, end, granularity)
+        except RollupsNotBuiltError as exc:
+            logger.error("Serving no order stats: %s", exc)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Order statistics are unavailable until the rollups are rebuilt"
+            )
+        
+        return OrderStatsResponse(
+            granularity=granularity,
+            buckets=[
+                OrderStatsBucket(revenue=bucket["revenue_cents"] / 100, **bucket)
+                for bucket in buckets
+            ]
+        )
+    
+    async def update_order_status(self, order_id: str, new_status: OrderStatusUpdate) -> OrderResponse:
+        """Update order status with business validation."""
+        try:
+            updated_order = await self.repository.update_status(order_id, new_status)
+        except ValueError as exc:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot transition from {order.status} to {new_status}"
+                detail=str(exc)
             )
         
-        updated_order = await self.repository.update_status(order_id, new_status)
         if not updated_order:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update order status"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found"
             )
+        self._publish(OrderEventType.STATUS_CHANGED, updated_order)
         
         return await self.serializer.serialize(updated_order)
     
     async def delete_order(self, order_id: str) -> bool:
         """Delete order."""
-        order = await self.repository.get_by_id(order_id)
-        if not order:
+        deleted = await self.repository.delete(order_id)
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
             )
         
-        return await self.repository.delete(order_id)
+        return deleted
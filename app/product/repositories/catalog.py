@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from beanie import PydanticObjectId
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.metrics import CallbackMetric, MetricsRegistry
+from app.models.product import Product
+from app.models.product_tombstone import ProductTombstone
+
+logger = logging.getLogger(__name__)
+
+# Re-read a little before the last poll to absorb clock skew between writers
+POLL_OVERLAP = timedelta(seconds=5)
+
+# Error codes Mongo returns when change streams are used on a standalone server
+# and when a resume token has fallen off the oplog
+CHANGE_STREAM_UNSUPPORTED = 40573
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class ProductCatalog:
+    """Process-local snapshot of the product catalog.
+
+    Loaded once, then kept current by polling updated_at and the tombstones
+    ProductRepository writes on delete, or by following the products change
+    stream. Writes through ProductRepository update it immediately; writes
+    made elsewhere show up within the staleness bound. Products deleted
+    outside the API leave no tombstone, so polling also compares the
+    snapshot with the live IDs every reconcile_interval.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 5.0,
+        use_change_stream: bool = False,
+        reconcile_interval: float = 600.0
+    ):
+        self.refresh_interval = refresh_interval
+        self.use_change_stream = use_change_stream
+        self.reconcile_interval = reconcile_interval
+        self.hits = 0
+        self.misses = 0
+        self._products: dict[PydanticObjectId, Product] = {}
+        self._ready = False
+        self._synced_at: float | None = None
+        self._poll_from: datetime | None = None
+        self._reconciled_at = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    @property
+    def size(self) -> int:
+        return len(self._products)
+
+    @property
+    def staleness_seconds(self) -> float | None:
+        """Upper bound on how old the snapshot may be, None before it is loaded."""
+        if self._synced_at is None:
+            return None
+        return time.monotonic() - self._synced_at
+
+    def register(self, registry: MetricsRegistry) -> None:
+        """Expose the snapshot's size, hit counters and staleness."""
+        for name, documentation, kind, read in (
+            ("product_catalog_products", "Products held in the snapshot", "gauge", lambda: self.size),
+            ("product_catalog_hits_total", "Product lookups answered from the snapshot", "counter", lambda: self.hits),
+            ("product_catalog_misses_total", "Product lookups that went to Mongo", "counter", lambda: self.misses),
+            ("product_catalog_staleness_seconds", "Upper bound on the snapshot's age", "gauge", lambda: self.staleness_seconds),
+        ):
+            registry.register(CallbackMetric(name, documentation, lambda read=read: {(): read()}, kind=kind))
+
+    async def start(self) -> None:
+        """Load the snapshot and keep it current in the background."""
+        await self.load()
+        self._task = asyncio.create_task(self._follow() if self.use_change_stream else self._poll())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._ready = False
+
+    async def load(self) -> None:
+        """Replace the snapshot with every product in the collection."""
+        poll_from = datetime.utcnow() - POLL_OVERLAP
+        products = {}
+        async for document in Product.get_motor_collection().find({}):
+            product = self._from_document(document)
+            products[product.id] = product
+        self._products = products
+        self._poll_from = poll_from
+        self._synced_at = self._reconciled_at = time.monotonic()
+        self._ready = True
+
+    async def refresh(self) -> int:
+        """Apply products changed or deleted since the last refresh and return how many changed."""
+        poll_from = datetime.utcnow() - POLL_OVERLAP
+        changed = 0
+        async for document in Product.get_motor_collection().find({"updated_at": {"$gte": self._poll_from}}):
+            self.put(self._from_document(document))
+            changed += 1
+
+        tombstones = ProductTombstone.get_motor_collection().find(
+            {"deleted_at": {"$gte": self._poll_from}}, {"product_id": 1}
+        )
+        async for tombstone in tombstones:
+            if tombstone["product_id"] in self._products:
+                self.discard(tombstone["product_id"])
+                changed += 1
+
+        if time.monotonic() - self._reconciled_at >= self.reconcile_interval:
+            changed += await self.reconcile()
+
+        self._poll_from = poll_from
+        self._synced_at = time.monotonic()
+        return changed
+
+    async def reconcile(self) -> int:
+        """Drop products missing from the collection and return how many were dropped."""
+        live_ids = {document["_id"] async for document in Product.get_motor_collection().find({}, {"_id": 1})}
+        deleted = [product_id for product_id in self._products if product_id not in live_ids]
+        for product_id in deleted:
+            self.discard(product_id)
+        self._reconciled_at = time.monotonic()
+        return len(deleted)
+
+    def lookup(self, product_ids: list[PydanticObjectId]) -> tuple[list[Product], list[PydanticObjectId]]:
+        """Split product IDs into products found in the snapshot and IDs that were not."""
+        found, missing = [], []
+        for product_id in product_ids:
+            product = self._products.get(product_id)
+            if product is None:
+                missing.append(product_id)
+            else:
+                found.append(product)
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put(self, product: Product) -> None:
+        if self._ready:
+            self._products[product.id] = product
+
+    def discard(self, product_id: PydanticObjectId) -> None:
+        self._products.pop(product_id, None)
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except PyMongoError as exc:
+                logger.warning("Product catalog refresh failed: %s", exc)
+
+    async def _follow(self) -> None:
+        resume_token = None
+        while True:
+            try:
+                async with Product.get_motor_collection().watch(
+                    full_document="updateLookup",
+                    resume_after=resume_token,
+                    max_await_time_ms=int(self.refresh_interval * 1000)
+                ) as stream:
+                    while stream.alive:
+                        change = await stream.try_next()
+                        self._synced_at = time.monotonic()
+                        if change is None:
+                            continue
+                        resume_token = change["_id"]
+                        self._apply_change(change)
+            except OperationFailure as exc:
+                if exc.code == CHANGE_STREAM_UNSUPPORTED:
+                    logger.warning("Products change stream needs a replica set; polling instead")
+                    await self._poll()
+                    return
+                if exc.code == CHANGE_STREAM_HISTORY_LOST:
+                    resume_token = None
+                    await self._reload()
+                    continue
+                logger.warning("Products change stream failed, resuming: %s", exc)
+            except PyMongoError as exc:
+                logger.warning("Products change stream failed, resuming: %s", exc)
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _reload(self) -> None:
+        try:
+            await self.load()
+        except PyMongoError as exc:
+            logger.warning("Product catalog reload failed: %s", exc)
+
+    def _apply_change(self, change: dict) -> None:
+        product_id = change["documentKey"]["_id"]
+        document = change.get("fullDocument")
+        if change["operationType"] == "delete" or document is None:
+            self.discard(product_id)
+        else:
+            self.put(self._from_document(document))
+
+    @staticmethod
+    def _from_document(document: dict) -> Product:
+        """Build a product without validation; the document was validated when written."""
+        document = dict(document)
+        document["id"] = document.pop("_id")
+        return Product.model_construct(**document)
@@ -1,18 +1,37 @@
 
 from datetime import datetime
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, UpdateResponse
+from beanie.odm.operators.update.general import Set
+from pymongo import ASCENDING
 
+from app.core.pagination import SortSpec, seek_filter
+from app.core.response_cache import ResponseCache
+from app.core.slow_queries import trace_operations
 from app.models.product import Product
+from app.models.product_tombstone import ProductTombstone
+from app.product.repositories.catalog import ProductCatalog
 from app.product.schemas.product import ProductCreate, ProductUpdate
 
 
+@trace_operations
 class ProductRepository:
     """Repository for product operations."""
     
+    sort: SortSpec = [("_id", ASCENDING)]
+    
+    def __init__(self, catalog: ProductCatalog | None = None, response_cache: ResponseCache | None = None):
+        self.catalog = catalog
+        self.response_cache = response_cache
+    
     async def create(self, product_data: ProductCreate) -> Product:
         """Create a new product."""
         product = Product(**product_data.dict())
-        return await product.insert()
+        await product.insert()
+        if self.catalog:
+            self.catalog.put(product)
+        if self.response_cache:
+            self.response_cache.invalidate_range(product.id)
+        return product
     
     async def get_by_id(self, product_id: str) -> Product | None:
         """Get product by ID."""
@@ -21,40 +40,91 @@ class ProductRepository:
         except Exception:
             return None
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Product]:
+    async def get_updated_at(self, product_id: str) -> datetime | None:
+        """Get only the last modification time of a product."""
+        try:
+            object_id = PydanticObjectId(product_id)
+        except Exception:
+            return None
+        
+        document = await Product.get_motor_collection().find_one({"_id": object_id}, {"updated_at": 1})
+        return document.get("updated_at") if document else None
+    
+    async def get_all(self, skip: int = 0, limit: int = 100, after: list | None = None) -> list[Product]:
         """Get all products with pagination."""
-        return await Product.find_all().skip(skip).limit(limit).to_list()
+        query = Product.find_all()
+        if after is not None:
+            query = query.find(seek_filter(self.sort, after))
+        else:
+            query = query.skip(skip)
+        return await query.sort(self.sort).limit(limit).to_list()
+    
+    async def get_documents(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list | None = None,
+        projection: dict | None = None
+    ) -> list[dict]:
+        """Get a page of raw product documents without hydrating Beanie models."""
+        query = seek_filter(self.sort, after) if after is not None else {}
+        cursor = Product.get_motor_collection().find(query, projection).sort(self.sort).limit(limit)
+        if after is None:
+            cursor = cursor.skip(skip)
+        return await cursor.to_list(length=limit)
     
     async def update(self, product_id: str, product_data: ProductUpdate) -> Product | None:
-        """Update product."""
-        product = await self.get_by_id(product_id)
-        if not product:
+        """Update only the changed fields of a product."""
+        try:
+            object_id = PydanticObjectId(product_id)
+        except Exception:
             return None
         
         update_data = product_data.dict(exclude_unset=True)
         if not update_data:
-            return product
-        
-        # Update fields
-        for field, value in update_data.items():
-            setattr(product, field, value)
+            return await Product.get(object_id)
         
-        product.updated_at = datetime.utcnow()  # Update timestamp
-        return await product.save()
+        update_data["updated_at"] = datetime.utcnow()
+        product = await Product.find_one(Product.id == object_id).update(
+            Set(update_data),
+            response_type=UpdateResponse.NEW_DOCUMENT
+        )
+        if product and self.catalog:
+            self.catalog.put(product)
+        if product and self.response_cache:
+            self.response_cache.invalidate(object_id)
+        return product
     
     async def delete(self, product_id: str) -> bool:
         """Delete product."""
-        product = await self.get_by_id(product_id)
-        if not product:
+        try:
+            object_id = PydanticObjectId(product_id)
+        except Exception:
             return False
         
-        await product.delete()
-        return True
+        result = await Product.find_one(Product.id == object_id).delete()
+        deleted = bool(result and result.deleted_count)
+        if deleted:
+            # Catalog snapshots in other processes poll tombstones to drop the product
+            await ProductTombstone(product_id=object_id).insert()
+        if self.catalog:
+            self.catalog.discard(object_id)
+        if self.response_cache:
+            self.response_cache.invalidate_range(object_id)
+        return deleted
     
     async def get_by_ids(self, product_ids: list[str]) -> list[Product]:
         """Get multiple products by IDs."""
-        try:
-            object_ids = [PydanticObjectId(pid) for pid in product_ids]
-            return await Product.find({"_id": {"$in": object_ids}}).to_list()
-        except Exception:
+        object_ids = [PydanticObjectId(pid) for pid in product_ids if PydanticObjectId.is_valid(pid)]
+        if not object_ids:
             return []
+        if not (self.catalog and self.catalog.ready):
+            return await Product.find({"_id": {"$in": object_ids}}).to_list()
+        
+        products, missing = self.catalog.lookup(object_ids)
+        if missing:
+            fetched = await Product.find({"_id": {"$in": missing}}).to_list()
+            for product in fetched:
+                self.catalog.put(product)
+            products += fetched
+        return products
@@ -2,8 +2,15 @@
 from fastapi import APIRouter, Depends, Query
 
 from app.container.dependencies import get_product_service
+from app.core.conditional import (
+    ConditionalRequest, get_conditional_request, not_modified_response, validator_headers
+)
+from app.core.config import settings
+from app.core.pagination import page_headers
+from app.core.response_cache import ResponseCacheStats
+from app.core.responses import encoded_page_response, encoded_response, model_list_response, model_response
 from app.product.services.service import ProductService
-from app.product.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.product.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductCatalogStats
 
 
 router = APIRouter(prefix="/products", tags=["products"])
@@ -18,22 +25,59 @@ async def create_product(
     return await service.create_product(product_data)
 
 
+@router.get("/catalog/stats", response_model=ProductCatalogStats)
+async def get_catalog_stats(
+    service: ProductService = Depends(get_product_service)
+):
+    """Get hit counters and the staleness bound of the in-memory product catalog."""
+    return await service.get_catalog_stats()
+
+
+@router.get("/cache/stats", response_model=ResponseCacheStats)
+async def get_response_cache_stats(
+    service: ProductService = Depends(get_product_service)
+):
+    """Get hit ratio, evictions and bytes held by the product response cache."""
+    return await service.get_response_cache_stats()
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: str,
+    conditional: ConditionalRequest = Depends(get_conditional_request),
     service: ProductService = Depends(get_product_service)
 ):
-    """Get product by ID."""
-    return await service.get_product_by_id(product_id)
+    """Get product by ID, answering revalidation requests with 304 Not Modified."""
+    if "products.get" in settings.response_cache_routes:
+        resource = await service.get_product_cached(product_id)
+        if conditional.present and conditional.not_modified(resource.id, resource.updated_at):
+            return not_modified_response(resource.id, resource.updated_at)
+        return encoded_response(resource.content, headers=validator_headers(resource.id, resource.updated_at))
+    
+    if conditional.present:
+        updated_at = await service.get_product_updated_at(product_id)
+        if updated_at and conditional.not_modified(product_id, updated_at):
+            return not_modified_response(product_id, updated_at)
+    
+    product = await service.get_product_by_id(product_id)
+    return model_response(product, headers=validator_headers(product.id, product.updated_at))
+
 
 @router.get("/", response_model=list[ProductResponse])
 async def list_products(
     skip: int = Query(0, ge=0, description="Number of products to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of products to return"),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; takes precedence over skip"),
     service: ProductService = Depends(get_product_service)
 ):
     """List all products with pagination."""
-    return await service.get_all_products(skip, limit)
+    raw = "products.list" in settings.raw_read_routes
+    if "products.list" in settings.response_cache_routes:
+        return encoded_page_response(await service.get_products_page_cached(skip, limit, cursor, raw))
+    if raw:
+        return encoded_page_response(await service.get_all_products_encoded(skip, limit, cursor))
+    page = await service.get_all_products(skip, limit, cursor)
+    return model_list_response(page.items, ProductResponse, headers=page_headers(page))
 
 
 @router.put("/{product_id}", response_model=ProductResponse)
@@ -27,3 +27,14 @@ class ProductResponse(ProductBase):
     
     class Config:
         from_attributes = True
+
+
+class ProductCatalogStats(BaseModel):
+    """Schema for product catalog snapshot statistics."""
+    ready: bool
+    size: int
+    hits: int
+    misses: int
+    staleness_seconds: float | None = None
+    refresh_interval_seconds: float
+    source: str
@@ -1,15 +1,17 @@
 
-from app.core.serializers.base import BaseSerializer
+from app.core.serializers.base import BaseSerializer, DocumentSerializer
 from app.models.product import Product
 from app.product.schemas.product import ProductCreate, ProductUpdate, ProductResponse
 
 
-class ProductSerializer(BaseSerializer[Product, ProductResponse]):
+class ProductSerializer(DocumentSerializer[Product, ProductResponse]):
     """Serializer for Product domain model."""
     
-    async def serialize(self, product: Product) -> ProductResponse:
-        """Serialize Product to ProductResponse."""
-        return ProductResponse(
+    document_projection = {"name": 1, "price": 1, "created_at": 1, "updated_at": 1}
+    
+    def build(self, product: Product) -> ProductResponse:
+        """Build ProductResponse from Product."""
+        return ProductResponse.model_construct(
             id=str(product.id),
             name=product.name,
             price=product.price,
@@ -17,9 +19,19 @@ class ProductSerializer(BaseSerializer[Product, ProductResponse]):
             updated_at=product.updated_at
         )
     
+    def response_fields(self, document: dict) -> dict:
+        """Map a raw Mongo product document to ProductResponse fields."""
+        return {
+            "name": document["name"],
+            "price": float(document["price"]),
+            "id": str(document["_id"]),
+            "created_at": document["created_at"],
+            "updated_at": document.get("updated_at")
+        }
+    
     async def serialize_for_list(self, products: list[Product]) -> list[ProductResponse]:
         """Serialize list of products."""
-        return [await self.serialize(product) for product in products]
+        return self.build_list(products)
 
 
 class ProductCreateSerializer(BaseSerializer[ProductCreate, ProductResponse]):
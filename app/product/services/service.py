@@ -1,6 +1,12 @@
+from datetime import datetime
+
+from beanie import PydanticObjectId
 from fastapi import HTTPException, status
 
-from app.product.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.core.pagination import EncodedPage, Page, decode_cursor_param, next_page_cursor
+from app.core.response_cache import ResponseCache, ResponseCacheStats
+from app.core.responses import EncodedResource, list_adapter
+from app.product.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductCatalogStats
 from app.product.serializers.serializer import (
     ProductSerializer, ProductCreateSerializer, ProductUpdateSerializer
 )
@@ -15,12 +21,14 @@ class ProductService:
         repository: ProductRepository,
         serializer: ProductSerializer,
         create_serializer: ProductCreateSerializer,
-        update_serializer: ProductUpdateSerializer
+        update_serializer: ProductUpdateSerializer,
+        response_cache: ResponseCache | None = None
     ):
         self.repository = repository
         self.serializer = serializer
         self.create_serializer = create_serializer
         self.update_serializer = update_serializer
+        self.response_cache = response_cache
     
     async def create_product(self, product_data: ProductCreate) -> ProductResponse:
         """Create a new product with business validation."""
@@ -37,40 +45,131 @@ class ProductService:
             )
         return await self.serializer.serialize(product)
     
-    async def get_all_products(self, skip: int = 0, limit: int = 100) -> list[ProductResponse]:
+    async def get_product_updated_at(self, product_id: str) -> datetime | None:
+        """Get the last modification time of a product, None if it does not exist."""
+        return await self.repository.get_updated_at(product_id)
+    
+    async def get_all_products(self, skip: int = 0, limit: int = 100, cursor: str | None = None) -> Page[ProductResponse]:
         """Get all products with pagination."""
-        products = await self.repository.get_all(skip, limit)
-        return await self.serializer.serialize_for_list(products)
+        after = decode_cursor_param(cursor, self.repository.sort)
+        products = await self.repository.get_all(skip, limit, after)
+        return Page[ProductResponse](
+            items=self.serializer.build_list(products),
+            next_cursor=next_page_cursor(products, limit, self.repository.sort)
+        )
     
-    async def update_product(self, product_id: str, product_data: ProductUpdate) -> ProductResponse:
-        """Update product with business validation."""
-        # Check if product exists
-        existing_product = await self.repository.get_by_id(product_id)
-        if not existing_product:
+    async def get_all_products_encoded(self, skip: int = 0, limit: int = 100, cursor: str | None = None) -> EncodedPage:
+        """Get all products encoded straight from raw documents."""
+        after = decode_cursor_param(cursor, self.repository.sort)
+        documents = await self.repository.get_documents(skip, limit, after, self.serializer.document_projection)
+        return EncodedPage(
+            content=self.serializer.encode_documents(documents),
+            next_cursor=next_page_cursor(documents, limit, self.repository.sort)
+        )
+    
+    async def get_product_cached(self, product_id: str) -> EncodedResource:
+        """Get an encoded product through the response cache."""
+        cache = self._require_response_cache()
+        key = ("products.get", product_id)
+        resource = cache.get(key)
+        if resource is not None:
+            return resource
+        
+        generation = cache.generation
+        product = await self.get_product_by_id(product_id)
+        resource = EncodedResource(
+            id=product.id,
+            content=product.__pydantic_serializer__.to_json(product),
+            updated_at=product.updated_at
+        )
+        cache.put(key, resource, len(resource.content), generation, ids=[PydanticObjectId(product.id)])
+        return resource
+    
+    async def get_products_page_cached(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        raw: bool = False
+    ) -> EncodedPage:
+        """Get an encoded page of products through the response cache."""
+        cache = self._require_response_cache()
+        # A cursor takes precedence over skip, so skip is not part of its key
+        key = ("products.list", limit, cursor) if cursor is not None else ("products.list", limit, skip)
+        page = cache.get(key)
+        if page is not None:
+            return page
+        
+        generation = cache.generation
+        after = decode_cursor_param(cursor, self.repository.sort)
+        if raw:
+            documents = await self.repository.get_documents(skip, limit, after, self.serializer.document_projection)
+            ids = [document["_id"] for document in documents]
+            content = self.serializer.encode_documents(documents)
+        else:
+            documents = await self.repository.get_all(skip, limit, after)
+            ids = [product.id for product in documents]
+            content = list_adapter(ProductResponse).dump_json(self.serializer.build_list(documents))
+        page = EncodedPage(content=content, next_cursor=next_page_cursor(documents, limit, self.repository.sort))
+        
+        # Pages are ordered by _id: a page covers the IDs after its cursor (or all
+        # before it, for skip pages) up to its last ID, or beyond when it is the last page
+        low = after[0] if after is not None else None
+        high = ids[-1] if len(ids) == limit else None
+        cache.put(key, page, len(content), generation, ids=ids, span=(low, high))
+        return page
+    
+    async def get_response_cache_stats(self) -> ResponseCacheStats:
+        """Get hit ratio, evictions and size of the product response cache."""
+        return self._require_response_cache().stats()
+    
+    def _require_response_cache(self) -> ResponseCache:
+        if self.response_cache is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Product not found"
+                detail="Product response cache is not configured"
             )
-        
+        return self.response_cache
+    
+    async def update_product(self, product_id: str, product_data: ProductUpdate) -> ProductResponse:
+        """Update product with business validation."""
         updated_product = await self.repository.update(product_id, product_data)
         if not updated_product:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update product"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
             )
         
         return await self.serializer.serialize(updated_product)
     
     async def delete_product(self, product_id: str) -> bool:
         """Delete product."""
-        product = await self.repository.get_by_id(product_id)
-        if not product:
+        deleted = await self.repository.delete(product_id)
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Product not found"
             )
         
-        return await self.repository.delete(product_id)
+        return deleted
+    
+    async def get_catalog_stats(self) -> ProductCatalogStats:
+        """Get hit counters and the staleness bound of the product catalog snapshot."""
+        catalog = self.repository.catalog
+        if catalog is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product catalog is not configured"
+            )
+        return ProductCatalogStats(
+            ready=catalog.ready,
+            size=catalog.size,
+            hits=catalog.hits,
+            misses=catalog.misses,
+            staleness_seconds=catalog.staleness_seconds,
+            refresh_interval_seconds=catalog.refresh_interval,
+            source="change_stream" if catalog.use_change_stream else "poll"
+        )
     
     async def get_products_by_ids(self, product_ids: list[str]) -> list[ProductResponse]:
         """Get multiple products by IDs."""
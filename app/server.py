@@ -0,0 +1,92 @@
+"""
+Production entry point: multiple uvicorn workers on uvloop and httptools.
+
+Workers are spawned, not forked, and each runs the application lifespan, so
+every worker opens its own Motor client and pool. Size MONGO_MAX_POOL_SIZE
+per worker: a host holds up to WORKERS x MONGO_MAX_POOL_SIZE connections.
+
+The supervising process restarts workers that die. Send it SIGHUP to restart
+all workers one by one without dropping the listening socket; SIGTTIN and
+SIGTTOU add or remove a worker. Workers stop accepting connections on
+SIGTERM and finish in-flight requests for up to GRACEFUL_SHUTDOWN_SECONDS.
+
+Usage: python -m app.server
+"""
+
+import math
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+
+# cgroup v2, then v1: the CPU quota a container runtime sets with --cpus
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+def cpu_quota() -> float | None:
+    """CPUs the cgroup quota allows, None when there is no quota."""
+    try:
+        with open(CGROUP_CPU_MAX) as cpu_max:
+            quota, period = cpu_max.read().split()
+    except (OSError, ValueError):
+        try:
+            with open(CGROUP_V1_CPU_QUOTA) as quota_file, open(CGROUP_V1_CPU_PERIOD) as period_file:
+                quota, period = quota_file.read().strip(), period_file.read().strip()
+        except OSError:
+            return None
+    if quota in ("max", "-1"):
+        return None
+    try:
+        return int(quota) / int(period)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def worker_count() -> int:
+    """Configured worker count, one per usable CPU when unset.
+
+    Affinity and cpu_count see every CPU of the host, so a container's CPU
+    quota caps the default as well.
+    """
+    if settings.workers:
+        return settings.workers
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    quota = cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+def main():
+    try:
+        import httptools  # noqa: F401
+        import uvloop  # noqa: F401
+    except ImportError as exc:
+        raise SystemExit(f"The production server needs uvloop and httptools: pip install -r requirements.txt ({exc})")
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=worker_count(),
+        loop="uvloop",
+        http="httptools",
+        backlog=settings.backlog,
+        timeout_keep_alive=settings.keep_alive_seconds,
+        limit_concurrency=settings.limit_concurrency,
+        limit_max_requests=settings.limit_max_requests,
+        timeout_graceful_shutdown=settings.graceful_shutdown_seconds,
+        proxy_headers=True,
+        access_log=settings.access_log,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure what resolving route dependencies costs per request in each DI scope.
+
+Every route resolves its service through app.container.dependencies once per
+request. With Factory providers that builds the service, its repositories
+and serializers on each call; with singletons it returns the existing
+instance. Scopes are fixed when the container is imported, so each scope is
+measured in a fresh interpreter with DI_DEFAULT_SCOPE set.
+
+Usage: python -m benchmarks.di_resolution [--calls 100000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+SCOPES = ("factory", "singleton", "thread_safe_singleton")
+RESOLVERS = ("get_order_service", "get_product_service", "get_customer_service")
+
+
+def measure(calls: int, repeat: int) -> dict[str, float]:
+    """Median nanoseconds per resolution of each route's service, in this interpreter's scope."""
+    from app.container import dependencies
+
+    results = {}
+    for name in RESOLVERS:
+        resolve = getattr(dependencies, name)
+        resolve()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter_ns()
+            for _ in range(calls):
+                resolve()
+            timings.append((time.perf_counter_ns() - started) / calls)
+        timings.sort()
+        results[name] = timings[len(timings) // 2]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100000, help="Resolutions per timed loop")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.calls, args.repeat)))
+        return
+
+    results = {}
+    for scope in SCOPES:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.di_resolution", "--measure",
+             "--calls", str(args.calls), "--repeat", str(args.repeat)],
+            env={**os.environ, "DI_DEFAULT_SCOPE": scope, "DI_PROVIDER_SCOPES": "{}"},
+            capture_output=True, text=True, check=True
+        ).stdout
+        results[scope] = json.loads(output.splitlines()[-1])
+
+    print(f"{'resolver':<24}" + "".join(f"{scope + ' ns':>26}" for scope in SCOPES))
+    for name in RESOLVERS:
+        print(f"{name:<24}" + "".join(f"{results[scope][name]:>26,.0f}" for scope in SCOPES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Microbenchmarks of the CPU-side hot paths: serializers, models and validators.
+
+Each case runs on fixed synthetic documents, orders with 1, 10 and 100
+items and pages of 100 and 1000, and reports:
+
+  ns/op        median of --repeat timed loops, without tracing
+  alloc B/op   bytes still allocated per op when its results are kept
+  blocks/op    memory blocks still allocated per op when its results are kept
+  peak B/op    peak traced memory of a single op
+
+Allocations are measured with tracemalloc in a separate pass so tracing
+doesn't skew the timings. No Mongo server is needed. Beanie only lets
+documents be instantiated after init_beanie, so the Order(...) cases
+initialize it against mongomock-motor's in-memory client and are skipped
+when that isn't installed (pip install mongomock-motor).
+
+--output writes the results as JSON; --baseline prints the change against
+an earlier file.
+
+Usage: python -m benchmarks.hot_paths [--filter serialize] [--repeat 7]
+           [--output results.json] [--baseline baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from app.core.responses import model_list_response
+from app.models.order import OrderItem
+from app.order.schemas.order import OrderResponse, OrderStatusUpdate
+from app.order.serializers.serializer import OrderSerializer
+from app.product.schemas.product import ProductResponse
+from app.product.serializers.serializer import ProductSerializer
+from benchmarks.response_serialization import make_orders, make_products
+
+ITEM_COUNTS = (1, 10, 100)
+PAGE_SIZES = (100, 1000)
+# Target time per timed loop; the op count is calibrated to it
+LOOP_SECONDS = 0.05
+
+
+def run_coroutine(coroutine):
+    """Drive a coroutine that never suspends without an event loop's overhead."""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("Coroutine suspended; it needs an event loop")
+
+
+def item_payloads(count: int) -> list[dict]:
+    return [
+        {"product_id": f"{index:024x}", "product_name": f"Product {index}", "quantity": index % 5 + 1, "unit_price": 9.99}
+        for index in range(count)
+    ]
+
+
+def beanie_ready() -> bool:
+    """Initialize Beanie against an in-memory client so documents can be instantiated."""
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        return False
+    from beanie import init_beanie
+    from app.core.database import DOCUMENT_MODELS
+
+    asyncio.run(init_beanie(
+        database=AsyncMongoMockClient()["hot_paths"], document_models=DOCUMENT_MODELS, skip_indexes=True
+    ))
+    return True
+
+
+def build_cases(with_documents: bool) -> list[tuple[str, callable]]:
+    order_serializer = OrderSerializer()
+    product_serializer = ProductSerializer()
+    cases = []
+
+    for items in ITEM_COUNTS:
+        order = make_orders(1, items)[0]
+        payloads = item_payloads(items)
+        cases.append((f"OrderItem(...) x{items}", lambda payloads=payloads: [OrderItem(**payload) for payload in payloads]))
+        cases.append((
+            f"OrderItem.total_price sum, {items} items",
+            lambda order=order: sum(item.total_price for item in order.items)
+        ))
+        cases.append((
+            f"OrderSerializer.serialize, {items} items",
+            lambda order=order: run_coroutine(order_serializer.serialize(order))
+        ))
+        if with_documents:
+            from app.models.order import Order
+            cases.append((
+                f"Order(...) as in OrderRepository.create, {items} items",
+                lambda payloads=payloads: Order(
+                    customer_id="0" * 24, customer_name="Customer", customer_email="customer@example.com", items=payloads
+                )
+            ))
+
+    for page_size in PAGE_SIZES:
+        products = make_products(page_size)
+        orders = make_orders(page_size, 10)
+        product_responses = product_serializer.build_list(products)
+        order_responses = order_serializer.build_list(orders)
+        cases.append((
+            f"ProductSerializer.serialize_for_list, page {page_size}",
+            lambda products=products: run_coroutine(product_serializer.serialize_for_list(products))
+        ))
+        cases.append((
+            f"OrderSerializer.serialize_for_list, page {page_size} x 10 items",
+            lambda orders=orders: run_coroutine(order_serializer.serialize_for_list(orders))
+        ))
+        cases.append((
+            f"encode products, page {page_size}",
+            lambda responses=product_responses: model_list_response(responses, ProductResponse).body
+        ))
+        cases.append((
+            f"encode orders, page {page_size} x 10 items",
+            lambda responses=order_responses: model_list_response(responses, OrderResponse).body
+        ))
+
+    cases.append(("OrderStatusUpdate(status=...)", lambda: OrderStatusUpdate(status="PAID")))
+    cases.append((
+        "OrderStatusUpdate.model_validate_json",
+        lambda: OrderStatusUpdate.model_validate_json(b'{"status": "CANCELLED"}')
+    ))
+    return cases
+
+
+def time_case(run, repeat: int) -> float:
+    """Median nanoseconds per op."""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            run()
+        if time.perf_counter() - started >= LOOP_SECONDS / 5:
+            break
+        number *= 2
+    number = max(1, int(number * LOOP_SECONDS / max(time.perf_counter() - started, 1e-9)))
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        for _ in range(number):
+            run()
+        timings.append((time.perf_counter_ns() - started) / number)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def allocations(run, ops: int = 50) -> tuple[float, float, float]:
+    """Retained bytes and blocks per op, and peak bytes of one op."""
+    run()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        # Keep the results alive so what they hold shows in the diff
+        kept = [run() for _ in range(ops)]
+        after = tracemalloc.take_snapshot()
+        statistics = after.compare_to(before, "filename")
+        size = sum(stat.size_diff for stat in statistics)
+        blocks = sum(stat.count_diff for stat in statistics)
+        del kept
+
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        run()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return size / ops, blocks / ops, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="Only cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed loops per case")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    with_documents = beanie_ready()
+    if not with_documents:
+        print("mongomock-motor is not installed; skipping the Order(...) cases\n")
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = {}
+    print(f"{'case':<58} {'ns/op':>12} {'alloc B/op':>11} {'blocks/op':>10} {'peak B/op':>10}"
+          + (f" {'vs baseline':>12}" if baseline else ""))
+    for name, run in build_cases(with_documents):
+        if args.filter and args.filter not in name:
+            continue
+        ns_per_op = time_case(run, args.repeat)
+        bytes_per_op, blocks_per_op, peak = allocations(run)
+        results[name] = {
+            "ns_per_op": ns_per_op,
+            "alloc_bytes_per_op": bytes_per_op,
+            "alloc_blocks_per_op": blocks_per_op,
+            "peak_bytes_per_op": peak,
+        }
+        line = f"{name:<58} {ns_per_op:>12,.0f} {bytes_per_op:>11,.0f} {blocks_per_op:>10,.1f} {peak:>10,.0f}"
+        if name in baseline:
+            line += f" {ns_per_op / baseline[name]['ns_per_op'] - 1:>+12.1%}"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
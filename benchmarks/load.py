@@ -0,0 +1,334 @@
+"""
+Drive the API with scripted load and report latency percentiles per route.
+
+Scenarios run in order against the same seeded data:
+
+  catalog             read-heavy browsing: product and customer reads, order
+                      listings, an occasional product update
+  order-burst         concurrent POST /orders/ from every worker
+  status-contention   workers racing PATCH /orders/{id}/status on a few
+                      orders; 400s for transitions another worker already
+                      made are expected
+
+By default requests go to the app in-process over httpx.ASGITransport,
+against the server at MONGODB_URL or, with --mock, mongomock-motor (pip
+install mongomock-motor). --url sends them to a running server instead, e.g.
+one started with uvicorn.
+
+Results are written as JSON with --output; pass a previous file as
+--baseline to print per-route changes, and --max-regression to exit non-zero
+when a p95 got slower by more than that fraction.
+
+Usage: python -m benchmarks.load [--mock | --url http://localhost:8000]
+           [--scenario catalog] [--requests 2000] [--concurrency 32]
+           [--output results.json] [--baseline baseline.json] [--max-regression 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+from app.core.config import settings
+from app.main import app
+from benchmarks.mock import mock_client
+
+SCENARIOS = ("catalog", "order-burst", "status-contention")
+
+
+class Recorder:
+    """Latencies and status codes per route template."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.unexpected: dict[str, int] = defaultdict(int)
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        route: str,
+        method: str,
+        url: str,
+        expected: tuple[int, ...] = (200,),
+        **kwargs
+    ) -> httpx.Response:
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[route].append(time.perf_counter() - started)
+        self.statuses[route][response.status_code] += 1
+        if response.status_code not in expected:
+            self.unexpected[route] += 1
+        return response
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for route, latencies in sorted(self.latencies.items()):
+            latencies.sort()
+            routes[route] = {
+                "requests": len(latencies),
+                "unexpected_statuses": self.unexpected[route],
+                "statuses": {str(code): count for code, count in sorted(self.statuses[route].items())},
+                "throughput_rps": len(latencies) / elapsed,
+                "p50_ms": percentile(latencies, 0.50) * 1000,
+                "p95_ms": percentile(latencies, 0.95) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+                "max_ms": latencies[-1] * 1000,
+            }
+        total = sum(route["requests"] for route in routes.values())
+        return {
+            "duration_seconds": elapsed,
+            "requests": total,
+            "throughput_rps": total / elapsed,
+            "routes": routes,
+        }
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+class Dataset:
+    """IDs of the customers, products and orders seeded through the API."""
+
+    def __init__(self):
+        self.customers: list[str] = []
+        self.products: list[str] = []
+        self.orders: list[str] = []
+
+
+async def seed(client: httpx.AsyncClient, customers: int, products: int, orders: int, rng: random.Random) -> Dataset:
+    data = Dataset()
+    for index in range(customers):
+        response = await client.post("/customers/", json={"name": f"Load Customer {index}", "email": f"load{index}@example.com"})
+        response.raise_for_status()
+        data.customers.append(response.json()["id"])
+    for index in range(products):
+        response = await client.post("/products/", json={"name": f"Load Product {index}", "price": round(rng.uniform(1, 200), 2)})
+        response.raise_for_status()
+        data.products.append(response.json()["id"])
+    for _ in range(orders):
+        response = await client.post("/orders/", json=order_payload(data, rng))
+        response.raise_for_status()
+        data.orders.append(response.json()["id"])
+    return data
+
+
+def order_payload(data: Dataset, rng: random.Random) -> dict:
+    return {
+        "customer_id": rng.choice(data.customers),
+        "items": [
+            {"product_id": product_id, "quantity": rng.randint(1, 5)}
+            for product_id in rng.sample(data.products, rng.randint(1, min(5, len(data.products))))
+        ],
+    }
+
+
+async def catalog_step(client: httpx.AsyncClient, recorder: Recorder, data: Dataset, rng: random.Random) -> None:
+    roll = rng.random()
+    if roll < 0.35:
+        await recorder.request(client, "GET /products/{id}", "GET", f"/products/{rng.choice(data.products)}")
+    elif roll < 0.60:
+        await recorder.request(client, "GET /products/", "GET", "/products/", params={"limit": 50})
+    elif roll < 0.70:
+        await recorder.request(client, "GET /customers/{id}", "GET", f"/customers/{rng.choice(data.customers)}")
+    elif roll < 0.75:
+        await recorder.request(client, "GET /customers/", "GET", "/customers/", params={"limit": 50})
+    elif roll < 0.83:
+        await recorder.request(client, "GET /orders/{id}", "GET", f"/orders/{rng.choice(data.orders)}")
+    elif roll < 0.90:
+        await recorder.request(client, "GET /orders/", "GET", "/orders/", params={"limit": 50, "sort": "-created_at"})
+    elif roll < 0.94:
+        await recorder.request(
+            client, "GET /orders/customer/{id}", "GET", f"/orders/customer/{rng.choice(data.customers)}",
+            params={"limit": 20}
+        )
+    elif roll < 0.97:
+        await recorder.request(client, "GET /orders/stats", "GET", "/orders/stats")
+    else:
+        await recorder.request(
+            client, "PUT /products/{id}", "PUT", f"/products/{rng.choice(data.products)}",
+            json={"price": round(rng.uniform(1, 200), 2)}
+        )
+
+
+async def order_burst_step(client: httpx.AsyncClient, recorder: Recorder, data: Dataset, rng: random.Random) -> None:
+    response = await recorder.request(
+        client, "POST /orders/", "POST", "/orders/", expected=(201,), json=order_payload(data, rng)
+    )
+    if response.status_code == 201:
+        data.orders.append(response.json()["id"])
+
+
+async def status_contention_step(client: httpx.AsyncClient, recorder: Recorder, data: Dataset, rng: random.Random) -> None:
+    if rng.random() < 0.2:
+        await recorder.request(client, "GET /orders/status/{status}", "GET", "/orders/status/PAID", params={"limit": 50})
+        return
+    # A few hot orders so workers collide; losing a race to a terminal status is a 400
+    order_id = rng.choice(data.orders[:8])
+    await recorder.request(
+        client, "PATCH /orders/{id}/status", "PATCH", f"/orders/{order_id}/status", expected=(200, 400),
+        json={"status": rng.choice(("PAID", "CANCELLED"))}
+    )
+
+
+STEPS = {
+    "catalog": catalog_step,
+    "order-burst": order_burst_step,
+    "status-contention": status_contention_step,
+}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    data: Dataset,
+    requests: int,
+    concurrency: int,
+    seed_value: int
+) -> dict:
+    if name == "status-contention":
+        # Fresh PENDING orders to fight over
+        rng = random.Random(seed_value)
+        hot = []
+        for _ in range(8):
+            response = await client.post("/orders/", json=order_payload(data, rng))
+            response.raise_for_status()
+            hot.append(response.json()["id"])
+        data.orders[:0] = hot
+
+    recorder = Recorder()
+    step = STEPS[name]
+    remaining = requests
+
+    async def worker(worker_id: int) -> None:
+        nonlocal remaining
+        rng = random.Random(seed_value * 1000 + worker_id)
+        while remaining > 0:
+            remaining -= 1
+            await step(client, recorder, data, rng)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(worker_id) for worker_id in range(concurrency)))
+    return recorder.summary(time.perf_counter() - started)
+
+
+def make_mongo(mock: bool):
+    if mock:
+        return mock_client()
+    from motor.motor_asyncio import AsyncIOMotorClient
+    return AsyncIOMotorClient(settings.mongodb_url)
+
+
+async def run(args) -> dict:
+    mongo = database = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30)
+    else:
+        from beanie import init_beanie
+        from app.core.database import DOCUMENT_MODELS
+
+        mongo = make_mongo(args.mock)
+        database = mongo[f"{settings.database_name}_load"]
+        await mongo.drop_database(database.name)
+        await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=30)
+
+    rng = random.Random(args.seed)
+    try:
+        data = await seed(client, args.customers, args.products, args.orders, rng)
+        results = {}
+        for name in args.scenario or SCENARIOS:
+            # Untimed warm-up so the first scenario doesn't pay for cold paths
+            await run_scenario(client, name, data, min(args.requests // 10, 200), args.concurrency, args.seed + 1)
+            results[name] = await run_scenario(client, name, data, args.requests, args.concurrency, args.seed)
+            print_scenario(name, results[name])
+    finally:
+        await client.aclose()
+        if mongo is not None:
+            await mongo.drop_database(database.name)
+            mongo.close()
+
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "target": args.url or ("asgi+mongomock" if args.mock else "asgi+mongodb"),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+
+
+def print_scenario(name: str, result: dict) -> None:
+    print(f"\n{name}: {result['requests']} requests in {result['duration_seconds']:.2f}s "
+          f"({result['throughput_rps']:.0f} req/s)")
+    print(f"  {'route':<30} {'count':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'unexpected':>10}")
+    for route, stats in result["routes"].items():
+        print(
+            f"  {route:<30} {stats['requests']:>6} {stats['throughput_rps']:>8.0f} {stats['p50_ms']:>8.2f} "
+            f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['unexpected_statuses']:>10}"
+        )
+
+
+def compare(results: dict, baseline: dict, max_regression: float | None) -> bool:
+    """Print per-route changes against a baseline; False if a p95 regressed past max_regression."""
+    ok = True
+    print(f"\nagainst baseline ({baseline['meta']['started_at']}, {baseline['meta']['target']}):")
+    print(f"  {'scenario / route':<50} {'p95 ms':>17} {'change':>8} {'req/s change':>13}")
+    for name, result in results["scenarios"].items():
+        for route, stats in result["routes"].items():
+            before = baseline["scenarios"].get(name, {}).get("routes", {}).get(route)
+            if before is None:
+                print(f"  {name + ' ' + route:<50} {'new':>17}")
+                continue
+            change = stats["p95_ms"] / before["p95_ms"] - 1
+            throughput_change = stats["throughput_rps"] / before["throughput_rps"] - 1
+            regressed = max_regression is not None and change > max_regression
+            ok = ok and not regressed
+            print(
+                f"  {name + ' ' + route:<50} {before['p95_ms']:>7.2f} -> {stats['p95_ms']:>7.2f} "
+                f"{change:>+8.1%} {throughput_change:>+13.1%}{'  REGRESSION' if regressed else ''}"
+            )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--mock", action="store_true", help="Use mongomock-motor instead of MONGODB_URL")
+    target.add_argument("--url", help="Send requests to a running server instead of the in-process app")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Run only these scenarios")
+    parser.add_argument("--requests", type=int, default=2000, help="Timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent workers")
+    parser.add_argument("--customers", type=int, default=50)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--orders", type=int, default=500, help="Orders seeded before the scenarios")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float, help="Fail when a p95 grew by more than this fraction")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            if not compare(results, json.load(baseline), args.max_regression):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
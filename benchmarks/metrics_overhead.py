@@ -0,0 +1,170 @@
+"""
+Measure what the Prometheus collectors add to POST /orders/.
+
+The same app is driven through httpx.ASGITransport with and without
+MetricsMiddleware, alternating rounds so drift affects both equally. That
+difference is within run-to-run noise, so the collectors are also timed in
+isolation: the middleware around a no-op ASGI app, and the pymongo listener
+callbacks one command triggers (the mock client fires none). Their sum
+against the baseline request time is the reported overhead.
+
+Usage: python -m benchmarks.metrics_overhead [--mock] [--requests 200] [--rounds 15]
+
+--mock runs against mongomock-motor (pip install mongomock-motor) instead
+of the server at MONGODB_URL.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import timedelta
+
+import httpx
+from beanie import init_beanie
+from pymongo.monitoring import (
+    CommandStartedEvent, CommandSucceededEvent, ConnectionCheckOutStartedEvent,
+    ConnectionCheckedInEvent, ConnectionCheckedOutEvent
+)
+
+from app.core.config import settings
+from app.core.database import DOCUMENT_MODELS
+from app.core.metrics import MetricsRegistry
+from app.core.middleware import MetricsMiddleware
+from app.core.mongo_metrics import CommandMetrics, PoolMetrics
+from app.main import app
+from app.models.customer import Customer
+from app.models.product import Product
+from benchmarks.mock import mock_client
+
+# Commands behind one order: customer and product reads, the insert and the rollup upsert
+COMMANDS_PER_ORDER = 4
+
+
+def make_client(mock: bool):
+    if mock:
+        return mock_client()
+    from motor.motor_asyncio import AsyncIOMotorClient
+    return AsyncIOMotorClient(settings.mongodb_url)
+
+
+def build_stacks():
+    """ASGI apps with and without the metrics middleware, otherwise identical."""
+    instrumented = app.build_middleware_stack()
+    user_middleware = app.user_middleware
+    app.user_middleware = [m for m in user_middleware if m.cls is not MetricsMiddleware]
+    baseline = app.build_middleware_stack()
+    app.user_middleware = user_middleware
+    return baseline, instrumented
+
+
+async def create_orders(client: httpx.AsyncClient, payload: dict, count: int) -> float:
+    """Seconds per request over count sequential POST /orders/."""
+    started = time.perf_counter()
+    for _ in range(count):
+        response = await client.post("/orders/", json=payload)
+        assert response.status_code == 201, response.text
+    return (time.perf_counter() - started) / count
+
+
+def middleware_seconds_per_request(samples: int = 20000) -> float:
+    """Time MetricsMiddleware around an app that answers immediately."""
+    async def noop(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    async def drive(asgi_app) -> float:
+        started = time.perf_counter()
+        for _ in range(samples):
+            scope = {"type": "http", "method": "POST", "path": "/orders/"}
+            await asgi_app(scope, receive, send)
+        return time.perf_counter() - started
+
+    async def compare() -> float:
+        bare = await drive(noop)
+        wrapped = await drive(MetricsMiddleware(noop, MetricsRegistry()))
+        return (wrapped - bare) / samples
+
+    return asyncio.run(compare())
+
+
+def listener_seconds_per_command(samples: int = 20000) -> float:
+    """Time the command and pool listener callbacks one command triggers."""
+    commands, pool = CommandMetrics(), PoolMetrics()
+    address = ("localhost", 27017)
+    command = {"insert": "orders", "documents": []}
+    started_event = CommandStartedEvent(command, "bench", 1, address, 1)
+    succeeded_event = CommandSucceededEvent(timedelta(microseconds=800), {"ok": 1}, "insert", 1, address, 1)
+    checkout_started = ConnectionCheckOutStartedEvent(address)
+    checked_out = ConnectionCheckedOutEvent(address, 1, 0.0001)
+    checked_in = ConnectionCheckedInEvent(address, 1)
+
+    started = time.perf_counter()
+    for _ in range(samples):
+        pool.connection_check_out_started(checkout_started)
+        pool.connection_checked_out(checked_out)
+        commands.started(started_event)
+        commands.succeeded(succeeded_event)
+        pool.connection_checked_in(checked_in)
+    return (time.perf_counter() - started) / samples
+
+
+async def run(args) -> tuple[float, float]:
+    mongo = make_client(args.mock)
+    database = mongo[f"{settings.database_name}_bench"]
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    customer = await Customer(name="Bench Customer", email="bench@example.com").insert()
+    product = await Product(name="Bench Product", price=9.99).insert()
+    payload = {"customer_id": str(customer.id), "items": [{"product_id": str(product.id), "quantity": 2}]}
+
+    baseline, instrumented = build_stacks()
+    baseline_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=baseline), base_url="http://bench")
+    instrumented_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=instrumented), base_url="http://bench")
+    try:
+        # Warm both paths up before measuring
+        await create_orders(baseline_client, payload, args.requests // 10 or 1)
+        await create_orders(instrumented_client, payload, args.requests // 10 or 1)
+
+        baseline_times, instrumented_times = [], []
+        for _ in range(args.rounds):
+            baseline_times.append(await create_orders(baseline_client, payload, args.requests))
+            instrumented_times.append(await create_orders(instrumented_client, payload, args.requests))
+    finally:
+        await baseline_client.aclose()
+        await instrumented_client.aclose()
+        await mongo.drop_database(database.name)
+        mongo.close()
+
+    baseline_time = statistics.median(baseline_times)
+    end_to_end = statistics.median(instrumented_times) - baseline_time
+    return baseline_time, end_to_end
+
+
+def report(baseline_time: float, end_to_end: float) -> None:
+    middleware_time = middleware_seconds_per_request()
+    listener_time = listener_seconds_per_command() * COMMANDS_PER_ORDER
+    overhead = (middleware_time + listener_time) / baseline_time
+
+    print(f"POST /orders/ baseline          {baseline_time * 1e6:>9.1f} us/request")
+    print(f"end-to-end difference           {end_to_end * 1e6:>9.1f} us/request (noisy)")
+    print(f"metrics middleware              {middleware_time * 1e6:>9.1f} us/request")
+    print(f"mongo listeners ({COMMANDS_PER_ORDER} commands)     {listener_time * 1e6:>9.1f} us/request")
+    print(f"overhead                        {overhead:>9.2%}  (budget 2%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mock", action="store_true", help="Use mongomock-motor instead of MONGODB_URL")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per round")
+    parser.add_argument("--rounds", type=int, default=15)
+    report(*asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
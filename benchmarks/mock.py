@@ -0,0 +1,33 @@
+"""
+In-memory Mongo for the benchmarks' --mock mode.
+
+pymongo 4.9+ passes a sort argument with every UpdateOne in a bulk write,
+which mongomock's bulk builder doesn't accept, so the order rollup upserts
+would fail. mock_client drops that argument; the benchmarks never sort
+updates, so nothing is lost.
+"""
+
+
+def _accept_update_sort() -> None:
+    import mongomock.collection
+
+    builder = mongomock.collection.BulkOperationBuilder
+    add_update = builder.add_update
+    if getattr(add_update, "accepts_sort", False):
+        return
+
+    def add_update_with_sort(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    add_update_with_sort.accepts_sort = True
+    builder.add_update = add_update_with_sort
+
+
+def mock_client():
+    """A mongomock-motor client that handles the app's bulk writes."""
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("--mock needs mongomock-motor: pip install mongomock-motor")
+    _accept_update_sort()
+    return AsyncMongoMockClient()
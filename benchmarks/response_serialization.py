@@ -0,0 +1,186 @@
+"""
+Compare the validated response path with the trusted fast path per endpoint.
+
+The validated path builds response models through full validation and lets
+FastAPI validate them again against the response_model before encoding,
+which is what the routes did before. The fast path builds them without
+validation and encodes them once with a compiled TypeAdapter.
+
+Usage: python -m benchmarks.response_serialization [--page-size 1000] [--items 3]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from beanie import PydanticObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import model_list_response, model_response
+from app.customer.schemas.customer import CustomerResponse
+from app.customer.serializers.serializer import CustomerSerializer
+from app.models.customer import Customer
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.order.schemas.order import OrderItemResponse, OrderResponse
+from app.order.serializers.serializer import OrderSerializer
+from app.product.schemas.product import ProductResponse
+from app.product.serializers.serializer import ProductSerializer
+
+
+# Documents are built with model_construct because Beanie refuses to
+# instantiate documents before init_beanie, which needs a live server.
+
+def make_orders(count: int, items: int) -> list[Order]:
+    now = datetime.utcnow()
+    orders = []
+    for index in range(count):
+        order_items = [
+            OrderItem(product_id=str(PydanticObjectId()), product_name=f"Product {item}", quantity=item + 1, unit_price=9.99)
+            for item in range(items)
+        ]
+        total_price_cents = sum(item.total_price_cents for item in order_items)
+        orders.append(Order.model_construct(
+            id=PydanticObjectId(),
+            customer_id=str(PydanticObjectId()),
+            customer_name=f"Customer {index}",
+            customer_email=f"customer{index}@example.com",
+            items=order_items,
+            status=OrderStatus.PENDING,
+            total_price=total_price_cents / 100,
+            total_price_cents=total_price_cents,
+            created_at=now,
+            updated_at=now,
+        ))
+    return orders
+
+
+def make_products(count: int) -> list[Product]:
+    now = datetime.utcnow()
+    return [
+        Product.model_construct(id=PydanticObjectId(), name=f"Product {index}", price=19.99, created_at=now, updated_at=now)
+        for index in range(count)
+    ]
+
+
+def make_customers(count: int) -> list[Customer]:
+    now = datetime.utcnow()
+    return [
+        Customer.model_construct(
+            id=PydanticObjectId(), name=f"Customer {index}", email=f"customer{index}@example.com",
+            created_at=now, updated_at=now
+        )
+        for index in range(count)
+    ]
+
+
+def validated_order(order: Order) -> OrderResponse:
+    """Build an order response the way the serializer did before the fast path."""
+    return OrderResponse(
+        id=str(order.id),
+        customer_id=order.customer_id,
+        customer_name=order.customer_name,
+        customer_email=order.customer_email,
+        items=[
+            OrderItemResponse(
+                product_id=item.product_id,
+                product_name=item.product_name,
+                quantity=item.quantity,
+                unit_price=item.unit_price,
+                total_price=item.total_price
+            )
+            for item in order.items
+        ],
+        status=order.status,
+        total_price=order.total_price,
+        created_at=order.created_at,
+        updated_at=order.updated_at
+    )
+
+
+def validated_product(product: Product) -> ProductResponse:
+    return ProductResponse(
+        id=str(product.id),
+        name=product.name,
+        price=product.price,
+        created_at=product.created_at,
+        updated_at=product.updated_at
+    )
+
+
+def validated_customer(customer: Customer) -> CustomerResponse:
+    return CustomerResponse(
+        id=str(customer.id),
+        name=customer.name,
+        email=customer.email,
+        created_at=customer.created_at,
+        updated_at=customer.updated_at
+    )
+
+
+async def validated_body(build, documents, response_model, many: bool) -> bytes:
+    """Build, re-validate against response_model and encode, as FastAPI does for returned models."""
+    content = [build(document) for document in documents] if many else build(documents[0])
+    field = create_model_field(name="response", type_=response_model, mode="serialization")
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+def fast_body(serializer, documents, model, many: bool) -> bytes:
+    if many:
+        return model_list_response(serializer.build_list(documents), model).body
+    return model_response(serializer.build(documents[0])).body
+
+
+def measure(run, rounds: int) -> float:
+    """Median seconds per call."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=3, help="Items per order")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    orders = make_orders(args.page_size, args.items)
+    products = make_products(args.page_size)
+    customers = make_customers(args.page_size)
+
+    endpoints = [
+        ("GET /orders/", validated_order, OrderSerializer(), orders, OrderResponse, True),
+        ("GET /orders/{id}", validated_order, OrderSerializer(), orders, OrderResponse, False),
+        ("GET /products/", validated_product, ProductSerializer(), products, ProductResponse, True),
+        ("GET /customers/", validated_customer, CustomerSerializer(), customers, CustomerResponse, True),
+    ]
+
+    loop = asyncio.new_event_loop()
+    print(f"{'endpoint':<20} {'validated ms':>13} {'fast ms':>10} {'speedup':>8}  identical")
+    for name, build, serializer, documents, model, many in endpoints:
+        response_model = list[model] if many else model
+        validated = loop.run_until_complete(validated_body(build, documents, response_model, many))
+        fast = fast_body(serializer, documents, model, many)
+
+        slow_time = measure(
+            lambda: loop.run_until_complete(validated_body(build, documents, response_model, many)),
+            args.rounds
+        )
+        fast_time = measure(lambda: fast_body(serializer, documents, model, many), args.rounds)
+        print(
+            f"{name:<20} {slow_time * 1000:>13.3f} {fast_time * 1000:>10.3f} "
+            f"{slow_time / fast_time:>7.1f}x  {validated == fast}"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
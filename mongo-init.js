@@ -5,12 +5,20 @@ db = db.getSiblingDB('order_management');
 db.createCollection('customers');
 db.createCollection('products');
 db.createCollection('orders');
+db.createCollection('order_rollups');
+db.createCollection('idempotency_keys');
 
-// Create indexes
+// Create indexes (keep in sync with the Settings.indexes of app/models)
 db.customers.createIndex({ "email": 1 }, { unique: true });
 db.products.createIndex({ "name": 1 });
-db.orders.createIndex({ "customer_id": 1 });
-db.orders.createIndex({ "status": 1 });
-db.orders.createIndex({ "created_at": 1 });
+db.products.createIndex({ "updated_at": 1 });
+db.orders.createIndex({ "created_at": 1, "_id": 1 });
+db.orders.createIndex({ "customer_id": 1, "created_at": 1, "_id": 1 });
+db.orders.createIndex({ "status": 1, "created_at": 1, "_id": 1 });
+db.orders.createIndex({ "total_price_cents": 1, "_id": 1 });
+db.orders.createIndex({ "items.product_id": 1 });
+db.order_rollups.createIndex({ "day": 1, "status": 1 }, { unique: true });
+db.idempotency_keys.createIndex({ "key": 1 }, { unique: true });
+db.idempotency_keys.createIndex({ "created_at": 1 }, { expireAfterSeconds: 86400 });
 
 print('Database initialized successfully');
@@ -109,6 +109,20 @@ class TestCustomerEndpoints:
         
         assert response.status_code == NOT_FOUND_CODE
 
+    async def test_update_customer_keep_own_email(self, async_client: AsyncClient, sample_customer):
+        update_data = {
+            "name": "Renamed Customer",
+            "email": sample_customer.email
+        }
+        
+        response = await async_client.put(f"/customers/{sample_customer.id}", json=update_data)
+        
+        assert response.status_code == SUCCESS_CODE
+        data = response.json()
+        assert data["name"] == update_data["name"]
+        assert data["email"] == sample_customer.email
+        assert data["created_at"].startswith(sample_customer.created_at.isoformat()[:19])
+
     async def test_update_customer_duplicate_email(self, async_client: AsyncClient, multiple_customers):
         customer1, customer2 = multiple_customers[0], multiple_customers[1]
         update_data = {
@@ -0,0 +1,184 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from pymongo.monitoring import (
+    CommandStartedEvent, CommandSucceededEvent, ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutStartedEvent, ConnectionCheckedInEvent, ConnectionCheckedOutEvent, ConnectionCreatedEvent
+)
+
+from app.core.config import settings
+from app.core.database import db, warm_pool
+from app.core.metrics import registry
+from app.core import readiness as readiness_module
+from app.core.mongo_metrics import CommandMetrics, PoolMetrics
+from app.core.readiness import Readiness
+from app.core.slow_queries import SlowQueryRecorder, summarize_explain, trace_operations
+from tests.constants import *
+
+
+@pytest.mark.asyncio
+class TestInternalEndpoints:
+
+    async def test_mongo_stats_report_pool_saturation(self, async_client: AsyncClient, monkeypatch):
+        pool_metrics = PoolMetrics(max_pool_size=2)
+        monkeypatch.setattr(db, "pool_metrics", pool_metrics)
+        monkeypatch.setattr(db, "command_metrics", CommandMetrics())
+        address = ("localhost", 27017)
+        
+        for connection_id in (1, 2):
+            pool_metrics.connection_created(ConnectionCreatedEvent(address, connection_id))
+            pool_metrics.connection_check_out_started(ConnectionCheckOutStartedEvent(address))
+            pool_metrics.connection_checked_out(ConnectionCheckedOutEvent(address, connection_id, 0.001))
+        pool_metrics.connection_check_out_started(ConnectionCheckOutStartedEvent(address))
+        pool_metrics.connection_check_out_started(ConnectionCheckOutStartedEvent(address))
+        pool_metrics.connection_check_out_failed(ConnectionCheckOutFailedEvent(address, "timeout", 2.0))
+        pool_metrics.connection_checked_in(ConnectionCheckedInEvent(address, 1))
+        
+        response = await async_client.get("/internal/mongo")
+        
+        assert response.status_code == SUCCESS_CODE
+        pool = response.json()["pool"]
+        assert pool["open_connections"] == 2
+        assert pool["checked_out"] == 1
+        assert pool["waiting"] == 1
+        assert pool["checkouts"] == 2
+        assert pool["checkout_failures"] == {"timeout": 1}
+        assert pool["wait_seconds_max"] == 2.0
+
+    async def test_mongo_stats_unavailable_before_connect(self, async_client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(db, "pool_metrics", None)
+        
+        response = await async_client.get("/internal/mongo")
+        
+        assert response.status_code == SERVICE_UNAVAILABLE_CODE
+
+    async def test_metrics_by_route_template_and_collection(self, async_client: AsyncClient, monkeypatch, sample_product):
+        command_metrics = CommandMetrics()
+        # Expose it for this test only; the app's histogram is put back afterwards
+        monkeypatch.setitem(registry._metrics, command_metrics.latency.name, command_metrics.latency)
+        address = ("localhost", 27017)
+        command_metrics.started(CommandStartedEvent({"find": "products", "filter": {}}, "test", 7, address, 1))
+        command_metrics.succeeded(CommandSucceededEvent(timedelta(milliseconds=3), {"ok": 1}, "find", 7, address, 1))
+        
+        await async_client.get(f"/products/{sample_product.id}")
+        response = await async_client.get("/metrics")
+        
+        assert response.status_code == SUCCESS_CODE
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_request_duration_seconds_count{method="GET",route="/products/{product_id}",status="200"}' in response.text
+        assert str(sample_product.id) not in response.text
+        assert "http_requests_in_flight 1" in response.text
+        assert (
+            'mongodb_command_duration_seconds_bucket{collection="products",command="find",outcome="succeeded",le="0.005"} 1'
+            in response.text
+        )
+        assert command_metrics.stats().by_command == {"find": 1}
+
+    async def test_slow_queries_record_operation_and_shape(self, async_client: AsyncClient, monkeypatch):
+        recorder = SlowQueryRecorder(threshold_ms=50, size=2, explain_sample_rate=0)
+        monkeypatch.setattr(db, "slow_queries", recorder)
+        address = ("localhost", 27017)
+
+        @trace_operations
+        class OrderLookups:
+            async def by_customer(self, request_id: int, customer_id: str, duration_ms: int):
+                command = {"find": "orders", "filter": {"customer_id": customer_id, "status": {"$in": ["pending"]}}}
+                recorder.started(CommandStartedEvent(command, "shop", request_id, address, 1))
+                recorder.succeeded(CommandSucceededEvent(
+                    timedelta(milliseconds=duration_ms), {"ok": 1}, "find", request_id, address, 1
+                ))
+
+        lookups = OrderLookups()
+        await lookups.by_customer(1, "a", 120)
+        await lookups.by_customer(2, "b", 5)
+        await lookups.by_customer(3, "c", 80)
+        await lookups.by_customer(4, "d", 60)
+
+        response = await async_client.get("/internal/slow-queries")
+
+        assert response.status_code == SUCCESS_CODE
+        records = response.json()
+        assert [record["duration_ms"] for record in records] == [60, 80]
+        assert records[0]["operation"] == "OrderLookups.by_customer"
+        assert records[0]["collection"] == "orders"
+        assert records[0]["shape"] == {"filter": {"customer_id": "?", "status": {"$in": "?"}}}
+
+    async def test_explain_summary_flags_collection_scans(self):
+        explain = {
+            "queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}},
+            "executionStats": {"nReturned": 2, "totalDocsExamined": 5000, "totalKeysExamined": 0}
+        }
+
+        plan = summarize_explain(explain, ratio_threshold=100)
+
+        assert plan.stages == ["SORT", "COLLSCAN"]
+        assert plan.flags == ["COLLSCAN", "HIGH_DOCS_EXAMINED_RATIO"]
+
+    async def test_warm_pool_fails_until_min_pool_size_connections_open(self, monkeypatch):
+        pool_metrics = PoolMetrics(min_pool_size=2)
+        monkeypatch.setattr(db, "pool_metrics", pool_metrics)
+        monkeypatch.setattr(settings, "mongo_min_pool_size", 2)
+        address = ("localhost", 27017)
+
+        async def ping(command):
+            return {"ok": 1}
+
+        # Every ping is served by the single connection the pool managed to open
+        monkeypatch.setattr(db, "client", SimpleNamespace(admin=SimpleNamespace(command=ping)))
+        pool_metrics.connection_created(ConnectionCreatedEvent(address, 1))
+
+        with pytest.raises(RuntimeError, match="1 of 2 connections open"):
+            await warm_pool()
+
+        pool_metrics.connection_created(ConnectionCreatedEvent(address, 2))
+        assert await warm_pool() == "2 connections open"
+
+    async def test_ready_only_after_warm_up_while_health_stays_live(self, async_client: AsyncClient, monkeypatch):
+        probe = Readiness(ping_interval_seconds=60)
+        monkeypatch.setattr(readiness_module, "readiness", probe)
+        warm_up_done = asyncio.Event()
+        pings = 0
+
+        async def ping():
+            nonlocal pings
+            pings += 1
+
+        async def warm_pool():
+            await warm_up_done.wait()
+            return "pool warmed"
+
+        probe.start(ping, [("pool_warmed", warm_pool)])
+
+        not_ready = await async_client.get("/ready")
+        health = await async_client.get("/health")
+        warm_up_done.set()
+        await probe._task
+        ready = [await async_client.get("/ready") for _ in range(3)]
+
+        assert not_ready.status_code == SERVICE_UNAVAILABLE_CODE
+        assert not_ready.json()["steps"] == [{"name": "pool_warmed", "done": False, "detail": None}]
+        assert health.status_code == SUCCESS_CODE
+        assert [response.status_code for response in ready] == [SUCCESS_CODE] * 3
+        assert ready[0].json()["ping"]["ok"] is True
+        assert pings == 1
+
+    async def test_ready_unavailable_when_ping_fails(self, async_client: AsyncClient, monkeypatch):
+        probe = Readiness(ping_interval_seconds=0, ping_timeout_seconds=0.01)
+        monkeypatch.setattr(readiness_module, "readiness", probe)
+
+        async def unreachable():
+            await asyncio.sleep(1)
+
+        async def no_op():
+            return None
+
+        probe.start(unreachable, [("pool_warmed", no_op)])
+        await probe._task
+
+        response = await async_client.get("/ready")
+
+        assert response.status_code == SERVICE_UNAVAILABLE_CODE
+        assert response.json()["ping"]["ok"] is False
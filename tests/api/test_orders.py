@@ -1,6 +1,27 @@
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
-from app.models.order import OrderStatus
+from pymongo import ASCENDING
+from app.commands.backfill_order_totals import backfill_order_totals
+from app.container.containers import container
+from app.container.dependencies import get_order_service
+from app.core.config import settings
+from app.core.idempotency import IdempotencyStore, StoredResponse, request_fingerprint
+from app.core.indexes import IndexState, drifted_indexes, ensure_indexes, index_drift
+from app.core.pagination import encode_cursor
+from app.models.idempotency_key import IdempotencyKey
+from app.models.order import Order, OrderStatus
+from app.models.order_rollup import OrderRollup
+from app.order.repositories.idempotency import IdempotencyKeyRepository
+from app.order.repositories.rollup import OrderRollupRepository
+from app.order.schemas.order import OrderCreate, OrderEventType
+from app.product.repositories.repository import ProductRepository
 from tests.constants import *
 
 @pytest.mark.asyncio
@@ -81,6 +102,249 @@ class TestOrderEndpoints:
         
         assert response.status_code == NOT_FOUND_CODE
 
+    async def test_create_order_idempotency_key_replay(self, async_client: AsyncClient, mongo_db, sample_customer, sample_product):
+        order_data = {
+            "customer_id": str(sample_customer.id),
+            "items": [{"product_id": str(sample_product.id), "quantity": 1}]
+        }
+        headers = {"Idempotency-Key": "replay-key"}
+
+        response = await async_client.post("/orders/", json=order_data, headers=headers)
+        assert response.status_code == CREATED_CODE
+
+        # A replay must not read the product again, from the front cache or from the store
+        await mongo_db.products.delete_one({"_id": sample_product.id})
+        cached_replay = await async_client.post("/orders/", json=order_data, headers=headers)
+        get_order_service().idempotency_store._cache.clear()
+        stored_replay = await async_client.post("/orders/", json=order_data, headers=headers)
+
+        assert cached_replay.status_code == CREATED_CODE
+        assert stored_replay.status_code == CREATED_CODE
+        assert cached_replay.json() == response.json()
+        assert stored_replay.json() == response.json()
+        assert await mongo_db.orders.count_documents({"customer_id": str(sample_customer.id)}) == 1
+
+        await mongo_db.orders.delete_many({"customer_id": str(sample_customer.id)})
+
+    async def test_create_order_idempotency_key_concurrent_and_reused(self, async_client: AsyncClient, mongo_db, sample_customer, sample_product):
+        order_data = {
+            "customer_id": str(sample_customer.id),
+            "items": [{"product_id": str(sample_product.id), "quantity": 2}]
+        }
+        headers = {"Idempotency-Key": "concurrent-key"}
+
+        responses = await asyncio.gather(*[
+            async_client.post("/orders/", json=order_data, headers=headers) for _ in range(3)
+        ])
+        reused = await async_client.post(
+            "/orders/",
+            json={**order_data, "items": [{"product_id": str(sample_product.id), "quantity": 3}]},
+            headers=headers
+        )
+
+        assert [response.status_code for response in responses] == [CREATED_CODE] * 3
+        assert len({response.json()["id"] for response in responses}) == 1
+        assert reused.status_code == VALIDATION_ERROR_CODE
+        assert await mongo_db.orders.count_documents({"customer_id": str(sample_customer.id)}) == 1
+
+        await mongo_db.orders.delete_many({"customer_id": str(sample_customer.id)})
+
+    async def test_create_order_idempotency_key_taken_over_after_lease_expires(
+        self, async_client: AsyncClient, mongo_db, sample_customer, sample_product
+    ):
+        order_data = {
+            "customer_id": str(sample_customer.id),
+            "items": [{"product_id": str(sample_product.id), "quantity": 1}]
+        }
+        # A holder that died after reserving the key, long enough ago for its lease to run out
+        stale = datetime.utcnow() - timedelta(seconds=settings.idempotency_lease_seconds + 1)
+        await mongo_db.idempotency_keys.insert_one({
+            "key": "abandoned-key",
+            "request_hash": request_fingerprint(OrderCreate(**order_data)),
+            "status_code": None,
+            "response": None,
+            "reserved_at": stale,
+            "created_at": stale,
+        })
+
+        response = await async_client.post("/orders/", json=order_data, headers={"Idempotency-Key": "abandoned-key"})
+
+        assert response.status_code == CREATED_CODE
+        record = await mongo_db.idempotency_keys.find_one({"key": "abandoned-key"})
+        assert record["status_code"] == CREATED_CODE
+        
+        await mongo_db.orders.delete_many({"customer_id": str(sample_customer.id)})
+
+    async def test_idempotency_key_lease_lost_to_take_over(self, mongo_db):
+        repository = IdempotencyKeyRepository()
+        stale = datetime(2024, 1, 1)
+        current = datetime(2024, 1, 1, 0, 5)
+        await repository.reserve("lease-key", "hash", stale)
+        assert await repository.take_over("lease-key", datetime(2024, 1, 1, 0, 1), current)
+        
+        # The previous holder finishing late must not touch the new holder's reservation
+        assert not await repository.complete("lease-key", stale, CREATED_CODE, {"id": "late"})
+        assert not await repository.release("lease-key", stale)
+        record = await repository.get("lease-key")
+        assert record.status_code is None
+        assert record.reserved_at == current
+        
+        assert await repository.complete("lease-key", current, CREATED_CODE, {"id": "current"})
+        assert (await repository.get("lease-key")).response == {"id": "current"}
+        await mongo_db.idempotency_keys.delete_many({"key": "lease-key"})
+
+    async def test_idempotency_duplicates_retry_when_first_attempt_is_cancelled(self, mongo_db):
+        store = IdempotencyStore(IdempotencyKeyRepository())
+        started = asyncio.Event()
+
+        async def hanging_operation():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def operation():
+            return StoredResponse(status_code=CREATED_CODE, body={"attempt": 2})
+
+        first = asyncio.create_task(store.run("cancelled-key", "hash", hanging_operation))
+        await started.wait()
+        duplicate = asyncio.create_task(store.run("cancelled-key", "hash", operation))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        result = await duplicate
+
+        assert result.body == {"attempt": 2}
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await mongo_db.idempotency_keys.delete_many({"key": "cancelled-key"})
+
+    async def test_create_order_uses_product_catalog(self, async_client: AsyncClient, mongo_db, sample_customer, sample_product):
+        catalog = container.product.product_catalog()
+        await catalog.load()
+        order_data = {
+            "customer_id": str(sample_customer.id),
+            "items": [{"product_id": str(sample_product.id), "quantity": 1}]
+        }
+        try:
+            hits = catalog.hits
+            response = await async_client.post("/orders/", json=order_data)
+            assert response.status_code == CREATED_CODE
+            assert catalog.hits == hits + 1
+            
+            # Writes through the API update the snapshot right away
+            await async_client.put(f"/products/{sample_product.id}", json={"price": 10.0})
+            response = await async_client.post("/orders/", json=order_data)
+            assert response.json()["items"][0]["unit_price"] == 10.0
+            
+            # Writes made elsewhere show up after the next refresh
+            await mongo_db.products.update_one(
+                {"_id": sample_product.id},
+                {"$set": {"price": 12.0, "updated_at": datetime.utcnow()}}
+            )
+            await catalog.refresh()
+            response = await async_client.post("/orders/", json=order_data)
+            assert response.json()["items"][0]["unit_price"] == 12.0
+            
+            stats = (await async_client.get("/products/catalog/stats")).json()
+            assert stats["ready"] is True
+            assert stats["hits"] == hits + 3
+            assert stats["staleness_seconds"] is not None
+        finally:
+            await catalog.stop()
+            await mongo_db.orders.delete_many({"customer_id": str(sample_customer.id)})
+
+    async def test_catalog_refresh_drops_products_deleted_by_other_processes(
+        self, async_client: AsyncClient, monkeypatch, mongo_db, sample_customer, sample_product
+    ):
+        catalog = container.product.product_catalog()
+        await catalog.load()
+        try:
+            # A repository without the snapshot stands in for another worker
+            assert await ProductRepository().delete(str(sample_product.id))
+            
+            async def reconcile():
+                raise AssertionError("refresh scanned every product ID")
+            monkeypatch.setattr(catalog, "reconcile", reconcile)
+            await catalog.refresh()
+            
+            assert catalog.lookup([sample_product.id]) == ([], [sample_product.id])
+            response = await async_client.post("/orders/", json={
+                "customer_id": str(sample_customer.id),
+                "items": [{"product_id": str(sample_product.id), "quantity": 1}]
+            })
+            assert response.status_code == BAD_REQUEST_CODE
+        finally:
+            await catalog.stop()
+
+    async def test_catalog_reconcile_drops_products_deleted_outside_the_api(
+        self, async_client: AsyncClient, mongo_db, sample_product
+    ):
+        catalog = container.product.product_catalog()
+        await catalog.load()
+        try:
+            # One insert and one delete between polls keep the count unchanged
+            inserted = await mongo_db.products.insert_one({
+                "name": "Other Product", "price": 5.0,
+                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()
+            })
+            await mongo_db.products.delete_one({"_id": sample_product.id})
+            
+            await catalog.refresh()
+            assert catalog.lookup([sample_product.id])[0] != []
+            assert await catalog.reconcile() == 1
+            
+            found, missing = catalog.lookup([sample_product.id, inserted.inserted_id])
+            assert [product.id for product in found] == [inserted.inserted_id]
+            assert missing == [sample_product.id]
+        finally:
+            await catalog.stop()
+            await mongo_db.products.delete_one({"_id": inserted.inserted_id})
+
+    async def test_create_order_reads_run_concurrently(self, monkeypatch, mongo_db, sample_customer, sample_product):
+        read_delay = 0.05
+        order_service = get_order_service()
+        
+        def delayed(read):
+            async def wrapper(*args, **kwargs):
+                await asyncio.sleep(read_delay)
+                return await read(*args, **kwargs)
+            return wrapper
+        
+        monkeypatch.setattr(order_service.customer_repository, "get_by_id", delayed(order_service.customer_repository.get_by_id))
+        monkeypatch.setattr(order_service.product_repository, "get_by_ids", delayed(order_service.product_repository.get_by_ids))
+        order_data = OrderCreate(
+            customer_id=str(sample_customer.id),
+            items=[{"product_id": str(sample_product.id), "quantity": 1}]
+        )
+        
+        latencies = []
+        for _ in range(10):
+            started = time.perf_counter()
+            await order_service.create_order(order_data)
+            latencies.append(time.perf_counter() - started)
+        
+        # Sequential reads would take at least the sum of both delays
+        assert statistics.median(latencies) < 2 * read_delay
+        
+        await mongo_db.orders.delete_many({"customer_id": str(sample_customer.id)})
+
+    async def test_list_orders_by_customer_not_found_cancels_order_read(self, monkeypatch):
+        order_service = get_order_service()
+        order_read = asyncio.Event()
+        
+        async def slow_order_read(*args, **kwargs):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                order_read.set()
+                raise
+        
+        monkeypatch.setattr(order_service.repository, "get_by_customer_id", slow_order_read)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await order_service.get_orders_by_customer_id("507f1f77bcf86cd799439011")
+        assert exc_info.value.status_code == NOT_FOUND_CODE
+        assert order_read.is_set()
+
     async def test_create_order_invalid_product(self, async_client: AsyncClient, sample_customer):
         order_data = {
             "customer_id": str(sample_customer.id),
@@ -111,6 +375,87 @@ class TestOrderEndpoints:
         
         assert response.status_code == VALIDATION_ERROR_CODE
 
+    async def test_create_orders_bulk_success(self, async_client: AsyncClient, sample_customer, multiple_products):
+        bulk_data = {
+            "orders": [
+                {
+                    "customer_id": str(sample_customer.id),
+                    "items": [{"product_id": str(product.id), "quantity": 2}]
+                }
+                for product in multiple_products
+            ]
+        }
+        
+        response = await async_client.post("/orders/bulk", json=bulk_data)
+        
+        assert response.status_code == CREATED_CODE
+        data = response.json()
+        assert data["created"] == len(multiple_products)
+        assert data["failed"] == 0
+        for index, result in enumerate(data["results"]):
+            assert result["index"] == index
+            assert result["status_code"] == CREATED_CODE
+            assert result["order"]["items"][0]["product_id"] == str(multiple_products[index].id)
+            assert result["order"]["total_price"] == 2 * multiple_products[index].price
+        
+        for result in data["results"]:
+            get_response = await async_client.get(f"/orders/{result['order']['id']}")
+            assert get_response.status_code == SUCCESS_CODE
+
+    async def test_create_orders_bulk_partial_failure(self, async_client: AsyncClient, sample_customer, sample_product):
+        bulk_data = {
+            "orders": [
+                {
+                    "customer_id": str(sample_customer.id),
+                    "items": [{"product_id": str(sample_product.id), "quantity": 1}]
+                },
+                {
+                    "customer_id": "507f1f77bcf86cd799439011",  # Non-existent customer
+                    "items": [{"product_id": str(sample_product.id), "quantity": 1}]
+                },
+                {
+                    "customer_id": str(sample_customer.id),
+                    "items": [{"product_id": "invalid-id", "quantity": 1}]
+                }
+            ]
+        }
+        
+        response = await async_client.post("/orders/bulk", json=bulk_data)
+        
+        assert response.status_code == MULTI_STATUS_CODE
+        data = response.json()
+        assert data["created"] == 1
+        assert data["failed"] == 2
+        assert data["results"][0]["status_code"] == CREATED_CODE
+        assert data["results"][1]["status_code"] == NOT_FOUND_CODE
+        assert data["results"][1]["order"] is None
+        assert data["results"][2]["status_code"] == BAD_REQUEST_CODE
+        assert "invalid-id" in data["results"][2]["error"]
+
+    async def test_create_orders_bulk_all_failed(self, async_client: AsyncClient, sample_product):
+        bulk_data = {
+            "orders": [
+                {
+                    "customer_id": "507f1f77bcf86cd799439011",  # Non-existent customer
+                    "items": [{"product_id": str(sample_product.id), "quantity": quantity}]
+                }
+                for quantity in (1, 2)
+            ]
+        }
+        
+        response = await async_client.post("/orders/bulk", json=bulk_data)
+        
+        assert response.status_code == NOT_FOUND_CODE
+        data = response.json()
+        assert data["created"] == 0
+        assert data["failed"] == 2
+        assert [result["status_code"] for result in data["results"]] == [NOT_FOUND_CODE] * 2
+
+    async def test_create_orders_bulk_empty(self, async_client: AsyncClient):
+        response = await async_client.post("/orders/bulk", json={"orders": []})
+        
+        assert response.status_code == VALIDATION_ERROR_CODE
+
     async def test_get_order_success(self, async_client: AsyncClient, sample_order):
         response = await async_client.get(f"/orders/{sample_order.id}")
         
@@ -121,6 +466,27 @@ class TestOrderEndpoints:
         assert data["status"] == sample_order.status
         assert len(data["items"]) == len(sample_order.items)
 
+    async def test_get_order_conditional(self, async_client: AsyncClient, sample_order):
+        response = await async_client.get(f"/orders/{sample_order.id}")
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+        
+        response = await async_client.get(f"/orders/{sample_order.id}", headers={"If-None-Match": etag})
+        assert response.status_code == NOT_MODIFIED_CODE
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        
+        await async_client.patch(f"/orders/{sample_order.id}/status", json={"status": OrderStatus.PAID})
+        response = await async_client.get(f"/orders/{sample_order.id}", headers={"If-None-Match": etag})
+        assert response.status_code == SUCCESS_CODE
+        assert response.json()["status"] == OrderStatus.PAID
+        assert response.headers["ETag"] != etag
+
+    async def test_get_order_not_modified_requires_existing_order(self, async_client: AsyncClient):
+        response = await async_client.get("/orders/507f1f77bcf86cd799439011", headers={"If-None-Match": "*"})
+        
+        assert response.status_code == NOT_FOUND_CODE
+
     async def test_get_order_not_found(self, async_client: AsyncClient):
         fake_id = "507f1f77bcf86cd799439011"
         response = await async_client.get(f"/orders/{fake_id}")
@@ -137,6 +503,105 @@ class TestOrderEndpoints:
         assert data[-1]["id"] == str(sample_order.id)
 
 
+    async def test_list_orders_summary_view(self, async_client: AsyncClient, sample_order):
+        response = await async_client.get("/orders/", params={"view": "summary"})
+
+        assert response.status_code == SUCCESS_CODE
+        data = response.json()
+        assert data[-1]["id"] == str(sample_order.id)
+        assert data[-1]["item_count"] == len(sample_order.items)
+        assert data[-1]["total_price"] == sample_order.total_price
+        assert "items" not in data[-1]
+
+
+    async def test_list_orders_summary_view_computes_missing_totals(self, async_client: AsyncClient, mongo_db, sample_order):
+        # Orders written before totals were stored have neither field
+        await mongo_db.orders.update_one(
+            {"_id": sample_order.id}, {"$unset": {"total_price": "", "total_price_cents": ""}}
+        )
+
+        response = await async_client.get("/orders/", params={"view": "summary"})
+
+        assert response.status_code == SUCCESS_CODE
+        summary = next(order for order in response.json() if order["id"] == str(sample_order.id))
+        assert summary["item_count"] == len(sample_order.items)
+        assert summary["total_price"] == pytest.approx(sample_order.total_price)
+
+
+    async def test_list_orders_raw_read_matches_model_path(self, async_client: AsyncClient, monkeypatch, sample_customer, multiple_products):
+        for product in multiple_products:
+            await async_client.post("/orders/", json={
+                "customer_id": str(sample_customer.id),
+                "items": [{"product_id": str(product.id), "quantity": 3}]
+            })
+        urls = [
+            "/orders/?limit=2&sort=-total_price",
+            f"/orders/customer/{sample_customer.id}?limit=2",
+            "/orders/status/PENDING?min_total=1",
+        ]
+        
+        model_responses = [await async_client.get(url) for url in urls]
+        monkeypatch.setattr(settings, "raw_read_routes", {"orders.list", "orders.by_customer", "orders.by_status"})
+        raw_responses = [await async_client.get(url) for url in urls]
+        
+        for model_response, raw_response in zip(model_responses, raw_responses):
+            assert raw_response.status_code == SUCCESS_CODE
+            assert raw_response.content == model_response.content
+            assert raw_response.headers.get("X-Next-Cursor") == model_response.headers.get("X-Next-Cursor")
+        
+        next_cursor = raw_responses[0].headers["X-Next-Cursor"]
+        response = await async_client.get(f"/orders/?limit=2&sort=-total_price&cursor={next_cursor}")
+        assert response.status_code == SUCCESS_CODE
+        
+        response = await async_client.get("/orders/customer/507f1f77bcf86cd799439011")
+        assert response.status_code == NOT_FOUND_CODE
+
+    async def test_list_orders_by_customer_cursor_pagination(self, async_client: AsyncClient, sample_customer, sample_product):
+        order_data = {
+            "customer_id": str(sample_customer.id),
+            "items": [{"product_id": str(sample_product.id), "quantity": 1}]
+        }
+        created_ids = []
+        for _ in range(3):
+            response = await async_client.post("/orders/", json=order_data)
+            created_ids.append(response.json()["id"])
+        
+        seen_ids = []
+        cursor = None
+        while True:
+            url = f"/orders/customer/{sample_customer.id}?limit=2"
+            if cursor:
+                url += f"&cursor={cursor}"
+            response = await async_client.get(url)
+            assert response.status_code == SUCCESS_CODE
+            seen_ids.extend(order["id"] for order in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        
+        assert seen_ids == created_ids
+        
+        for order_id in created_ids:
+            await async_client.delete(f"/orders/{order_id}")
+
+    async def test_list_orders_cursor_from_other_sort_rejected(self, async_client: AsyncClient, multiple_products):
+        response = await async_client.get("/products/?limit=1")
+        product_cursor = response.headers["X-Next-Cursor"]
+        
+        response = await async_client.get(f"/orders/?cursor={product_cursor}")
+        
+        assert response.status_code == BAD_REQUEST_CODE
+
+    async def test_list_orders_cursor_with_operator_values_rejected(self, async_client: AsyncClient, sample_order):
+        # A hand-made cursor whose values are query operators rather than sort keys
+        cursor = encode_cursor(
+            [("created_at", ASCENDING), ("_id", ASCENDING)], [{"$ne": None}, {"$ne": None}]
+        )
+        
+        response = await async_client.get("/orders/", params={"cursor": cursor})
+        
+        assert response.status_code == BAD_REQUEST_CODE
+
     async def test_list_orders_by_customer(self, async_client: AsyncClient, sample_customer, sample_order):
         response = await async_client.get(f"/orders/customer/{sample_customer.id}")
         
@@ -179,6 +644,27 @@ class TestOrderEndpoints:
         data = response.json()
         assert data["status"] == OrderStatus.PAID
 
+    async def test_order_events_published(self, async_client: AsyncClient, sample_customer, sample_product):
+        order_service = get_order_service()
+        with order_service.subscribe_events(customer_id=str(sample_customer.id)) as subscription, \
+                order_service.subscribe_events(order_status=OrderStatus.CANCELLED) as cancelled_subscription:
+            response = await async_client.post("/orders/", json={
+                "customer_id": str(sample_customer.id),
+                "items": [{"product_id": str(sample_product.id), "quantity": 1}]
+            })
+            order_id = response.json()["id"]
+            await async_client.patch(f"/orders/{order_id}/status", json={"status": OrderStatus.PAID})
+            
+            created = await subscription.get(timeout=1)
+            changed = await subscription.get(timeout=1)
+            assert await cancelled_subscription.get(timeout=0.01) is None
+        
+        assert created.type == OrderEventType.CREATED
+        assert created.order_id == order_id
+        assert created.status == OrderStatus.PENDING
+        assert changed.type == OrderEventType.STATUS_CHANGED
+        assert changed.status == OrderStatus.PAID
+
     async def test_update_order_status_pending_to_cancelled(self, async_client: AsyncClient, sample_order):
         status_update = {
             "status": OrderStatus.CANCELLED
@@ -231,6 +717,15 @@ class TestOrderEndpoints:
         
         assert response.status_code == BAD_REQUEST_CODE
 
+    async def test_update_order_status_concurrent_transitions(self, async_client: AsyncClient, sample_order):
+        responses = await asyncio.gather(*[
+            async_client.patch(f"/orders/{sample_order.id}/status", json={"status": OrderStatus.PAID})
+            for _ in range(5)
+        ])
+        
+        status_codes = sorted(response.status_code for response in responses)
+        assert status_codes == [SUCCESS_CODE] + [BAD_REQUEST_CODE] * 4
+
     async def test_update_order_status_not_found(self, async_client: AsyncClient):
         fake_id = "507f1f77bcf86cd799439011"
         status_update = {
@@ -290,3 +785,163 @@ class TestOrderEndpoints:
         
         assert data["items"][0]["total_price"] == 2 * multiple_products[0].price
         assert data["items"][1]["total_price"] == multiple_products[1].price
+
+    async def test_list_orders_filter_and_sort_by_total(self, async_client: AsyncClient, sample_customer, multiple_products):
+        created_ids = []
+        for product in multiple_products:
+            order_data = {
+                "customer_id": str(sample_customer.id),
+                "items": [{"product_id": str(product.id), "quantity": 1}]
+            }
+            response = await async_client.post("/orders/", json=order_data)
+            created_ids.append(response.json()["id"])
+        
+        response = await async_client.get(
+            f"/orders/customer/{sample_customer.id}?sort=-total_price&min_total=50&max_total=1000"
+        )
+        
+        assert response.status_code == SUCCESS_CODE
+        totals = [order["total_price"] for order in response.json()]
+        expected = sorted(
+            (product.price for product in multiple_products if 50 <= product.price <= 1000),
+            reverse=True
+        )
+        assert totals == expected
+        
+        for order_id in created_ids:
+            await async_client.delete(f"/orders/{order_id}")
+
+    async def test_backfill_order_totals(self, async_client: AsyncClient, mongo_db, sample_customer, sample_product):
+        result = await mongo_db.orders.insert_one({
+            "customer_id": str(sample_customer.id),
+            "customer_name": sample_customer.name,
+            "customer_email": sample_customer.email,
+            "items": [{
+                "product_id": str(sample_product.id),
+                "product_name": sample_product.name,
+                "quantity": 3,
+                "unit_price": sample_product.price
+            }],
+            "status": OrderStatus.PENDING.value,
+        })
+        
+        await backfill_order_totals()
+        
+        document = await mongo_db.orders.find_one({"_id": result.inserted_id})
+        assert document["total_price"] == 3 * sample_product.price
+        assert document["total_price_cents"] == 3 * round(sample_product.price * 100)
+        assert document["items"][0]["total_price_cents"] == document["total_price_cents"]
+        
+        await mongo_db.orders.delete_one({"_id": result.inserted_id})
+
+    async def test_order_indexes_match_declaration(self, mongo_db):
+        await ensure_indexes([Order])
+        
+        report = await index_drift([Order])
+        
+        declared = [entry for entry in report if entry.state != IndexState.UNDECLARED]
+        assert {entry.state for entry in declared} == {IndexState.OK}
+        assert any(entry.keys == [("items.product_id", 1)] for entry in declared)
+
+    async def test_ensure_indexes_fixes_changed_indexes(self, mongo_db):
+        ttl_index = next(index.document for index in IdempotencyKey.Settings.indexes if "expireAfterSeconds" in index.document)
+        await mongo_db.idempotency_keys.drop_indexes()
+        await mongo_db.idempotency_keys.create_index(
+            list(ttl_index["key"].items()), name=ttl_index["name"], expireAfterSeconds=60
+        )
+        await mongo_db.order_rollups.drop_indexes()
+        await mongo_db.order_rollups.create_index([("day", 1), ("status", 1)], name="day_1_status_1")
+        
+        assert set(await drifted_indexes([IdempotencyKey, OrderRollup])) >= {
+            f"idempotency_keys.{ttl_index['name']}", "order_rollups.day_1_status_1"
+        }
+        await ensure_indexes([IdempotencyKey, OrderRollup])
+        
+        assert await drifted_indexes([IdempotencyKey, OrderRollup]) == []
+        live = await mongo_db.idempotency_keys.index_information()
+        assert live[ttl_index["name"]]["expireAfterSeconds"] == ttl_index["expireAfterSeconds"]
+        assert (await mongo_db.order_rollups.index_information())["day_1_status_1"]["unique"] is True
+
+    async def test_order_stats_follow_status_changes(self, async_client: AsyncClient, mongo_db, sample_customer, sample_product):
+        await mongo_db.order_rollups.delete_many({})
+        await OrderRollupRepository().mark_built()
+        order_data = {
+            "customer_id": str(sample_customer.id),
+            "items": [{"product_id": str(sample_product.id), "quantity": 2}]
+        }
+        first = (await async_client.post("/orders/", json=order_data)).json()
+        second = (await async_client.post("/orders/", json=order_data)).json()
+        await async_client.patch(f"/orders/{first['id']}/status", json={"status": OrderStatus.PAID})
+        
+        today = first["created_at"][:10]
+        response = await async_client.get(f"/orders/stats?from={today}&to={today}&granularity=month")
+        
+        assert response.status_code == SUCCESS_CODE
+        data = response.json()
+        assert data["granularity"] == "month"
+        buckets = {bucket["status"]: bucket for bucket in data["buckets"]}
+        assert set(buckets) == {OrderStatus.PENDING, OrderStatus.PAID}
+        assert buckets[OrderStatus.PAID]["order_count"] == 1
+        assert buckets[OrderStatus.PENDING]["order_count"] == 1
+        assert buckets[OrderStatus.PAID]["revenue"] == first["total_price"]
+        assert buckets[OrderStatus.PAID]["period_start"].startswith(today[:8] + "01")
+        
+        await async_client.delete(f"/orders/{first['id']}")
+        await async_client.delete(f"/orders/{second['id']}")
+        
+        response = await async_client.get("/orders/stats")
+        assert response.json()["buckets"] == []
+
+    async def test_order_stats_unavailable_until_rollups_rebuilt(self, async_client: AsyncClient, mongo_db, sample_order):
+        # sample_order is written straight to the collection, like orders that predate the rollups
+        await mongo_db.order_rollups.delete_many({})
+        rollup_repository = OrderRollupRepository()
+        
+        assert await rollup_repository.check_built() == "not built, run make migrate"
+        response = await async_client.get("/orders/stats")
+        assert response.status_code == SERVICE_UNAVAILABLE_CODE
+        
+        # Without orders nothing can be missing, so startup marks the rollups built
+        await mongo_db.orders.delete_many({})
+        assert await rollup_repository.check_built() == "built, no orders yet"
+        response = await async_client.get("/orders/stats")
+        assert response.status_code == SUCCESS_CODE
+        await mongo_db.order_rollups.delete_many({})
+
+    async def test_order_stats_unavailable_when_buckets_go_negative(self, async_client: AsyncClient, mongo_db, sample_order):
+        await mongo_db.order_rollups.delete_many({})
+        await OrderRollupRepository().mark_built()
+        await async_client.patch(f"/orders/{sample_order.id}/status", json={"status": OrderStatus.PAID})
+        
+        response = await async_client.get("/orders/stats")
+        
+        assert response.status_code == SERVICE_UNAVAILABLE_CODE
+        await mongo_db.order_rollups.delete_many({})
+
+    async def test_order_stats_invalid_range(self, async_client: AsyncClient):
+        response = await async_client.get("/orders/stats?from=2024-02-01&to=2024-01-01")
+        
+        assert response.status_code == BAD_REQUEST_CODE
+
+    async def test_export_orders_ndjson(self, async_client: AsyncClient, sample_customer, sample_product, sample_order):
+        order_data = {
+            "customer_id": str(sample_customer.id),
+            "items": [{"product_id": str(sample_product.id), "quantity": 1}]
+        }
+        created = (await async_client.post("/orders/", json=order_data)).json()
+        await async_client.patch(f"/orders/{created['id']}/status", json={"status": OrderStatus.PAID})
+        
+        response = await async_client.get(f"/orders/export?customer_id={sample_customer.id}")
+        
+        assert response.status_code == SUCCESS_CODE
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        assert {order["id"] for order in exported} == {str(sample_order.id), created["id"]}
+        for order in exported:
+            assert order == (await async_client.get(f"/orders/{order['id']}")).json()
+        
+        response = await async_client.get(f"/orders/export?customer_id={sample_customer.id}&status=PAID")
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        assert [order["id"] for order in exported] == [created["id"]]
+        
+        await async_client.delete(f"/orders/{created['id']}")
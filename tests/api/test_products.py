@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 
+from app.container.containers import container
+from app.core.config import settings
 from tests.constants import *
 
 
@@ -117,6 +119,82 @@ class TestProductEndpoints:
         data = response.json()
         assert len(data) == 1
 
+    async def test_list_products_cursor_pagination(self, async_client: AsyncClient, multiple_products):
+        response = await async_client.get("/products/?limit=2")
+        assert response.status_code == SUCCESS_CODE
+        first_page = response.json()
+        assert len(first_page) == 2
+        next_cursor = response.headers["X-Next-Cursor"]
+        
+        response = await async_client.get(f"/products/?limit=2&cursor={next_cursor}")
+        assert response.status_code == SUCCESS_CODE
+        second_page = response.json()
+        assert "X-Next-Cursor" not in response.headers
+        
+        ids = [product["id"] for product in first_page + second_page]
+        assert ids == [str(product.id) for product in multiple_products]
+
+    async def test_get_product_if_modified_since(self, async_client: AsyncClient, sample_product):
+        response = await async_client.get(f"/products/{sample_product.id}")
+        last_modified = response.headers["Last-Modified"]
+        
+        response = await async_client.get(f"/products/{sample_product.id}", headers={"If-Modified-Since": last_modified})
+        assert response.status_code == NOT_MODIFIED_CODE
+        
+        response = await async_client.get(
+            f"/products/{sample_product.id}",
+            headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}
+        )
+        assert response.status_code == SUCCESS_CODE
+
+    async def test_response_cache_invalidated_by_writes(self, async_client: AsyncClient, monkeypatch, multiple_products):
+        uncached = await async_client.get("/products/?limit=2")
+        container.product.product_response_cache().clear()
+        monkeypatch.setattr(settings, "response_cache_routes", {"products.list", "products.get"})
+        
+        first_page = await async_client.get("/products/?limit=2")
+        second_page = await async_client.get(f"/products/?limit=2&cursor={first_page.headers['X-Next-Cursor']}")
+        product = await async_client.get(f"/products/{multiple_products[0].id}")
+        await async_client.get(f"/products/?limit=2&cursor={first_page.headers['X-Next-Cursor']}")
+        assert first_page.content == uncached.content
+        assert product.headers["ETag"].startswith('W/"')
+        
+        # Updating a product on the first page leaves the second page cached
+        await async_client.put(f"/products/{multiple_products[0].id}", json={"price": 1.5})
+        stats = (await async_client.get("/products/cache/stats")).json()
+        assert stats["entries"] == 1
+        assert stats["hits"] == 1
+        
+        response = await async_client.get("/products/?limit=2")
+        assert response.json()[0]["price"] == 1.5
+        response = await async_client.get(f"/products/{multiple_products[0].id}")
+        assert response.json()["price"] == 1.5
+        
+        # A new product lands after every full page, so only the last page is dropped
+        await async_client.get("/products/?limit=2")
+        response = await async_client.post("/products/", json={"name": "New Product", "price": 3.0})
+        stats = (await async_client.get("/products/cache/stats")).json()
+        assert stats["entries"] == 2
+        response = await async_client.get(f"/products/?limit=2&cursor={first_page.headers['X-Next-Cursor']}")
+        assert "New Product" in response.text
+        assert second_page.content != response.content
+        
+        await async_client.delete(f"/products/{response.json()[-1]['id']}")
+
+    async def test_list_products_raw_read_matches_model_path(self, async_client: AsyncClient, monkeypatch, multiple_products):
+        model_response = await async_client.get("/products/?limit=2")
+        monkeypatch.setattr(settings, "raw_read_routes", {"products.list"})
+        raw_response = await async_client.get("/products/?limit=2")
+        
+        assert raw_response.status_code == SUCCESS_CODE
+        assert raw_response.content == model_response.content
+        assert raw_response.headers["X-Next-Cursor"] == model_response.headers["X-Next-Cursor"]
+
+    async def test_list_products_invalid_cursor(self, async_client: AsyncClient):
+        response = await async_client.get("/products/?cursor=not-a-cursor")
+        
+        assert response.status_code == BAD_REQUEST_CODE
+
     async def test_update_product_success(self, async_client: AsyncClient, sample_product):
         update_data = {
             "name": "Updated Product Name",
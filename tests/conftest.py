@@ -9,6 +9,9 @@ from app.main import app
 from app.models.customer import Customer
 from app.models.product import Product
 from app.models.order import Order
+from app.models.order_rollup import OrderRollup
+from app.models.idempotency_key import IdempotencyKey
+from app.models.product_tombstone import ProductTombstone
 from app.core.config import settings
 
 
@@ -38,18 +41,24 @@ async def mongo_db(mongo_client):
     # Initialize Beanie with test database
     await init_beanie(
         database=db,
-        document_models=[Customer, Product, Order]
+        document_models=[Customer, Product, Order, OrderRollup, IdempotencyKey, ProductTombstone]
     )
 
     await db.customers.delete_many({})
     await db.products.delete_many({})
     await db.orders.delete_many({})
+    await db.order_rollups.delete_many({})
+    await db.idempotency_keys.delete_many({})
+    await db.product_tombstones.delete_many({})
     
     yield db
 
     await db.customers.delete_many({})
     await db.products.delete_many({})
     await db.orders.delete_many({})
+    await db.order_rollups.delete_many({})
+    await db.idempotency_keys.delete_many({})
+    await db.product_tombstones.delete_many({})
     # Cleanup: drop the test database
     await mongo_client.drop_database(db_name)
 
@@ -1,9 +1,12 @@
 SUCCESS_CODE = 200
 CREATED_CODE = 201
 NO_CONTENT_CODE = 204
+MULTI_STATUS_CODE = 207
+NOT_MODIFIED_CODE = 304
 VALIDATION_ERROR_CODE = 422
 BAD_REQUEST_CODE = 400
 UNAUTHORIZED_CODE = 401
 FORBIDDEN_CODE = 403
 NOT_FOUND_CODE = 404
 INTERNAL_SERVER_ERROR_CODE = 500
+SERVICE_UNAVAILABLE_CODE = 503
@@ -0,0 +1,17 @@
+import pytest
+
+from app.core.broker import EventBroker
+
+
+@pytest.mark.asyncio
+class TestEventBroker:
+
+    async def test_event_broker_drops_oldest_for_slow_subscriber(self):
+        broker = EventBroker[int](queue_size=2)
+        with broker.subscribe() as subscription:
+            for event in range(5):
+                broker.publish(event)
+            
+            assert subscription.dropped == 3
+            assert [await subscription.get(), await subscription.get()] == [3, 4]
+        assert broker.subscriber_count == 0
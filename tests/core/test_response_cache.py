@@ -0,0 +1,21 @@
+from app.core.response_cache import ResponseCache
+
+
+class TestResponseCache:
+
+    def test_response_cache_evicts_least_recently_used(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.put("a", b"aaaa", 4, cache.generation)
+        cache.put("b", b"bbbb", 4, cache.generation)
+        cache.get("a")
+        cache.put("c", b"cccc", 4, cache.generation)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == b"aaaa"
+        assert cache.stats().evictions == 1
+        assert cache.stats().bytes_held == 8
+        
+        generation = cache.generation
+        cache.invalidate("x")
+        cache.put("d", b"dd", 2, generation)
+        assert cache.get("d") is None